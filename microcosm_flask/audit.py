@@ -1,28 +1,44 @@
 """
 Audit log support for Flask routes.
 
+Audit records are logged (to the "audit" logger) when each request finishes or, if
+`audit.asynchronous` is enabled, queued and logged by a background worker (see
+`microcosm_flask.audit_queue`). Requests may be sampled (see `microcosm_flask.audit_sampling`).
+
 """
 from collections import namedtuple
 from contextlib import contextmanager
-from distutils.util import strtobool
-from functools import wraps
+from contextvars import ContextVar
+from copy import copy
+from functools import lru_cache, wraps
 from json import loads
-from logging import DEBUG, getLogger
+from logging import (
+    DEBUG,
+    NOTSET,
+    Filter,
+    Logger,
+    getLogger,
+)
+from re import IGNORECASE, compile
+from threading import Lock
 from traceback import format_exc
-from uuid import UUID
 
 from flask import current_app, g, request
 from inflection import underscore
 from microcosm.api import defaults, typed
 from microcosm.config.types import boolean
 from microcosm_logging.timing import elapsed_time
+from werkzeug import Response
 
+from microcosm_flask.audit_sampling import AuditSampler
+from microcosm_flask.conventions.encoding import CAPTURE_RESPONSE_DATA, REQUEST_DATA, RESPONSE_DATA
 from microcosm_flask.errors import (
     extract_context,
     extract_error_message,
     extract_include_stack_trace,
     extract_status_code,
 )
+from microcosm_flask.timing import get_phase_timings
 
 
 DEFAULT_INCLUDE_REQUEST_BODY = 400
@@ -35,18 +51,53 @@ AuditOptions = namedtuple("AuditOptions", [
     "include_path",
     "include_query_string",
     "log_as_debug",
-])
+    # a logger (or `AuditLogQueue`); defaults to the "audit" logger
+    "logger",
+    # an `AuditSampler`; defaults to logging every request
+    "sampler",
+    # whether the route function is decorated with `skip_logging`
+    "skip_logging",
+], defaults=[None, None, False])
 
 
 SKIP_LOGGING = "_microcosm_flask_skip_audit_logging"
 
+# value types that are left as is in captured bodies
+JSON_TYPES = frozenset([str, int, float, bool, type(None), dict, list])
+
+# header values that enable a flag (as for `strtobool`)
+TRUE_VALUES = frozenset(["y", "yes", "t", "true", "on", "1"])
+
+# a UUID in any of the string forms written by `UUID` (with or without hyphens, braces or URN prefix)
+UUID_PATTERN = compile(
+    r"(?:urn:uuid:)?(\{)?[0-9a-f]{8}(-?)[0-9a-f]{4}\2[0-9a-f]{4}\2[0-9a-f]{4}\2[0-9a-f]{12}(?(1)\})",
+    IGNORECASE,
+)
+
 
 def is_uuid(value):
-    try:
-        UUID(value)
-        return True
-    except Exception:
-        return False
+    return isinstance(value, str) and UUID_PATTERN.fullmatch(value) is not None
+
+
+def is_enabled(header):
+    """
+    Is a flag request header (e.g. `X-Request-NoLog`) enabled?
+
+    """
+    value = request.headers.get(header)
+    return value is not None and value.lower() in TRUE_VALUES
+
+
+@lru_cache(maxsize=1024)
+def id_header_key(header):
+    """
+    Get the audit log key for an `X-<>-Id` header (see `encode_id_header`), if any.
+
+    """
+    parts = header.split("-")
+    if len(parts) != 3 or parts[0] != "X" or parts[-1] != "Id":
+        return None
+    return f"{underscore(parts[1])}_id"
 
 
 def skip_logging(func):
@@ -63,8 +114,102 @@ def should_skip_logging(func):
     Should we skip logging for this handler?
 
     """
-    disabled = strtobool(request.headers.get("x-request-nolog", "false"))
-    return disabled or getattr(func, SKIP_LOGGING, False)
+    return getattr(func, SKIP_LOGGING, False) or is_enabled("x-request-nolog")
+
+
+class RequestDebugFilter(Filter):
+    """
+    Pass records below a level only within requests that enabled debug logging.
+
+    """
+    def __init__(self, level):
+        super().__init__()
+        self.level = level
+
+    def filter(self, record):
+        return record.levelno >= self.level or REQUEST_DEBUG.get()
+
+
+class RequestDebugLogging:
+    """
+    Enable DEBUG logging for some (concurrent) requests.
+
+    Loggers only create records at (or above) their level, so while any request has debug
+    logging enabled, the root logger's level is lowered to DEBUG and a `RequestDebugFilter`
+    is attached to the handlers of the root logger and of loggers that inherit its level; these
+    drop records below the previous level from other requests. Nothing changes (and nothing
+    is filtered) while no request has debug logging enabled.
+
+    """
+    def __init__(self):
+        self.lock = Lock()
+        self.active = 0
+        self.level = None
+        self.filter = None
+        self.handlers = []
+
+    def enter(self):
+        with self.lock:
+            self.active += 1
+            if self.active > 1:
+                return
+
+            root = getLogger()
+            self.level = root.level
+            if root.getEffectiveLevel() <= DEBUG:
+                return
+
+            self.filter = RequestDebugFilter(root.getEffectiveLevel())
+            self.handlers = list(iter_handlers(root))
+            for handler in self.handlers:
+                handler.addFilter(self.filter)
+            root.setLevel(DEBUG)
+
+    def exit(self):
+        with self.lock:
+            self.active -= 1
+            if self.active > 0:
+                return
+
+            getLogger().setLevel(self.level)
+            for handler in self.handlers:
+                handler.removeFilter(self.filter)
+            self.filter = None
+            self.handlers = []
+
+
+def iter_handlers(root):
+    """
+    Iterate over the handlers of the root logger and of loggers that inherit its level.
+
+    """
+    handlers = set()
+    loggers = [root] + [
+        logger
+        for logger in list(root.manager.loggerDict.values())
+        if isinstance(logger, Logger) and inherits_root_level(logger)
+    ]
+    for logger in loggers:
+        for handler in logger.handlers:
+            if handler not in handlers:
+                handlers.add(handler)
+                yield handler
+
+
+def inherits_root_level(logger):
+    """
+    Does a logger inherit its level from the root logger?
+
+    """
+    while logger.parent is not None:
+        if logger.level != NOTSET:
+            return False
+        logger = logger.parent
+    return True
+
+
+REQUEST_DEBUG = ContextVar("microcosm_flask_request_debug", default=False)
+REQUEST_DEBUG_LOGGING = RequestDebugLogging()
 
 
 @contextmanager
@@ -72,19 +217,21 @@ def logging_levels():
     """
     Context manager to conditionally set logging levels.
 
-    Supports setting per-request debug logging using the `X-Request-Debug` header.
+    Supports setting per-request debug logging using the `X-Request-Debug` header; only
+    records logged within the request (context) are emitted at DEBUG.
 
     """
-    enabled = strtobool(request.headers.get("x-request-debug", "false"))
-    level = None
+    if not is_enabled("x-request-debug"):
+        yield
+        return
+
+    token = REQUEST_DEBUG.set(True)
+    REQUEST_DEBUG_LOGGING.enter()
     try:
-        if enabled:
-            level = getLogger().getEffectiveLevel()
-            getLogger().setLevel(DEBUG)
         yield
     finally:
-        if enabled:
-            getLogger().setLevel(level)
+        REQUEST_DEBUG_LOGGING.exit()
+        REQUEST_DEBUG.reset(token)
 
 
 def audit(func):
@@ -94,14 +241,17 @@ def audit(func):
     Generates a JSON record in the Flask log for every request.
 
     """
+    options = AuditOptions(
+        include_request_body=DEFAULT_INCLUDE_REQUEST_BODY,
+        include_response_body=DEFAULT_INCLUDE_RESPONSE_BODY,
+        include_path=True,
+        include_query_string=True,
+        log_as_debug=False,
+        skip_logging=getattr(func, SKIP_LOGGING, False),
+    )
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        options = AuditOptions(
-            include_request_body=DEFAULT_INCLUDE_REQUEST_BODY,
-            include_response_body=DEFAULT_INCLUDE_RESPONSE_BODY,
-            include_path=True,
-            include_query_string=True,
-        )
         with logging_levels():
             return _audit_request(options, func, None, *args, **kwargs)
 
@@ -122,6 +272,7 @@ class RequestInfo:
         self.view_args = request.view_args
         self.request_context = request_context
         self.timing = dict()
+        self.sample_rate = None
 
         self.error = None
         self.stack_trace = None
@@ -139,10 +290,7 @@ class RequestInfo:
             **self.timing
         )
         if self.options.include_path and self.view_args:
-            dct.update({
-                key: value
-                for key, value in self.view_args.items()
-            })
+            dct.update(self.view_args)
         if self.options.include_query_string and self.args:
             dct.update({
                 key: values[0]
@@ -167,12 +315,34 @@ class RequestInfo:
                 status_code=self.status_code,
             )
 
+        if self.sample_rate is not None and self.sample_rate < 1.0:
+            dct.update(sample_rate=self.sample_rate)
+
+        phase_timing = get_phase_timings()
+        if phase_timing:
+            dct.update(phase_timing=dict(phase_timing))
+
         self.post_process_request_body(dct)
         self.post_process_response_body(dct)
         self.post_process_response_headers(dct)
 
         return dct
 
+    def sample(self, sampler):
+        """
+        Decide whether to log this request.
+
+        """
+        if sampler is None:
+            return True
+
+        self.sample_rate = sampler.sample(
+            self.operation,
+            self.status_code,
+            self.timing.get("elapsed_time"),
+        )
+        return self.sample_rate is not None
+
     def log(self, logger):
         if self.status_code == 500:
             # something actually went wrong; investigate
@@ -208,11 +378,17 @@ class RequestInfo:
             # don't capture request body if it's too large
             return
 
-        if not request.get_json(force=True, silent=True):
+        # reuse request data decoded by `load_request_data`
+        request_body = g.get(REQUEST_DATA)
+        if request_body is None:
+            request_body = request.get_json(force=True, silent=True)
+
+        if not request_body:
             # only capture request body if json
             return
 
-        self.request_body = request.get_json(force=True)
+        # post processing may rename or hide fields
+        self.request_body = to_json_data(request_body)
 
     def capture_response(self, response):
         self.success = True
@@ -238,6 +414,12 @@ class RequestInfo:
             # don't capture response body if it's too large
             return
 
+        # reuse response data dumped by `make_response` (for this response)
+        response_data = g.get(RESPONSE_DATA)
+        if response_data is not None and response_data[0] is response:
+            self.response_body = to_json_data(response_data[1])
+            return
+
         try:
             self.response_body = loads(body)
         except (TypeError, ValueError):
@@ -301,15 +483,9 @@ class RequestInfo:
             return
 
         for key, value in self.response_headers.items():
-            parts = key.split("-")
-            if len(parts) != 3:
-                continue
-            if parts[0] != "X":
-                continue
-            if parts[-1] != "Id":
-                continue
-
-            dct[f"{underscore(parts[1])}_id"] = value
+            id_key = id_header_key(key)
+            if id_key is not None:
+                dct[id_key] = value
 
 
 def _audit_request(options, func, request_context, *args, **kwargs):  # noqa: C901
@@ -317,12 +493,15 @@ def _audit_request(options, func, request_context, *args, **kwargs):  # noqa: C9
     Run a request function under audit.
 
     """
-    logger = getLogger("audit")
+    logger = options.logger or getLogger("audit")
 
     request_info = RequestInfo(options, func, request_context)
     response = None
 
-    request_info.capture_request()
+    if current_app.debug and options.include_response_body:
+        # keep dumped response data for `capture_response`
+        setattr(g, CAPTURE_RESPONSE_DATA, True)
+
     try:
         # process the request
         with elapsed_time(request_info.timing):
@@ -334,10 +513,44 @@ def _audit_request(options, func, request_context, *args, **kwargs):  # noqa: C9
         request_info.capture_response(response)
         return response
     finally:
-        if not should_skip_logging(func):
+        skip = options.skip_logging or is_enabled("x-request-nolog")
+        if not skip and request_info.sample(options.sampler):
+            # capture the request body after the request, reusing any data loaded while processing it
+            request_info.capture_request()
             request_info.log(logger)
 
 
+def to_json_data(data):
+    """
+    Copy decoded or dumped data for the audit log.
+
+    The copy is shallow (post processing only renames or hides top-level fields); top-level
+    values that are not JSON types (e.g. `Decimal` or `UUID` values) are converted as the app's
+    JSON provider would encode them. Nested values are left to the log formatter.
+
+    """
+    if not isinstance(data, dict):
+        return copy(data)
+    return {
+        key: value if type(value) in JSON_TYPES else to_json_value(value)
+        for key, value in data.items()
+    }
+
+
+def to_json_value(value):
+    if isinstance(value, (dict, list)):
+        return value
+    if isinstance(value, tuple):
+        return list(value)
+    default = getattr(current_app.json, "default", None)
+    if default is None:
+        return value
+    try:
+        return default(value)
+    except TypeError:
+        return value
+
+
 def parse_response(response):
     """
     Parse a Flask response into a body, a status code, and headers
@@ -352,6 +565,9 @@ def parse_response(response):
             return response[0], response[1], response[2]
         elif len(response) > 1:
             return response[0], response[1], {}
+    if isinstance(response, Response) and response.is_streamed:
+        # reading the body of a streamed response would buffer all of it
+        return None, response.status_code, response.headers
     try:
         return response.data, response.status_code, response.headers
     except AttributeError:
@@ -364,6 +580,9 @@ def parse_response(response):
     include_path=typed(type=boolean, default_value=False),
     include_query_string=typed(type=boolean, default_value=False),
     log_as_debug=typed(type=boolean, default_value=False),
+    asynchronous=typed(type=boolean, default_value=False),
+    sample_rate=typed(type=float, default_value=1.0),
+    sampling_rules=[],
 )
 def configure_audit_decorator(graph):
     """
@@ -375,16 +594,31 @@ def configure_audit_decorator(graph):
         def login(username, password):
             ...
     """
+    logger = graph.audit_log_queue if graph.config.audit.asynchronous else None
+
+    sampler = None
+    if graph.config.audit.sampling_rules or graph.config.audit.sample_rate < 1.0:
+        sampler = AuditSampler(
+            rules=graph.config.audit.sampling_rules,
+            default_rate=graph.config.audit.sample_rate,
+        )
+
     def _audit(func):
+        # resolve per-route options once, when the route is registered
+        options = AuditOptions(
+            include_request_body=graph.config.audit.include_request_body,
+            include_response_body=graph.config.audit.include_response_body,
+            include_path=graph.config.audit.include_path,
+            include_query_string=graph.config.audit.include_query_string,
+            log_as_debug=graph.config.audit.log_as_debug,
+            logger=logger,
+            sampler=sampler,
+            skip_logging=getattr(func, SKIP_LOGGING, False),
+        )
+        request_context = graph.request_context
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            options = AuditOptions(
-                include_request_body=graph.config.audit.include_request_body,
-                include_response_body=graph.config.audit.include_response_body,
-                include_path=graph.config.audit.include_path,
-                include_query_string=graph.config.audit.include_query_string,
-                log_as_debug=graph.config.audit.log_as_debug,
-            )
-            return _audit_request(options, func, graph.request_context, *args, **kwargs)
+            return _audit_request(options, func, request_context, *args, **kwargs)
         return wrapper
     return _audit
@@ -0,0 +1,239 @@
+"""
+Asynchronous audit logging.
+
+An `AuditLogQueue` stands in for the audit logger: log records are created (and checked against
+the logger's level and filters) on the request thread, then pushed onto a bounded queue. A
+background worker passes them to the logger's handlers in batches, so that formatting and
+writing records (e.g. JSON to stdout or a socket) is off the request path. Handlers run in
+(a copy of) the request's context, so handler filters that read context variables behave as
+they would on the request thread.
+
+When the queue is full, records are either dropped (oldest first, counting each dropped record
+and reporting the count with the next batch) or the request thread waits for space.
+
+Queued records are flushed on shutdown. The worker is started on first use (and restarted
+in forked processes).
+
+Enable with `audit.asynchronous`; configure the queue with `audit_log_queue`.
+
+"""
+import sys
+from atexit import register
+from collections import deque
+from contextvars import copy_context
+from logging import (
+    DEBUG,
+    INFO,
+    WARNING,
+    Logger,
+    getLogger,
+)
+from os import getpid, register_at_fork
+from threading import Condition, Thread
+from weakref import WeakSet
+
+from microcosm.api import binding, defaults, typed
+
+from microcosm_flask.enums import OverflowPolicy
+
+
+QUEUES = WeakSet()
+
+
+class AuditLogQueue:
+    """
+    A logger-like, bounded queue of log records emitted by a background worker.
+
+    """
+    def __init__(
+        self,
+        logger: Logger,
+        max_size: int = 10000,
+        batch_size: int = 100,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ):
+        self.logger = logger
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.overflow = OverflowPolicy(overflow)
+
+        self.reset()
+
+        QUEUES.add(self)
+
+    def reset(self):
+        self.condition = Condition()
+        self.records = deque()
+        self.dropped = 0
+        self.pending = 0
+        self.stopping = False
+        self.pid = None
+        self.worker = None
+
+    def debug(self, msg, *args, stacklevel=1, **kwargs):
+        self.log(DEBUG, msg, *args, stacklevel=stacklevel + 1, **kwargs)
+
+    def info(self, msg, *args, stacklevel=1, **kwargs):
+        self.log(INFO, msg, *args, stacklevel=stacklevel + 1, **kwargs)
+
+    def warning(self, msg, *args, stacklevel=1, **kwargs):
+        self.log(WARNING, msg, *args, stacklevel=stacklevel + 1, **kwargs)
+
+    def log(self, level, msg, *args, exc_info=None, extra=None, stack_info=False, stacklevel=1):
+        """
+        Create a log record (as `Logger.log` would) and queue it.
+
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+
+        if exc_info:
+            # capture the exception now; it will not be current on the worker
+            if isinstance(exc_info, BaseException):
+                exc_info = (type(exc_info), exc_info, exc_info.__traceback__)
+            elif not isinstance(exc_info, tuple):
+                exc_info = sys.exc_info()
+
+        filename, lineno, func, sinfo = self.logger.findCaller(stack_info, stacklevel + 1)
+        record = self.logger.makeRecord(
+            self.logger.name,
+            level,
+            filename,
+            lineno,
+            msg,
+            args,
+            exc_info,
+            func,
+            extra,
+            sinfo,
+        )
+        if self.logger.disabled or not self.logger.filter(record):
+            return
+
+        self.put(copy_context(), record)
+
+    def put(self, context, record):
+        with self.condition:
+            self.start()
+            while len(self.records) >= self.max_size:
+                if self.overflow == OverflowPolicy.DROP_OLDEST:
+                    self.records.popleft()
+                    self.dropped += 1
+                    break
+                self.condition.wait()
+
+            self.records.append((context, record))
+            self.condition.notify_all()
+
+    def start(self):
+        """
+        Start the worker, if it is not running in this process.
+
+        Must be called while holding the condition.
+
+        """
+        if self.pid == getpid():
+            return
+
+        self.pid = getpid()
+        self.stopping = False
+        self.worker = Thread(target=self.run, name="audit-log-queue", daemon=True)
+        self.worker.start()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.records and not self.stopping:
+                    self.condition.wait()
+
+                if not self.records:
+                    return
+
+                batch = [
+                    self.records.popleft()
+                    for _ in range(min(self.batch_size, len(self.records)))
+                ]
+                dropped, self.dropped = self.dropped, 0
+                self.pending = len(batch)
+                # wake blocked producers (and flushes)
+                self.condition.notify_all()
+
+            try:
+                self.emit(batch, dropped)
+            finally:
+                with self.condition:
+                    self.pending = 0
+                    self.condition.notify_all()
+
+    def emit(self, batch, dropped):
+        if dropped:
+            self.logger.warning("Dropped %s audit log records", dropped)
+
+        for context, record in batch:
+            try:
+                context.run(self.logger.callHandlers, record)
+            except Exception:
+                getLogger(__name__).exception("Failed to emit audit log record")
+
+    def flush(self, timeout=None):
+        """
+        Wait until queued records have been emitted.
+
+        :returns: whether all records were emitted
+
+        """
+        with self.condition:
+            if self.pid != getpid():
+                return not self.records
+            return self.condition.wait_for(
+                lambda: not self.records and not self.pending,
+                timeout=timeout,
+            )
+
+    def close(self, timeout=None):
+        """
+        Emit queued records and stop the worker.
+
+        """
+        with self.condition:
+            if self.pid != getpid():
+                return
+            self.stopping = True
+            self.pid = None
+            self.condition.notify_all()
+
+        self.worker.join(timeout)
+
+
+@register
+def close_queues():
+    for queue in list(QUEUES):
+        queue.close(timeout=5.0)
+
+
+def reset_queues():
+    # neither the worker nor the parent's records (nor its locks) belong to a forked process
+    for queue in list(QUEUES):
+        queue.reset()
+
+
+register_at_fork(after_in_child=reset_queues)
+
+
+@binding("audit_log_queue")
+@defaults(
+    max_size=typed(type=int, default_value=10000),
+    batch_size=typed(type=int, default_value=100),
+    overflow=typed(type=OverflowPolicy, default_value=OverflowPolicy.DROP_OLDEST.value),
+)
+def configure_audit_log_queue(graph):
+    """
+    Configure a queue for the audit logger.
+
+    """
+    return AuditLogQueue(
+        getLogger("audit"),
+        max_size=graph.config.audit_log_queue.max_size,
+        batch_size=graph.config.audit_log_queue.batch_size,
+        overflow=graph.config.audit_log_queue.overflow,
+    )
@@ -0,0 +1,103 @@
+"""
+Audit log sampling.
+
+Sampling rules choose the fraction of requests that are audit logged by endpoint (as produced by
+`Namespace.endpoint_for`), status (e.g. "5xx" or "404"), and latency. The first matching rule
+wins; requests that match no rule use the default rate. For example, to always log errors and
+slow requests and 1% of successful searches:
+
+    audit:
+      sampling_rules:
+        - status: 5xx
+          rate: 1.0
+        - min_elapsed_ms: 1000
+          rate: 1.0
+        - endpoint: foo.search.v1
+          status: 2xx
+          rate: 0.01
+
+Records of sampled requests include their `sample_rate` (if less than 1) for re-weighting;
+no record is built for requests that are sampled out.
+
+"""
+from collections import namedtuple
+from random import random
+
+
+SamplingRule = namedtuple("SamplingRule", [
+    "rate",
+    "endpoint",
+    "status",
+    "min_elapsed_ms",
+], defaults=[None, None, None])
+
+
+def parse_rule(rule):
+    """
+    Parse a sampling rule (e.g. from configuration).
+
+    """
+    if not isinstance(rule, SamplingRule):
+        rule = SamplingRule(**rule)
+
+    return rule._replace(
+        rate=float(rule.rate),
+        min_elapsed_ms=None if rule.min_elapsed_ms is None else float(rule.min_elapsed_ms),
+    )
+
+
+def parse_status(status):
+    """
+    Parse a status (class) into a (status code, status class) pair.
+
+    """
+    if status is None:
+        return None, None
+
+    status = str(status).lower()
+    if len(status) == 3 and status[0].isdigit() and status[1:] == "xx":
+        return None, int(status[0])
+    return int(status), None
+
+
+class AuditSampler:
+    """
+    Choose audit log sample rates for requests.
+
+    """
+    def __init__(self, rules=(), default_rate=1.0):
+        self.rules = [parse_rule(rule) for rule in rules]
+        self.default_rate = default_rate
+        self.statuses = [parse_status(rule.status) for rule in self.rules]
+
+    def rate_for(self, endpoint, status_code, elapsed_ms):
+        """
+        Get the sample rate for a request.
+
+        """
+        for rule, (code, status_class) in zip(self.rules, self.statuses):
+            if rule.endpoint is not None and rule.endpoint != endpoint:
+                continue
+            if code is not None and code != status_code:
+                continue
+            if status_class is not None and (status_code is None or status_code // 100 != status_class):
+                continue
+            if rule.min_elapsed_ms is not None and (elapsed_ms is None or elapsed_ms < rule.min_elapsed_ms):
+                continue
+            return rule.rate
+
+        return self.default_rate
+
+    def sample(self, endpoint, status_code, elapsed_ms):
+        """
+        Decide whether to log a request.
+
+        :returns: the sample rate or `None` if the request is sampled out
+
+        """
+        rate = self.rate_for(endpoint, status_code, elapsed_ms)
+        if rate >= 1.0:
+            return 1.0
+        if rate > 0.0 and random() < rate:
+            return rate
+        return None
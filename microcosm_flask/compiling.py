@@ -0,0 +1,402 @@
+"""
+Compiled serialization for marshmallow schemas.
+
+Marshmallow dispatches through several generic layers for every field of every dumped object
+(`Schema._serialize`, `Field.serialize`, `Field.get_value`, `Schema.get_attribute`, ...), which
+dominates CPU for list endpoints that return hundreds of items.
+
+A `CompiledSchema` instead dumps using a function specialized for its fields, which is built on
+first use and cached. Specialized serializers exist for common cases (strings, numbers, booleans,
+`Nested`, `List`, `Method`, `EnumField`, `TimestampField`); any other field calls its own
+`_serialize` directly. Constructs that may change dump semantics (pre/post dump hooks, custom
+`get_attribute` or field `serialize` functions) fall back to marshmallow.
+
+Nested schemas of a compiled schema are compiled as well, as are paginated list schemas for
+compiled item schemas (see `microcosm_flask.paging`).
+
+Compiled functions can also skip null values as they serialize (see `X-Response-Skip-Null`)
+rather than removing them from the dumped data afterwards; other schemas skip null values as
+their fields serialize as well (see `dump_without_null_values`).
+
+Usage:
+
+    class FooSchema(CompiledSchema):
+        id = fields.UUID()
+        ...
+
+"""
+from collections.abc import Iterator
+from enum import Enum
+
+from marshmallow import Schema
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow.fields import (
+    Boolean,
+    Field,
+    List,
+    Method,
+    Nested,
+    Number,
+    String,
+)
+from marshmallow.utils import get_value, missing
+
+from microcosm_flask.fields import EnumField, TimestampField
+
+
+COMPILED_DUMP = "_microcosm_flask_compiled_dump"
+
+
+class CompiledSchema(Schema):
+    """
+    A schema that dumps using a compiled function where possible.
+
+    """
+    def dump(self, obj, *, many=None):
+        return dump_compiled(self, obj, many=many)
+
+
+def is_compiled(schema):
+    """
+    Does this schema (instance or class) opt in to compiled serialization?
+
+    """
+    if isinstance(schema, type):
+        return issubclass(schema, CompiledSchema)
+    return isinstance(schema, CompiledSchema)
+
+
+def dump(schema, obj, many=None, skip_null=False):
+    """
+    Dump an object using a compiled function for the schema, if it is a `CompiledSchema`.
+
+    Other schemas dump using their fields' own serialization (see `dump_without_null_values`).
+
+    :param skip_null: omit keys with null values (at any depth)
+
+    """
+    if not isinstance(schema, CompiledSchema):
+        if skip_null:
+            return dump_without_null_values(schema, obj, many=many)
+        return schema.dump(obj, many=many)
+    return dump_compiled(schema, obj, many=many, skip_null=skip_null)
+
+
+def dump_without_null_values(schema, obj, many=None):
+    """
+    Dump an object with a (not compiled) schema, omitting keys with null values as fields serialize.
+
+    Fields serialize as they do in `Schema.dump`; nested schemas (of `Nested` fields and lists of
+    these) are dumped without null values in turn. Null values are removed from the results of
+    other fields with structured values (e.g. `Raw`, `Dict`, or `Method`) afterwards, as they are
+    for schemas that customize dumping (`dump` or `_serialize`) or use pre/post dump hooks.
+
+    """
+    schema_type = type(schema)
+    if (
+        schema._hooks[PRE_DUMP]
+        or schema._hooks[POST_DUMP]
+        or schema_type.dump is not Schema.dump
+        or schema_type._serialize is not Schema._serialize
+    ):
+        return remove_null_values(schema.dump(obj, many=many))
+
+    many = schema.many if many is None else bool(many)
+    if many and obj is not None:
+        return [serialize_without_null_values(schema, item) for item in obj]
+    return serialize_without_null_values(schema, obj)
+
+
+def serialize_without_null_values(schema, obj):
+    result = schema.dict_class()
+    for attr_name, field in schema.dump_fields.items():
+        value = serialize_field_without_null_values(schema, attr_name, field, obj)
+        if value is missing or value is None:
+            continue
+        result[attr_name if field.data_key is None else field.data_key] = value
+    return result
+
+
+def serialize_field_without_null_values(schema, attr_name, field, obj):
+    field_type = type(field)
+    if field_type.serialize is not Field.serialize or field_type.get_value is not Field.get_value:
+        return remove_null_values(field.serialize(attr_name, obj, accessor=schema.get_attribute))
+
+    if field_type._serialize is Nested._serialize:
+        nested_field = field
+    elif field_type._serialize is List._serialize and type(field.inner)._serialize is Nested._serialize:
+        nested_field = field.inner
+    else:
+        return remove_null_values(field.serialize(attr_name, obj, accessor=schema.get_attribute))
+
+    # as for `Field.serialize`
+    value = field.get_value(obj, attr_name, accessor=schema.get_attribute)
+    if value is missing:
+        dump_default = field.dump_default
+        value = dump_default() if callable(dump_default) else dump_default
+    if value is missing or value is None:
+        return value
+
+    nested = nested_field.schema
+    nested_many = nested.many or nested_field.many
+    if nested_field is field:
+        return dump(nested, value, many=nested_many, skip_null=True)
+    return [
+        None if item is None else dump(nested, item, many=nested_many, skip_null=True)
+        for item in value
+    ]
+
+
+def dump_compiled(schema, obj, many=None, skip_null=False):
+    """
+    Dump an object using a compiled function for the schema, if the schema is supported.
+
+    """
+    dump_func = compile_schema(schema, skip_null=skip_null)
+    if dump_func is None:
+        if skip_null:
+            return remove_null_values(Schema.dump(schema, obj, many=many))
+        return Schema.dump(schema, obj, many=many)
+
+    many = schema.many if many is None else bool(many)
+    if many and obj is not None:
+        return [dump_func(item) for item in obj]
+    return dump_func(obj)
+
+
+def compile_schema(schema, skip_null=False):
+    """
+    Compile (and cache) a dump function for a schema instance.
+
+    Fields (e.g. `Method` and `Nested`) are bound to their schema instance, so compiled
+    functions are cached per instance; conventions create schemas once per route.
+
+    :param skip_null: compile a function that omits keys with null values
+    :returns: a function of one object or `None` if the schema is not supported
+
+    """
+    dump_funcs = getattr(schema, COMPILED_DUMP, None)
+    if dump_funcs is None:
+        dump_funcs = {}
+        setattr(schema, COMPILED_DUMP, dump_funcs)
+
+    dump_func = dump_funcs.get(skip_null)
+    if dump_func is None:
+        dump_func = dump_funcs[skip_null] = _compile_schema(schema, skip_null) or False
+
+    return dump_func or None
+
+
+def _compile_schema(schema, skip_null):
+    if schema._hooks[PRE_DUMP] or schema._hooks[POST_DUMP]:
+        return None
+    schema_type = type(schema)
+    if schema_type.get_attribute is not Schema.get_attribute or schema_type._serialize is not Schema._serialize:
+        return None
+
+    steps = [
+        (
+            attr_name if field.data_key is None else field.data_key,
+            compile_field_step(schema, attr_name, field, skip_null),
+        )
+        for attr_name, field in schema.dump_fields.items()
+    ]
+    dict_class = schema.dict_class
+
+    def dump_func(obj):
+        get = get_item if hasattr(obj, "__getitem__") else getattr
+        result = dict_class()
+        for key, step in steps:
+            value = step(obj, get)
+            if value is missing or (skip_null and value is None):
+                continue
+            result[key] = value
+        return result
+
+    return dump_func
+
+
+def get_item(obj, key, default):
+    """
+    Get a key from a mapping with the same semantics as `marshmallow.utils.get_value`.
+
+    """
+    try:
+        return obj[key]
+    except (KeyError, IndexError, TypeError, AttributeError):
+        return getattr(obj, key, default)
+
+
+def compile_field_step(schema, attr_name, field, skip_null=False):
+    """
+    Compile the equivalent of `Field.serialize` for one field.
+
+    """
+    field_type = type(field)
+    if field_type.serialize is not Field.serialize or field_type.get_value is not Field.get_value:
+        accessor = schema.get_attribute
+
+        def serialize_custom(obj, get):
+            return field.serialize(attr_name, obj, accessor=accessor)
+
+        return without_null_values(serialize_custom) if skip_null else serialize_custom
+
+    serialize = compile_field(field, skip_null)
+
+    if not field._CHECK_ATTRIBUTE:
+        def serialize_without_attribute(obj, get):
+            return serialize(None, attr_name, obj)
+
+        return serialize_without_attribute
+
+    key = attr_name if field.attribute is None else field.attribute
+    dotted = "." in key
+    dump_default = field.dump_default
+
+    def serialize_attribute(obj, get):
+        if dotted:
+            value = get_value(obj, key, missing)
+        else:
+            value = get(obj, key, missing)
+        if value is missing:
+            value = dump_default() if callable(dump_default) else dump_default
+            if value is missing:
+                return missing
+        return serialize(value, attr_name, obj)
+
+    return serialize_attribute
+
+
+def compile_field(field, skip_null=False):  # noqa: C901
+    """
+    Compile the equivalent of `Field._serialize` for one field.
+
+    Specialized functions handle the common value types and delegate to the field otherwise.
+
+    When skipping null values, specialized functions produce scalars or delegate to compiled
+    nested schemas; other values (e.g. from `Raw`, `Dict`, or `Method` fields) are arbitrary
+    structures, from which null values are removed.
+
+    """
+    field_type = type(field)
+    method = field_type._serialize
+    default = field._serialize
+    if skip_null:
+        default = without_null_values(default)
+
+    if method is Field._serialize:
+        return default if skip_null else serialize_value
+
+    if method is String._serialize:
+        def serialize_string(value, attr, obj):
+            if value is None or type(value) is str:
+                return value
+            return default(value, attr, obj)
+
+        return serialize_string
+
+    if (
+        method is Number._serialize
+        and field_type._format_num is Number._format_num
+        and not field.as_string
+        and field.num_type in (int, float)
+    ):
+        num_type = field.num_type
+
+        def serialize_number(value, attr, obj):
+            if value is None or type(value) is num_type:
+                return value
+            return default(value, attr, obj)
+
+        return serialize_number
+
+    if method is Boolean._serialize and field.truthy is Boolean.truthy and field.falsy is Boolean.falsy:
+        def serialize_boolean(value, attr, obj):
+            if value is None or type(value) is bool:
+                return value
+            return default(value, attr, obj)
+
+        return serialize_boolean
+
+    if method is EnumField._serialize:
+        by_value = field.by_value
+
+        def serialize_enum(value, attr, obj):
+            if isinstance(value, Enum):
+                return value.value if by_value else value.name
+            return default(value, attr, obj)
+
+        return serialize_enum
+
+    if method is TimestampField._serialize and not field.use_isoformat:
+        return serialize_value
+
+    if method is Method._serialize and field._serialize_method is not None:
+        serialize_method = field._serialize_method
+        if skip_null:
+            serialize_method = without_null_values(serialize_method)
+
+        def serialize_with_method(value, attr, obj):
+            return serialize_method(obj)
+
+        return serialize_with_method
+
+    if method is List._serialize:
+        serialize_inner = compile_field(field.inner, skip_null)
+
+        def serialize_list(value, attr, obj):
+            if value is None:
+                return None
+            return [serialize_inner(each, attr, obj) for each in value]
+
+        return serialize_list
+
+    if method is Nested._serialize:
+        return compile_nested_field(field, skip_null)
+
+    return default
+
+
+def compile_nested_field(field, skip_null=False):
+    # resolve the nested schema on first use; schemas may be recursive
+    nested = []
+
+    def serialize_nested(value, attr, obj):
+        if not nested:
+            nested.append(field.schema)
+        schema = nested[0]
+        if value is None:
+            return None
+        return dump_compiled(schema, value, many=schema.many or field.many, skip_null=skip_null)
+
+    return serialize_nested
+
+
+def serialize_value(value, attr, obj):
+    return value
+
+
+def without_null_values(func):
+    """
+    Wrap a serialization function to remove null values from its result.
+
+    """
+    def serialize_without_null_values(*args):
+        return remove_null_values(func(*args))
+
+    return serialize_without_null_values
+
+
+def remove_null_values(data):
+    if isinstance(data, dict):
+        return {
+            key: remove_null_values(value)
+            for key, value in data.items()
+            if value is not None
+        }
+    if type(data) in (list, tuple):
+        return type(data)(map(remove_null_values, data))
+    if isinstance(data, Iterator):
+        # lazily dumped items (e.g. for streaming)
+        return map(remove_null_values, data)
+    return data
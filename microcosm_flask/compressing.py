@@ -0,0 +1,197 @@
+"""
+Response compression negotiated using the `Accept-Encoding` header.
+
+Compression applies to formatted responses (see `microcosm_flask.formatting`) of the configured
+content types once they have been built, so that etags are computed on (and audit logging sees)
+the uncompressed representation; etags of compressed responses are marked weak.
+
+Buffered responses are compressed if they are at least `min_size` bytes; streamed responses are
+always compressed, one chunk at a time, so that each chunk can be decoded as it is received.
+
+Supports `gzip` natively and `br` and `zstd` if `brotli` and `zstandard` are installed.
+
+"""
+import gzip
+import zlib
+from abc import ABCMeta, abstractmethod
+
+from flask import request
+from microcosm.api import binding, defaults, typed
+from microcosm.config.types import boolean, comma_separated_list
+
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class Encoder(metaclass=ABCMeta):
+    """
+    Compress data for one content encoding.
+
+    """
+    name = None
+
+    def __init__(self, level):
+        self.level = level
+
+    @abstractmethod
+    def compress(self, data):
+        """
+        Compress a complete response body.
+
+        """
+        pass
+
+    @abstractmethod
+    def compress_chunks(self, chunks):
+        """
+        Compress a stream of response body chunks, flushing after each chunk.
+
+        """
+        pass
+
+
+class GzipEncoder(Encoder):
+    name = "gzip"
+
+    def compress(self, data):
+        return gzip.compress(data, compresslevel=self.level)
+
+    def compress_chunks(self, chunks):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+class BrotliEncoder(Encoder):
+    name = "br"
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.level)
+
+    def compress_chunks(self, chunks):
+        compressor = brotli.Compressor(quality=self.level)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+
+
+class ZstdEncoder(Encoder):
+    name = "zstd"
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def compress_chunks(self, chunks):
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        yield compressor.flush()
+
+
+def is_available(encoder_type):
+    if encoder_type is BrotliEncoder:
+        return brotli is not None
+    if encoder_type is ZstdEncoder:
+        return zstandard is not None
+    return True
+
+
+ENCODERS = {
+    encoder_type.name: encoder_type
+    for encoder_type in (
+        BrotliEncoder,
+        GzipEncoder,
+        ZstdEncoder,
+    )
+}
+
+
+@binding("response_compression")
+@defaults(
+    enabled=typed(boolean, default_value=False),
+    # in order of preference (if clients accept several with the same quality)
+    encodings=typed(comma_separated_list, default_value="zstd,br,gzip"),
+    content_types=typed(
+        comma_separated_list,
+        default_value="application/json,application/x-ndjson,text/csv,text/plain",
+    ),
+    min_size=typed(int, default_value=1024),
+    gzip_level=typed(int, default_value=6),
+    br_level=typed(int, default_value=4),
+    zstd_level=typed(int, default_value=3),
+)
+class ResponseCompression:
+    """
+    Compress responses using the best encoding the client accepts.
+
+    """
+    def __init__(self, graph):
+        config = graph.config.response_compression
+
+        self.enabled = config.enabled
+        self.content_types = set(config.content_types)
+        self.min_size = config.min_size
+        self.encoders = {
+            name: ENCODERS[name](level=getattr(config, f"{name}_level"))
+            for name in config.encodings
+            if is_available(ENCODERS[name])
+        }
+
+        if self.enabled:
+            graph.flask.after_request(self.compress_response)
+
+    def negotiate_encoder(self):
+        """
+        Choose an encoder using the `Accept-Encoding` header.
+
+        """
+        name = request.accept_encodings.best_match(self.encoders)
+        if name is None:
+            return None
+        return self.encoders[name]
+
+    def should_compress(self, response):
+        if response.direct_passthrough or "Content-Encoding" in response.headers:
+            return False
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if response.mimetype not in self.content_types:
+            return False
+        if not response.is_streamed and len(response.get_data()) < self.min_size:
+            return False
+        return True
+
+    def compress_response(self, response):
+        if not self.should_compress(response):
+            return response
+
+        # the response varies by encoding even if it is not compressed
+        response.vary.add("Accept-Encoding")
+
+        encoder = self.negotiate_encoder()
+        if encoder is None:
+            return response
+
+        if response.is_streamed:
+            response.response = encoder.compress_chunks(response.iter_encoded())
+            response.headers.pop("Content-Length", None)
+        else:
+            response.set_data(encoder.compress(response.get_data()))
+
+        response.content_encoding = encoder.name
+
+        etag, weak = response.get_etag()
+        if etag is not None and not weak:
+            # the etag identifies the uncompressed representation
+            response.set_etag(etag, weak=True)
+
+        return response
@@ -7,14 +7,13 @@ HEADER_PREFIXES = [X_REQUEST]
 
 
 def context_wrapper(include_header_prefixes):
+    prefixes = tuple(prefix.lower() for prefix in include_header_prefixes)
+
     def retrieve_context():
         context = {
             header: value
             for header, value in request.headers.items()
-            if any([
-                header.lower().startswith(prefix.lower())
-                for prefix in include_header_prefixes
-            ])
+            if header.lower().startswith(prefixes)
         }
         return context
     return retrieve_context
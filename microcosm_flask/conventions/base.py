@@ -30,6 +30,7 @@ class EndpointDefinition(tuple):
         header_func=None,
         response_formats=None,
         description=None,
+        etag_func=None,
     ):
         """
         Define an API endpoint.
@@ -44,12 +45,18 @@ class EndpointDefinition(tuple):
         The callable `header_func` (if any) should accept a `headers` dictionary and the return value from the
         callable `func`.
 
+        The callable `etag_func` (if any) should accept the same `**kwargs` as `func` and cheaply return a version
+        of the response (e.g. from an `updated_at` column or a revision counter) or `None` if it is not known.
+        Conventions that support conditional requests use this version to answer `If-None-Match` without calling
+        `func` or serializing the response.
+
         :param func: a function to process request data and return response data
         :param request_schema: a marshmallow schema to decode/validate request data
         :param response_schema: a marshmallow schema to encode response data
         :param header_func: a header-modifying function
         :param response_formats: an optional list of support response formats
         :param description: a description of the endpoint for documentation
+        :param etag_func: a function to compute the version of the response
 
         """
         return tuple.__new__(
@@ -59,8 +66,10 @@ class EndpointDefinition(tuple):
                 request_schema,
                 response_schema,
                 header_func,
-                response_formats,
+                # precompute a hashable table for content negotiation
+                tuple(response_formats) if response_formats else (),
                 description,
+                etag_func,
             ),
         )
 
@@ -82,12 +91,16 @@ class EndpointDefinition(tuple):
 
     @property
     def response_formats(self):
-        return self[4] or []
+        return self[4]
 
     @property
     def description(self):
         return self[5]
 
+    @property
+    def etag_func(self):
+        return self[6]
+
 
 class Convention:
     """
@@ -108,6 +121,10 @@ class Convention:
             mappings = dict()
         mappings.update(kwargs)
 
+        page_cls = getattr(self, "page_cls", None)
+        if page_cls is not None:
+            page_cls.check_configuration(self.graph)
+
         for operation, definition in mappings.items():
             try:
                 configure_func = self._find_func(operation)
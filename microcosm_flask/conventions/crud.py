@@ -5,21 +5,37 @@ Conventions for canonical CRUD endpoints.
 from functools import wraps
 
 from inflection import pluralize
-from marshmallow import Schema
+from marshmallow import Schema, fields
 
 from microcosm_flask.conventions.base import Convention
 from microcosm_flask.conventions.encoding import (
     dump_response_data,
     encode_count_header,
     encode_id_header,
+    evaluate_etag,
+    is_not_modified,
     load_query_string_data,
     load_request_data,
+    make_not_modified_response,
     merge_data,
     require_response_data,
 )
 from microcosm_flask.conventions.registry import qs, request, response
+from microcosm_flask.enums import ResponseFormats
 from microcosm_flask.operations import Operation
 from microcosm_flask.paging import OffsetLimitPage, OffsetLimitPageSchema, identity
+from microcosm_flask.timing import CONTROLLER, phase
+
+
+EXPORT_RESPONSE_FORMATS = (
+    ResponseFormats.JSON_STREAMING,
+    ResponseFormats.NDJSON,
+    ResponseFormats.CSV_STREAMING,
+)
+
+
+class ExportLimitExceededException(Exception):
+    pass
 
 
 class CRUDConvention(Convention):
@@ -31,6 +47,14 @@ class CRUDConvention(Convention):
     def page_schema(self):
         return OffsetLimitPageSchema
 
+    @property
+    def export_page_size(self):
+        return 1000
+
+    @property
+    def export_max_rows(self):
+        return 100000
+
     def configure_search(self, ns, definition):
         """
         Register a search endpoint.
@@ -42,6 +66,9 @@ class CRUDConvention(Convention):
 
         The definition's request_schema will be used to process query string arguments.
 
+        If the definition has an etag_func, requests with a matching `If-None-Match` header
+        receive a `304 Not Modified` response without calling the search function.
+
         :param ns: the namespace
         :param definition: the endpoint definition
 
@@ -57,21 +84,26 @@ class CRUDConvention(Convention):
         @wraps(definition.func)
         def search(**path_data):
             page = self.page_cls.from_query_string(definition.request_schema)
-            result = definition.func(
-                **merge_data(path_data, page.to_dict(func=identity))
+            response_format = self.negotiate_response_content(
+                definition.response_formats
             )
+            func_kwargs = merge_data(path_data, page.to_dict(func=identity))
+            etag = evaluate_etag(definition, response_format, **func_kwargs)
+            if is_not_modified(etag):
+                return make_not_modified_response(etag)
+
+            with phase(CONTROLLER):
+                result = definition.func(**func_kwargs)
             response_data, headers = page.to_paginated_list(
                 result, ns, Operation.Search
             )
             definition.header_func(headers, response_data)
-            response_format = self.negotiate_response_content(
-                definition.response_formats
-            )
             return dump_response_data(
                 paginated_list_schema,
                 response_data,
                 headers=headers,
                 response_format=response_format,
+                etag=etag,
             )
 
         search.__doc__ = (
@@ -80,6 +112,96 @@ class CRUDConvention(Convention):
             or f"Search the collection of all {pluralize(ns.subject_name)}"
         )
 
+    def configure_export(self, ns, definition):
+        """
+        Register an export endpoint, which streams all items of a search.
+
+        The definition's func should be a search function (see `configure_search`), which is
+        called page by page (of `export_page_size` items); its count (if any) is ignored, so
+        functions should avoid computing one (e.g. `CRUDStoreAdapter.export`).
+
+        The definition's request_schema will be used to process query string arguments; paging
+        arguments are ignored.
+
+        Items are dumped and written as they are fetched using a streaming response format (one
+        of `EXPORT_RESPONSE_FORMATS` by default). Exports of more than `export_max_rows` items
+        are aborted (after sending that many items) by raising `ExportLimitExceededException`,
+        so that clients see an incomplete response rather than a silently truncated one.
+
+        :param ns: the namespace
+        :param definition: the endpoint definition
+
+        """
+        response_formats = definition.response_formats or EXPORT_RESPONSE_FORMATS
+        for response_format in response_formats:
+            if not response_format.value.formatter.streaming:
+                raise ValueError(f"Export requires streaming response formats; got: {response_format.name}")
+
+        class ExportSchema(self.page_cls.paginated_list_schema_base_class(definition.response_schema)):
+            __alias__ = f"{ns.subject_name}_export"
+            items = fields.List(
+                fields.Nested(definition.response_schema),
+                required=True,
+                metadata={"description": "All of the items."},
+            )
+
+        export_schema = ExportSchema()
+
+        @self.add_route(ns.export_path, Operation.Export, ns)
+        @qs(definition.request_schema)
+        @response(export_schema)
+        @wraps(definition.func)
+        def export(**path_data):
+            request_data = load_query_string_data(definition.request_schema)
+            response_format = self.negotiate_response_content(response_formats)
+            if response_format not in response_formats:
+                # unacceptable formats fall back to JSON elsewhere; stream instead
+                response_format = response_formats[0]
+
+            filters = {
+                key: value
+                for key, value in request_data.items()
+                if key not in ("offset", "limit", "cursor")
+            }
+            page = self.page_cls.from_dict(merge_data(filters, dict(limit=self.export_page_size)))
+
+            return dump_response_data(
+                export_schema,
+                dict(items=self.iter_export_items(definition, page, path_data)),
+                headers=dict(),
+                response_format=response_format,
+            )
+
+        export.__doc__ = (
+            definition.description
+            or export.__doc__
+            or f"Export the collection of all {pluralize(ns.subject_name)}"
+        )
+
+    def iter_export_items(self, definition, page, path_data):
+        """
+        Iterate over the items of all pages, fetching one page at a time.
+
+        Search functions may return an extra item (beyond the page's limit) to signal a next page;
+        it is exported with the next page.
+
+        """
+        max_rows = self.export_max_rows
+        rows = 0
+
+        while page is not None:
+            result = definition.func(**merge_data(path_data, page.to_dict(func=identity)))
+            items = list(page.parse_result(result)[0])
+            limit = getattr(page, "limit", None)
+            if limit is not None:
+                items = items[:limit]
+            for item in items:
+                if rows == max_rows:
+                    raise ExportLimitExceededException(f"Export exceeded {max_rows} rows")
+                yield item
+                rows += 1
+            page = page.next_page_for(items)
+
     def configure_count(self, ns, definition):
         """
         Register a count endpoint.
@@ -101,7 +223,8 @@ class CRUDConvention(Convention):
         def count(**path_data):
             request_data = load_query_string_data(definition.request_schema)
             response_data = dict()
-            count = definition.func(**merge_data(path_data, request_data))
+            with phase(CONTROLLER):
+                count = definition.func(**merge_data(path_data, request_data))
             headers = encode_count_header(count)
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(
@@ -141,7 +264,8 @@ class CRUDConvention(Convention):
         @wraps(definition.func)
         def create(**path_data):
             request_data = load_request_data(definition.request_schema)
-            response_data = definition.func(**merge_data(path_data, request_data))
+            with phase(CONTROLLER):
+                response_data = definition.func(**merge_data(path_data, request_data))
             headers = encode_id_header(response_data)
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(
@@ -182,7 +306,8 @@ class CRUDConvention(Convention):
         def update_batch(**path_data):
             headers = dict()
             request_data = load_request_data(definition.request_schema)
-            response_data = definition.func(**merge_data(path_data, request_data))
+            with phase(CONTROLLER):
+                response_data = definition.func(**merge_data(path_data, request_data))
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(
                 definition.response_formats
@@ -222,9 +347,10 @@ class CRUDConvention(Convention):
         def delete_batch(**path_data):
             headers = dict()
             request_data = load_query_string_data(request_schema)
-            response_data = require_response_data(
-                definition.func(**merge_data(path_data, request_data))
-            )
+            with phase(CONTROLLER):
+                response_data = require_response_data(
+                    definition.func(**merge_data(path_data, request_data))
+                )
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(
                 definition.response_formats
@@ -251,6 +377,9 @@ class CRUDConvention(Convention):
         - accept kwargs for path data
         - return an item or falsey
 
+        If the definition has an etag_func, requests with a matching `If-None-Match` header
+        receive a `304 Not Modified` response without calling the retrieve function.
+
         :param ns: the namespace
         :param definition: the endpoint definition
 
@@ -264,18 +393,25 @@ class CRUDConvention(Convention):
         def retrieve(**path_data):
             headers = dict()
             request_data = load_query_string_data(request_schema)
-            response_data = require_response_data(
-                definition.func(**merge_data(path_data, request_data))
-            )
-            definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(
                 definition.response_formats
             )
+            func_kwargs = merge_data(path_data, request_data)
+            etag = evaluate_etag(definition, response_format, **func_kwargs)
+            if is_not_modified(etag):
+                return make_not_modified_response(etag)
+
+            with phase(CONTROLLER):
+                response_data = require_response_data(
+                    definition.func(**func_kwargs)
+                )
+            definition.header_func(headers, response_data)
             return dump_response_data(
                 definition.response_schema,
                 response_data,
                 headers=headers,
                 response_format=response_format,
+                etag=etag,
             )
 
         retrieve.__doc__ = (
@@ -304,9 +440,10 @@ class CRUDConvention(Convention):
         def delete(**path_data):
             headers = dict()
             request_data = load_query_string_data(request_schema)
-            response_data = require_response_data(
-                definition.func(**merge_data(path_data, request_data))
-            )
+            with phase(CONTROLLER):
+                response_data = require_response_data(
+                    definition.func(**merge_data(path_data, request_data))
+                )
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(
                 definition.response_formats
@@ -348,9 +485,10 @@ class CRUDConvention(Convention):
             # Replace/put should create a resource if not already present, but we do not
             # enforce these semantics at the HTTP layer. If `func` returns falsey, we
             # will raise a 404.
-            response_data = require_response_data(
-                definition.func(**merge_data(path_data, request_data))
-            )
+            with phase(CONTROLLER):
+                response_data = require_response_data(
+                    definition.func(**merge_data(path_data, request_data))
+                )
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(
                 definition.response_formats
@@ -388,9 +526,10 @@ class CRUDConvention(Convention):
         def update(**path_data):
             headers = dict()
             request_data = load_request_data(definition.request_schema)
-            response_data = require_response_data(
-                definition.func(**merge_data(path_data, request_data))
-            )
+            with phase(CONTROLLER):
+                response_data = require_response_data(
+                    definition.func(**merge_data(path_data, request_data))
+                )
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(
                 definition.response_formats
@@ -428,15 +567,16 @@ class CRUDConvention(Convention):
             request_data = load_request_data(definition.request_schema)
             page = self.page_cls.from_query_string(self.page_schema(), {})
 
-            result = definition.func(
-                **merge_data(
-                    path_data,
-                    merge_data(
-                        request_data,
-                        page.to_dict(func=identity),
-                    ),
+            with phase(CONTROLLER):
+                result = definition.func(
+                    **merge_data(
+                        path_data,
+                        merge_data(
+                            request_data,
+                            page.to_dict(func=identity),
+                        ),
+                    )
                 )
-            )
 
             response_data, headers = page.to_paginated_list(
                 result, ns, Operation.CreateCollection
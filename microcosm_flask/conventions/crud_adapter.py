@@ -1,8 +1,27 @@
 """
 Adapter between conventional crud functions and the `microcosm_postgres.store.Store` interface.
 
+Searches count items according to a `CountPolicy`, chosen per adapter and optionally
+per request (using the `X-Count-Policy` header) among the policies the adapter allows.
+
 """
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from flask import has_request_context, request
+
+from microcosm_flask.enums import CountPolicy
 from microcosm_flask.naming import name_for
+from microcosm_flask.paging import EstimatedCount
+
+
+COUNT_POLICY_HEADER = "X-Count-Policy"
+
+# requests may choose cheaper policies by default
+REQUEST_COUNT_POLICIES = (CountPolicy.ESTIMATE, CountPolicy.SKIP)
+
+# a shared thread pool for concurrent counts (threads are started on first use)
+COUNT_EXECUTOR = ThreadPoolExecutor(thread_name_prefix="count")
 
 
 class CRUDStoreAdapter:
@@ -11,45 +30,141 @@ class CRUDStoreAdapter:
 
     Does NOT impose transactions; use the `microcosm_postgres.context.transactional` decorator.
 
+    Concurrent counts (`CountPolicy.EXACT_CONCURRENT`) call `store.count` on another thread and
+    require a store that is safe to use concurrently (e.g. one that does not share a session);
+    requests may not choose them.
+
+    Requests may choose one of `request_count_policies` (by default, the cheaper policies) using
+    the `X-Count-Policy` header; other values are ignored.
+
+    Exact counts may be cached using a `CountCache` (e.g. `graph.count_cache`); writes through
+    the adapter invalidate the cached counts of its model.
+
     """
-    def __init__(self, graph, store):
+    def __init__(
+        self,
+        graph,
+        store,
+        count_policy=CountPolicy.EXACT,
+        count_cache=None,
+        request_count_policies=REQUEST_COUNT_POLICIES,
+    ):
+        if CountPolicy.EXACT_CONCURRENT in request_count_policies:
+            raise ValueError("Requests may not choose concurrent counts")
+
         self.graph = graph
         self.store = store
+        self.count_policy = count_policy
+        self.count_cache = count_cache
+        self.request_count_policies = frozenset(request_count_policies)
 
     @property
     def identifier_key(self):
         return f"{name_for(self.store.model_class)}_id"
 
+    @property
+    def count_namespace(self):
+        return name_for(self.store.model_class)
+
     def create(self, **kwargs):
         model = self.store.model_class(**kwargs)
-        return self.store.create(model)
+        return self.invalidate_counts(self.store.create(model))
 
     def delete(self, **kwargs):
         identifier = kwargs.pop(self.identifier_key)
-        return self.store.delete(identifier)
+        return self.invalidate_counts(self.store.delete(identifier))
 
     def replace(self, **kwargs):
         identifier = kwargs.pop(self.identifier_key)
         model = self.store.model_class(id=identifier, **kwargs)
-        return self.store.replace(identifier, model)
+        return self.invalidate_counts(self.store.replace(identifier, model))
 
     def retrieve(self, **kwargs):
         identifier = kwargs.pop(self.identifier_key)
         return self.store.retrieve(identifier)
 
+    def resolve_count_policy(self):
+        """
+        Resolve the count policy, which requests may override with an allowed policy.
+
+        """
+        if has_request_context() and COUNT_POLICY_HEADER in request.headers:
+            try:
+                count_policy = CountPolicy(request.headers[COUNT_POLICY_HEADER].strip().lower())
+            except ValueError:
+                pass
+            else:
+                if count_policy in self.request_count_policies:
+                    return count_policy
+        return self.count_policy
+
     def search(self, offset, limit, **kwargs):
-        items = self.store.search(offset=offset, limit=limit, **kwargs)
-        count = self.store.count(**kwargs)
-        return items, count
+        count_policy = self.resolve_count_policy()
+
+        if count_policy == CountPolicy.EXACT_CONCURRENT:
+            count = self.cached_count(**kwargs)
+            if count is not None:
+                return self.store.search(offset=offset, limit=limit, **kwargs), count
+
+            future = COUNT_EXECUTOR.submit(copy_context().run, self.store.count, **kwargs)
+            items = self.store.search(offset=offset, limit=limit, **kwargs)
+            return items, self.cache_count(future.result(), **kwargs)
+
+        if count_policy == CountPolicy.EXACT:
+            items = self.store.search(offset=offset, limit=limit, **kwargs)
+            return items, self.count(**kwargs)
+
+        # search one item beyond the limit to determine whether there is a next page
+        items = self.store.search(offset=offset, limit=limit + 1, **kwargs)
+        if count_policy == CountPolicy.ESTIMATE:
+            return items, self.estimate_count(**kwargs)
+        return items, None
 
     def count(self, offset=None, limit=None, **kwargs):
-        count = self.store.count(**kwargs)
+        count = self.cached_count(**kwargs)
+        if count is None:
+            count = self.cache_count(self.store.count(**kwargs), **kwargs)
         return count
 
+    def cached_count(self, **kwargs):
+        if self.count_cache is None:
+            return None
+        return self.count_cache.get(self.count_namespace, kwargs)
+
+    def cache_count(self, count, **kwargs):
+        if self.count_cache is not None:
+            self.count_cache.set(self.count_namespace, kwargs, count)
+        return count
+
+    def invalidate_counts(self, result=None):
+        if self.count_cache is not None:
+            self.count_cache.invalidate(self.count_namespace)
+        return result
+
+    def export(self, offset, limit, **kwargs):
+        """
+        Search for one page of an export, without counting.
+
+        """
+        return self.store.search(offset=offset, limit=limit, **kwargs), None
+
+    def estimate_count(self, **kwargs):
+        """
+        Estimate the count using the store's `estimate_count` (if any).
+
+        """
+        estimate_count = getattr(self.store, "estimate_count", None)
+        if estimate_count is None:
+            return None
+        count = estimate_count(**kwargs)
+        if count is None:
+            return None
+        return EstimatedCount(count)
+
     def update(self, **kwargs):
         identifier = kwargs.pop(self.identifier_key)
         model = self.store.model_class(id=identifier, **kwargs)
-        return self.store.update(identifier, model)
+        return self.invalidate_counts(self.store.update(identifier, model))
 
     def update_batch(self, **kwargs):
         """
@@ -2,13 +2,35 @@
 Support for encoding and decoding request/response content.
 
 """
-from flask import request
+from functools import lru_cache
+
+from flask import Response, g, request
 from inflection import camelize
 from marshmallow.exceptions import ValidationError
-from werkzeug.exceptions import NotFound, UnprocessableEntity
+from marshmallow.fields import List, Nested
+from werkzeug.exceptions import NotFound, UnprocessableEntity, UnsupportedMediaType
 
-from microcosm_flask.enums import ResponseFormats
+from microcosm_flask.compiling import dump, remove_null_values
+from microcosm_flask.enums import ResponseFormats, parse_accept_header, quality_for
+from microcosm_flask.formatting import MsgPackFormatter
+from microcosm_flask.formatting.msgpack_formatter import loads as msgpack_loads
 from microcosm_flask.naming import name_for
+from microcosm_flask.timing import (
+    DUMP,
+    ETAG,
+    LOAD,
+    phase,
+)
+
+
+DEFAULT_RESPONSE_FORMATS = (ResponseFormats.JSON,)
+
+# request-scoped (`flask.g`) copies of decoded request data and of (response, dumped data),
+# so that the audit log does not decode request and response bodies again
+REQUEST_DATA = "microcosm_flask_request_data"
+RESPONSE_DATA = "microcosm_flask_response_data"
+# set (by the audit log) when the response body is captured; dumped data is only kept if so
+CAPTURE_RESPONSE_DATA = "microcosm_flask_capture_response_data"
 
 
 def with_headers(error, headers):
@@ -48,6 +70,57 @@ def encode_id_header(resource):
     }
 
 
+def encode_etag(version, response_format):
+    """
+    Generate an etag for a version of a response.
+
+    Responses for the same URI vary by negotiated response format and null value handling.
+
+    """
+    etag = f"{version}-{response_format.name.lower()}"
+    if should_skip_null():
+        etag += "-skip-null"
+    return etag
+
+
+def evaluate_etag(definition, response_format, **kwargs):
+    """
+    Compute the etag for an endpoint's response (before calling the endpoint), if possible.
+
+    :returns: an etag or `None` if the definition cannot compute one
+
+    """
+    if definition.etag_func is None:
+        return None
+
+    with phase(ETAG):
+        version = definition.etag_func(**kwargs)
+        if version is None:
+            return None
+
+        return encode_etag(version, response_format)
+
+
+def is_not_modified(etag):
+    """
+    Does the client already have the response with this etag?
+
+    """
+    if etag is None or request.method not in ("GET", "HEAD"):
+        return False
+    return request.if_none_match.contains_weak(etag)
+
+
+def make_not_modified_response(etag, headers=None):
+    """
+    Generate a `304 Not Modified` response.
+
+    """
+    response = Response(status=304, headers=headers)
+    response.set_etag(etag)
+    return response
+
+
 def encode_headers(resource):
     """
     Generate headers from a resource.
@@ -65,26 +138,47 @@ def load_request_data(request_schema):
     This is friendlier to client and test software, even at the cost of not distinguishing
     HTTP 400 and 415 errors.
 
+    Request data with a `Content-Type` of `application/msgpack` is decoded as MessagePack.
+
+    """
+    with phase(LOAD):
+        if request.mimetype == MsgPackFormatter.CONTENT_TYPE:
+            json_data = load_msgpack_request_data()
+        else:
+            try:
+                json_data = request.get_json(force=True) or {}
+            except Exception:
+                # if `simplejson` is installed, simplejson.scanner.JSONDecodeError will be raised
+                # on malformed JSON, where as built-in `json` returns None
+                json_data = {}
+        setattr(g, REQUEST_DATA, json_data)
+        try:
+            return request_schema.load(json_data)
+        except ValidationError as error:
+            raise with_context(
+                UnprocessableEntity("Validation error"),
+                [
+                    {
+                        "message": f"Could not validate field: {field}",
+                        "field": field,
+                        "reasons": reasons,
+                    } for field, reasons in error.messages.items()
+                ],
+            )
+
+
+def load_msgpack_request_data():
+    """
+    Decode MessagePack request data.
+
     """
     try:
-        json_data = request.get_json(force=True) or {}
-    except Exception:
-        # if `simplejson` is installed, simplejson.scanner.JSONDecodeError will be raised
-        # on malformed JSON, where as built-in `json` returns None
-        json_data = {}
-    try:
-        return request_schema.load(json_data)
-    except ValidationError as error:
-        raise with_context(
-            UnprocessableEntity("Validation error"),
-            [
-                {
-                    "message": f"Could not validate field: {field}",
-                    "field": field,
-                    "reasons": reasons,
-                } for field, reasons in error.messages.items()
-            ],
-        )
+        return msgpack_loads(request.get_data()) or {}
+    except ImportError:
+        raise UnsupportedMediaType("MessagePack request data is not supported")
+    except ValueError:
+        # malformed data is treated like malformed JSON
+        return {}
 
 
 def load_query_string_data(request_schema, query_string_data=None):
@@ -98,7 +192,8 @@ def load_query_string_data(request_schema, query_string_data=None):
         query_string_data = request.args
 
     try:
-        return request_schema.load(query_string_data)
+        with phase(LOAD):
+            return request_schema.load(query_string_data)
     except ValidationError as error:
         raise with_context(
             UnprocessableEntity("Validation error"),
@@ -106,23 +201,69 @@ def load_query_string_data(request_schema, query_string_data=None):
         )
 
 
-def remove_null_values(data):
-    if isinstance(data, dict):
-        return {
-            key: remove_null_values(value)
-            for key, value in data.items()
-            if value is not None
-        }
-    if type(data) in (list, tuple):
-        return type(data)(map(remove_null_values, data))
-    return data
+class WithoutItems:
+    """
+    Proxy a response object, hiding its `items`.
+
+    """
+    items = ()
+
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __getattr__(self, name):
+        return getattr(self._obj, name)
+
+
+def should_skip_null():
+    """
+    Should null values be omitted from the response?
+
+    """
+    # swagger does not currently support null values; remove these conditionally
+    return bool(request.headers.get("X-Response-Skip-Null"))
+
+
+def dump_with_schema(schema, obj, skip_null=False):
+    if skip_null:
+        # only compiled schemas skip null values as they dump
+        return dump(schema, obj, skip_null=True)
+    return schema.dump(obj)
+
+
+def dump_response_items_lazily(response_schema, response_data, skip_null=False):
+    """
+    Dump response data, deferring the dump of each of its `items` until it is consumed.
+
+    Applies to schemas with a nested `items` list (e.g. paginated lists); other
+    schemas are dumped as usual.
+
+    """
+    items_field = response_schema.fields.get("items")
+    if not isinstance(items_field, List) or not isinstance(items_field.inner, Nested):
+        return dump_with_schema(response_schema, response_data, skip_null)
+
+    item_schema = items_field.inner.schema
+    items = response_schema.get_attribute(response_data, "items", ())
+
+    if isinstance(response_data, dict):
+        dumped = dump_with_schema(response_schema, dict(response_data, items=()), skip_null)
+    else:
+        dumped = dump_with_schema(response_schema, WithoutItems(response_data), skip_null)
+
+    dumped[items_field.data_key or "items"] = (
+        dump_with_schema(item_schema, item, skip_null)
+        for item in items
+    )
+    return dumped
 
 
 def dump_response_data(response_schema,
                        response_data,
                        status_code=200,
                        headers=None,
-                       response_format=None):
+                       response_format=None,
+                       etag=None):
     """
     Dumps response data as JSON using the given schema.
 
@@ -131,11 +272,33 @@ def dump_response_data(response_schema,
     This is friendlier to client and test software, even at the cost of not distinguishing
     HTTP 400 and 406 errors.
 
-    """
-    if response_schema:
-        response_data = response_schema.dump(response_data)
+    Streaming response formats dump list items as the response is sent.
 
-    return make_response(response_data, response_schema, response_format, status_code, headers)
+    Null values are omitted while dumping (rather than removed afterwards) if requested
+    via the `X-Response-Skip-Null` header.
+
+    :param etag: a precomputed etag (see `evaluate_etag`)
+
+    """
+    if not response_schema:
+        return make_response(response_data, response_schema, response_format, status_code, headers, etag=etag)
+
+    skip_null = should_skip_null()
+    with phase(DUMP):
+        if response_format is not None and response_format.value.formatter.streaming:
+            response_data = dump_response_items_lazily(response_schema, response_data, skip_null)
+        else:
+            response_data = dump_with_schema(response_schema, response_data, skip_null)
+
+    return make_response(
+        response_data,
+        response_schema,
+        response_format,
+        status_code,
+        headers,
+        skip_null=False,
+        etag=etag,
+    )
 
 
 def make_response(response_data,
@@ -143,19 +306,40 @@ def make_response(response_data,
                   response_format=None,
                   status_code=200,
                   headers=None,
+                  skip_null=None,
+                  etag=None,
                   ):
+    """
+    Format (already dumped) response data.
+
+    Responses whose etag matches the `If-None-Match` header are sent as `304 Not Modified`
+    (without a body).
+
+    :param skip_null: remove null values from the response data; defaults to the
+                      `X-Response-Skip-Null` header
+    :param etag: a precomputed etag; otherwise, the etag is computed from the response body
 
+    """
     if response_format is None:
         response_format = ResponseFormats.JSON
 
     formatter = response_format.value.formatter(response_schema)
 
-    if request.headers.get("X-Response-Skip-Null"):
-        # swagger does not currently support null values; remove these conditionally
+    if skip_null is None:
+        skip_null = should_skip_null()
+
+    if skip_null:
         response_data = remove_null_values(response_data)
 
-    response = formatter(response_data, headers)
+    response = formatter(response_data, headers, etag=etag)
     response.status_code = status_code
+
+    if status_code == 200 and is_not_modified(response.get_etag()[0]):
+        response.status_code = 304
+
+    if not response.is_streamed and g.get(CAPTURE_RESPONSE_DATA):
+        setattr(g, RESPONSE_DATA, (response, response_data))
+
     return response
 
 
@@ -186,30 +370,48 @@ def require_response_data(response_data):
     return response_data
 
 
+@lru_cache(maxsize=1024)
+def negotiate_response_format(accept, allowed_response_formats):
+    """
+    Choose the allowed response format with the highest quality for an `Accept` header.
+
+    Ties are broken by response format priority. Negotiations are cached by header and
+    (tuple of) allowed formats.
+
+    """
+    accept_ranges = parse_accept_header(accept)
+    best_format, best_quality = None, 0.0
+
+    for response_format in ResponseFormats.prioritized():
+        if response_format not in allowed_response_formats:
+            continue
+        quality = quality_for(response_format, accept_ranges)
+        if quality > best_quality:
+            best_format, best_quality = response_format, quality
+
+    if best_format is None:
+        # fallback for previous behavior
+        return ResponseFormats.JSON
+    return best_format
+
+
 def find_response_format(allowed_response_formats):
     """
     Basic content negotiation logic.
 
-    If the 'Accept' header doesn't exactly match a format we can handle, we return JSON
+    If the 'Accept' header doesn't match a format we can handle, we return JSON
 
     """
     # allowed formats default to [] before this
     if not allowed_response_formats:
-        allowed_response_formats = [ResponseFormats.JSON]
+        allowed_response_formats = DEFAULT_RESPONSE_FORMATS
+    elif not isinstance(allowed_response_formats, tuple):
+        # endpoint definitions store tuples; accept any sequence
+        allowed_response_formats = tuple(allowed_response_formats)
 
     content_type = request.headers.get("Accept")
     if content_type is None:
         # Nothing specified, default to endpoint definition
-        if allowed_response_formats:
-            return allowed_response_formats[0]
-        # Finally, default to JSON
-        return ResponseFormats.JSON
-
-    for response_format in ResponseFormats.prioritized():
-        if response_format not in allowed_response_formats:
-            continue
-        if response_format.matches(content_type):
-            return response_format
+        return allowed_response_formats[0]
 
-    # fallback for previous behavior
-    return ResponseFormats.JSON
+    return negotiate_response_format(content_type, allowed_response_formats)
@@ -22,6 +22,7 @@ from microcosm_flask.conventions.encoding import (
 from microcosm_flask.conventions.registry import qs, request, response
 from microcosm_flask.operations import Operation
 from microcosm_flask.paging import OffsetLimitPage, identity
+from microcosm_flask.timing import CONTROLLER, phase
 
 
 class RelationConvention(Convention):
@@ -51,7 +52,8 @@ class RelationConvention(Convention):
         @wraps(definition.func)
         def create(**path_data):
             request_data = load_request_data(definition.request_schema)
-            response_data = require_response_data(definition.func(**merge_data(path_data, request_data)))
+            with phase(CONTROLLER):
+                response_data = require_response_data(definition.func(**merge_data(path_data, request_data)))
             headers = encode_id_header(response_data)
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(definition.response_formats)
@@ -82,7 +84,8 @@ class RelationConvention(Convention):
         def delete(**path_data):
             headers = dict()
             response_data = dict()
-            require_response_data(definition.func(**path_data))
+            with phase(CONTROLLER):
+                require_response_data(definition.func(**path_data))
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(definition.response_formats)
             return dump_response_data(
@@ -121,7 +124,8 @@ class RelationConvention(Convention):
         def replace(**path_data):
             headers = dict()
             request_data = load_request_data(definition.request_schema)
-            response_data = require_response_data(definition.func(**merge_data(path_data, request_data)))
+            with phase(CONTROLLER):
+                response_data = require_response_data(definition.func(**merge_data(path_data, request_data)))
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(definition.response_formats)
             return dump_response_data(
@@ -160,7 +164,8 @@ class RelationConvention(Convention):
         def replace(**path_data):
             headers = dict()
             request_data = load_request_data(definition.request_schema)
-            response_data = require_response_data(definition.func(**merge_data(path_data, request_data)))
+            with phase(CONTROLLER):
+                response_data = require_response_data(definition.func(**merge_data(path_data, request_data)))
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(definition.response_formats)
             return dump_response_data(
@@ -196,7 +201,8 @@ class RelationConvention(Convention):
         def retrieve(**path_data):
             headers = dict()
             request_data = load_query_string_data(request_schema)
-            response_data = require_response_data(definition.func(**merge_data(path_data, request_data)))
+            with phase(CONTROLLER):
+                response_data = require_response_data(definition.func(**merge_data(path_data, request_data)))
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(definition.response_formats)
             return dump_response_data(
@@ -235,7 +241,8 @@ class RelationConvention(Convention):
         @wraps(definition.func)
         def search(**path_data):
             page = self.page_cls.from_query_string(definition.request_schema)
-            result = definition.func(**merge_data(path_data, page.to_dict(func=identity)))
+            with phase(CONTROLLER):
+                result = definition.func(**merge_data(path_data, page.to_dict(func=identity)))
             response_data, headers = page.to_paginated_list(result, ns, Operation.SearchFor)
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(definition.response_formats)
@@ -11,6 +11,7 @@ from microcosm_flask.conventions.encoding import dump_response_data, load_reques
 from microcosm_flask.conventions.registry import request, response
 from microcosm_flask.operations import Operation
 from microcosm_flask.paging import OffsetLimitPage, identity
+from microcosm_flask.timing import CONTROLLER, phase
 
 
 class SavedSearchConvention(Convention):
@@ -47,7 +48,8 @@ class SavedSearchConvention(Convention):
             request_data = load_request_data(definition.request_schema)
             page = self.page_cls.from_dict(request_data)
             request_data.update(page.to_dict(func=identity))
-            result = definition.func(**merge_data(path_data, request_data))
+            with phase(CONTROLLER):
+                result = definition.func(**merge_data(path_data, request_data))
             response_data, headers = page.to_paginated_list(result, ns, Operation.SavedSearch)
             definition.header_func(headers, response_data)
             response_format = self.negotiate_response_content(definition.response_formats)
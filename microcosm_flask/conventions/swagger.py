@@ -3,13 +3,24 @@ Swagger (OpenAPI) convention.
 
 Exposes swagger definitions for matching operations.
 
+Definitions are built on first request and cached (as encoded JSON with an etag) until
+the url map changes. Definitions can also be built offline (see `microcosm_flask.swagger.cli`).
+
 """
-from flask import g
+from threading import Lock
+
+from flask import Response, g
 from marshmallow import Schema, fields
 from microcosm.api import defaults
 
 from microcosm_flask.conventions.base import Convention
-from microcosm_flask.conventions.encoding import load_query_string_data, make_response
+from microcosm_flask.conventions.encoding import (
+    is_not_modified,
+    load_query_string_data,
+    make_not_modified_response,
+    make_response,
+    should_skip_null,
+)
 from microcosm_flask.conventions.registry import iter_endpoints, request
 from microcosm_flask.namespaces import Namespace
 from microcosm_flask.operations import Operation
@@ -17,12 +28,20 @@ from microcosm_flask.swagger.definitions import build_swagger
 from microcosm_flask.templates import swagger_ui
 
 
+SWAGGER_NAMESPACES = "microcosm_flask.swagger"
+
+
 class ValidateSwaggerSchema(Schema):
     validate_schema = fields.Boolean()
 
 
 class SwaggerConvention(Convention):
 
+    def __init__(self, graph):
+        super().__init__(graph)
+        self.swagger_cache = {}
+        self.swagger_cache_lock = Lock()
+
     @property
     def matching_operations(self):
         return {
@@ -46,25 +65,78 @@ class SwaggerConvention(Convention):
 
         return list(iter_endpoints(self.graph, match_func))
 
+    def build_swagger_content(self, ns, validate_schema=False):
+        """
+        Build (or reuse) the encoded swagger definition.
+
+        Definitions vary by schema validation and null value handling; they are rebuilt if routes
+        have been added since they were cached.
+
+        :returns: a tuple of encoded definition, content type, and etag
+
+        """
+        # definitions do not depend on the request (e.g. its script root) otherwise
+        key = (ns.path, validate_schema, should_skip_null())
+        # routes are only ever added
+        version = sum(1 for _ in self.graph.flask.url_map.iter_rules())
+
+        cached = self.swagger_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with self.swagger_cache_lock:
+            cached = self.swagger_cache.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            swagger = build_swagger(
+                self.graph,
+                ns,
+                self.find_matching_endpoints(ns),
+                validate_schema=validate_schema,
+            )
+            response = make_response(swagger)
+            content = (response.get_data(), response.content_type, response.get_etag()[0])
+            self.swagger_cache[key] = (version, content)
+
+        return content
+
     def configure_discover(self, ns, definition):
         """
         Register a swagger endpoint for a set of operations.
 
         """
+        self.graph.flask.extensions.setdefault(SWAGGER_NAMESPACES, []).append((self, ns))
+
         @self.add_route(ns.singleton_path, Operation.Discover, ns)
         @request(ValidateSwaggerSchema)
         def discover():
             request_data = load_query_string_data(ValidateSwaggerSchema())
-
-            swagger = build_swagger(self.graph, ns, self.find_matching_endpoints(ns), **request_data)
             g.hide_body = True
-            return make_response(swagger)
+
+            data, content_type, etag = self.build_swagger_content(ns, **request_data)
+            if is_not_modified(etag):
+                return make_not_modified_response(etag)
+
+            response = Response(data, content_type=content_type)
+            response.set_etag(etag)
+            return response
 
         @self.add_route(f"{ns.singleton_path}/docs", Operation.Query, ns)
         def swagger_docs():
             return swagger_ui.html
 
 
+def iter_swagger_namespaces(graph):
+    """
+    Iterate through registered swagger namespaces.
+
+    :returns: a generator over (`SwaggerConvention`, `Namespace`) tuples
+
+    """
+    yield from graph.flask.extensions.get(SWAGGER_NAMESPACES, [])
+
+
 @defaults(
     name="swagger",
     operations=[
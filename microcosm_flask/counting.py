@@ -0,0 +1,126 @@
+"""
+Caching of (search) counts.
+
+Counts are cached per namespace and normalized search filters (i.e. the page's items
+without its offset and limit) for a short time to absorb bursts of identical searches.
+
+Entries expire after `ttl` seconds; the least recently used entries are evicted beyond
+`max_entries`. Writes through a `CRUDStoreAdapter` invalidate its namespace's entries;
+writes by other processes are only visible once entries expire.
+
+"""
+from collections import OrderedDict
+from enum import Enum
+from threading import Lock
+from time import monotonic
+
+from microcosm.api import binding, defaults, typed
+
+
+PAGING_KEYS = ("offset", "limit")
+
+
+def normalize(value):
+    """
+    Normalize a filter value into a hashable value.
+
+    :raises TypeError: if the value is not hashable
+
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, normalize(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(normalize(item) for item in value))
+    if isinstance(value, Enum):
+        return value.name
+    hash(value)
+    return value
+
+
+def fingerprint(filters):
+    """
+    Compute a fingerprint for search filters (e.g. `Page.to_items(func=identity)`).
+
+    :returns: a hashable fingerprint or `None` if the filters cannot be fingerprinted
+
+    """
+    items = filters.items() if isinstance(filters, dict) else filters
+    try:
+        return tuple(sorted(
+            (key, normalize(value))
+            for key, value in items
+            if key not in PAGING_KEYS
+        ))
+    except TypeError:
+        return None
+
+
+@binding("count_cache")
+@defaults(
+    ttl=typed(float, default_value=5.0),
+    max_entries=typed(int, default_value=1024),
+)
+class CountCache:
+    """
+    A thread-safe TTL cache of counts.
+
+    """
+    def __init__(self, graph):
+        config = graph.config.count_cache
+
+        self.ttl = config.ttl
+        self.max_entries = config.max_entries
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, namespace, filters):
+        """
+        Get a cached count.
+
+        :returns: the count or `None` on a miss
+
+        """
+        key = (namespace, fingerprint(filters))
+        now = monotonic()
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, namespace, filters, count):
+        key = (namespace, fingerprint(filters))
+        if key[1] is None or count is None:
+            return
+
+        with self.lock:
+            self.entries[key] = (monotonic() + self.ttl, count)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, namespace):
+        """
+        Remove all of a namespace's entries.
+
+        """
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == namespace]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
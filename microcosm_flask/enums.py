@@ -1,10 +1,17 @@
 from collections import namedtuple
 from enum import Enum, unique
+from functools import lru_cache
 
 from microcosm_flask.formatting import (
+    ArrowFormatter,
     CSVFormatter,
     HTMLFormatter,
     JSONFormatter,
+    MsgPackFormatter,
+    NDJSONFormatter,
+    ParquetFormatter,
+    StreamingCSVFormatter,
+    StreamingJSONFormatter,
     TextFormatter,
 )
 
@@ -14,21 +21,51 @@ ResponseFormatSpec = namedtuple("ResponseFormatSpec", ["content_type", "formatte
 
 @unique
 class ResponseFormats(Enum):
+    ARROW = ResponseFormatSpec(
+        content_type=ArrowFormatter.CONTENT_TYPE,
+        formatter=ArrowFormatter,
+        priority=110,
+    )
     CSV = ResponseFormatSpec(
         content_type=CSVFormatter.CONTENT_TYPE,
         formatter=CSVFormatter,
         priority=100,
     )
+    CSV_STREAMING = ResponseFormatSpec(
+        content_type=StreamingCSVFormatter.CONTENT_TYPE,
+        formatter=StreamingCSVFormatter,
+        priority=101,
+    )
     JSON = ResponseFormatSpec(
         content_type=JSONFormatter.CONTENT_TYPE,
         formatter=JSONFormatter,
         priority=1,
     )
+    JSON_STREAMING = ResponseFormatSpec(
+        content_type=StreamingJSONFormatter.CONTENT_TYPE,
+        formatter=StreamingJSONFormatter,
+        priority=3,
+    )
+    MSGPACK = ResponseFormatSpec(
+        content_type=MsgPackFormatter.CONTENT_TYPE,
+        formatter=MsgPackFormatter,
+        priority=2,
+    )
+    NDJSON = ResponseFormatSpec(
+        content_type=NDJSONFormatter.CONTENT_TYPE,
+        formatter=NDJSONFormatter,
+        priority=5,
+    )
     HTML = ResponseFormatSpec(
         content_type=HTMLFormatter.CONTENT_TYPE,
         formatter=HTMLFormatter,
         priority=10,
     )
+    PARQUET = ResponseFormatSpec(
+        content_type=ParquetFormatter.CONTENT_TYPE,
+        formatter=ParquetFormatter,
+        priority=111,
+    )
     TEXT = ResponseFormatSpec(
         content_type=TextFormatter.CONTENT_TYPE,
         formatter=TextFormatter,
@@ -44,21 +81,99 @@ class ResponseFormats(Enum):
         return self.value.priority
 
     def matches(self, content_types):
-        for content_type in content_types.split(","):
-            if self.matches_content_type(content_type):
-                return True
-        return False
+        return quality_for(self, parse_accept_header(content_types)) > 0
 
     def matches_content_type(self, content_type):
-        this = self.content_type.split("/", 1)
-        that = content_type.split(";", 1)[0].split("/", 1)
-
-        for (this_part, that_part) in zip(this, that):
-            if that_part != "*" and this_part != that_part:
-                return False
-
-        return True
+        return self.matches(content_type)
 
     @classmethod
+    # NB: called for every content negotiation; memoize
+    @lru_cache
     def prioritized(cls):
-        return sorted(cls, key=lambda this: this.priority)
+        return tuple(sorted(cls, key=lambda this: this.priority))
+
+
+def parse_accept_header(accept):
+    """
+    Parse an `Accept` header into a list of media ranges and their qualities.
+
+    :returns: a list of (type, subtype, quality) tuples
+
+    """
+    accept_ranges = []
+    for media_range in accept.split(","):
+        media_type, *params = media_range.split(";")
+        main_type, _, subtype = media_type.strip().lower().partition("/")
+        if not main_type:
+            continue
+
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    pass
+
+        accept_ranges.append((main_type, subtype or "*", quality))
+
+    return accept_ranges
+
+
+def quality_for(response_format, accept_ranges):
+    """
+    Compute the quality of a response format using the most specific matching media range.
+
+    See RFC 7231, section 5.3.2
+
+    """
+    main_type, _, subtype = response_format.content_type.partition("/")
+    specificity, quality = -1, 0.0
+
+    for range_type, range_subtype, range_quality in accept_ranges:
+        if range_subtype not in ("*", subtype):
+            continue
+        if range_type == "*":
+            range_specificity = 0
+        elif range_type != main_type:
+            continue
+        else:
+            range_specificity = 1 if range_subtype == "*" else 2
+
+        if range_specificity > specificity:
+            specificity, quality = range_specificity, range_quality
+
+    return quality
+
+
+@unique
+class CountPolicy(Enum):
+    """
+    How searches compute the total count of items.
+
+    """
+    # count after searching
+    EXACT = "exact"
+    # count while searching (on another thread)
+    EXACT_CONCURRENT = "exact-concurrent"
+    # use a (cheaper) estimate, if the store provides one
+    ESTIMATE = "estimate"
+    # do not count
+    SKIP = "skip"
+
+    @property
+    def is_exact(self):
+        return self in (CountPolicy.EXACT, CountPolicy.EXACT_CONCURRENT)
+
+
+@unique
+class OverflowPolicy(Enum):
+    """
+    What to do when a bounded queue is full.
+
+    """
+    # discard the oldest queued item (and count it)
+    DROP_OLDEST = "drop-oldest"
+    # wait for space
+    BLOCK = "block"
@@ -7,20 +7,26 @@ from typing import Any
 
 import microcosm.opaque  # noqa
 import simplejson
-from flask import Flask
+from flask import Flask, Response
 from flask.json.provider import DefaultJSONProvider
 from microcosm.api import defaults
 
+from microcosm_flask.json_backends import make_json_backend
+
 
 class FlaskV1JSONProvider(DefaultJSONProvider):
     """
     A JSON provider that brings back flask v1 behavior.
     That is decimals are not converted to strings but serialised as
     a float with all the precision included.
+
+    Responses and request data are encoded and decoded as bytes using a
+    configurable JSON backend (see `microcosm_flask.json_backends`).
     """
 
-    def __init__(self, app):
+    def __init__(self, app, json_backend="simplejson"):
         super().__init__(app)
+        self.backend = make_json_backend(json_backend, default=self.default)
 
     @staticmethod
     def default(o: Any) -> Any:
@@ -46,17 +52,39 @@ class FlaskV1JSONProvider(DefaultJSONProvider):
         :param s: Text or UTF-8 bytes.
         :param kwargs: Passed to :func:`json.loads`.
         """
-        return simplejson.loads(s, **kwargs)
+        if kwargs:
+            return simplejson.loads(s, **kwargs)
+        return self.backend.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize the given arguments as JSON bytes and return a response.
+        Output is indented if :attr:`compact` is ``False`` or debug mode is enabled.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = None
+
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            indent = 2
+
+        data = self.backend.dumps(
+            obj,
+            sort_keys=self.sort_keys,
+            ensure_ascii=self.ensure_ascii,
+            indent=indent,
+        )
+        return self._app.response_class(data + b"\n", mimetype=self.mimetype)
 
 
 def patch_flask_jsonifier(graph):
-    graph.flask.json = FlaskV1JSONProvider(graph.flask)
+    graph.flask.json = FlaskV1JSONProvider(graph.flask, json_backend=graph.config.flask.json_backend)
 
 
 @defaults(
     port=5000,
     enable_profiling=False,
     profile_dir=None,
+    json_backend="simplejson",
+    cursor_signing_key=None,
 )
 def configure_flask(graph):
     """
@@ -75,6 +103,7 @@ def configure_flask(graph):
         for key, value in graph.config.items()
         if not isinstance(value, dict)
     })
+    app.config["CURSOR_SIGNING_KEY"] = graph.config.flask.cursor_signing_key
 
     return app
 
@@ -91,6 +120,7 @@ def configure_flask_app(graph):
         "error_handlers",
         "logger",
         "opaque",
+        "response_compression",
     )
     patch_flask_jsonifier(graph)
     return graph.flask
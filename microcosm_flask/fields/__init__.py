@@ -3,6 +3,7 @@ Custom fields.
 
 """
 from microcosm_flask.fields.cleaned_field import CleanedField  # noqa: F401
+from microcosm_flask.fields.cursor_field import Cursor, CursorField, MissingCursorSigningKeyException  # noqa: F401
 from microcosm_flask.fields.enum_field import EnumField  # noqa: F401
 from microcosm_flask.fields.language_field import LanguageField  # noqa: F401
 from microcosm_flask.fields.order_by_field import OrderByField  # noqa: F401
@@ -0,0 +1,108 @@
+"""
+An opaque (and signed) pagination cursor field.
+
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from hashlib import sha256
+from hmac import compare_digest, new
+from json import dumps, loads
+
+from flask import current_app
+from marshmallow.fields import Field, ValidationError
+
+
+# the application config key for the signing key (see `flask.cursor_signing_key`)
+CURSOR_SIGNING_KEY = "CURSOR_SIGNING_KEY"
+
+
+class MissingCursorSigningKeyException(Exception):
+    pass
+
+
+def signing_key(app=None):
+    """
+    Sign cursors using the configured cursor signing key or the application's secret key.
+
+    Keys must be shared by all processes that serve an API, so that any of them can
+    decode cursors issued by the others.
+
+    :raises MissingCursorSigningKeyException: if neither key is configured
+
+    """
+    if app is None:
+        app = current_app
+
+    key = app.config.get(CURSOR_SIGNING_KEY) or app.secret_key
+    if not key:
+        raise MissingCursorSigningKeyException(
+            "Cursor pagination requires `flask.cursor_signing_key` (or the application's secret key)",
+        )
+
+    return key.encode("utf-8") if isinstance(key, str) else key
+
+
+def sign(payload):
+    return urlsafe_b64encode(
+        new(signing_key(), payload, sha256).digest()[:16],
+    ).rstrip(b"=").decode("ascii")
+
+
+def encode_value(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class Cursor(tuple):
+    """
+    The sort key value(s) of the last item of a page.
+
+    Encodes as an opaque token (when converted to a string), so that cursors can be passed
+    to controllers as-is (as a tuple) and to links as query string values.
+
+    Values are encoded as JSON; other types (e.g. `UUID` or `datetime`) are decoded as strings.
+
+    """
+    def __str__(self):
+        return self.encode()
+
+    def encode(self):
+        payload = urlsafe_b64encode(
+            dumps(list(self), default=encode_value, separators=(",", ":")).encode("utf-8"),
+        ).rstrip(b"=")
+        return f"{payload.decode('ascii')}.{sign(payload)}"
+
+    @classmethod
+    def decode(cls, token):
+        """
+        Decode and verify a cursor token.
+
+        :raises ValueError: if the token is malformed or its signature does not match
+
+        """
+        payload, _, signature = token.partition(".")
+        if not compare_digest(signature, sign(payload.encode("ascii"))):
+            raise ValueError("Cursor signature does not match")
+
+        values = loads(urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        if not isinstance(values, list):
+            raise ValueError("Cursor must encode a list of values")
+
+        return cls(values)
+
+
+class CursorField(Field):
+    """
+    Load a `Cursor` from its token (and dump the token).
+
+    """
+    def _serialize(self, value, attr, obj, **kwargs):
+        if value is None:
+            return None
+        return str(value)
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            return Cursor.decode(value)
+        except (AttributeError, TypeError, ValueError):
+            raise ValidationError("Not a valid cursor.")
@@ -0,0 +1,276 @@
+"""
+Columnar (Apache Arrow and Parquet) response formatting.
+
+Columns are derived from the response schema's fields (of its `items`, for list responses)
+using the swagger parameter type of each field. Strings, numbers, booleans, and lists of these
+map to the corresponding Arrow types; other values (e.g. nested objects and `_links`) are
+written as JSON text. Decimal fields with fixed `places` map to Arrow decimals (of that scale)
+and other decimal fields to strings, so that values are exact.
+
+Rows are written in record batches of `chunk_size` as items are consumed, so the response
+is streamed without holding all items in memory.
+
+"""
+from decimal import Decimal
+from io import RawIOBase
+
+from flask import (
+    Response,
+    current_app,
+    has_request_context,
+    stream_with_context,
+)
+from marshmallow import fields
+from marshmallow.fields import List, Nested
+
+from microcosm_flask.formatting.base import BaseFormatter
+from microcosm_flask.swagger.parameters import Parameters
+
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+ARROW_COLUMNS = "_microcosm_flask_arrow_columns"
+# the maximum precision of 128-bit Arrow decimals
+DECIMAL_PRECISION = 38
+
+
+def arrow_type_for(parameter):
+    """
+    Map a swagger parameter to an Arrow type and a value converter.
+
+    :returns: a tuple of Arrow type and converter or `None` for JSON values
+
+    """
+    parameter_type = parameter.get("type")
+    if parameter_type == "array":
+        item_type = arrow_type_for(parameter.get("items", {}))
+        if item_type is None:
+            return None
+        return list_type_of(item_type)
+    if parameter_type == "string":
+        return pyarrow.string(), str
+    if parameter_type == "integer":
+        return pyarrow.int64(), int
+    if parameter_type in ("number", "float"):
+        return pyarrow.float64(), float
+    if parameter_type == "boolean":
+        return pyarrow.bool_(), bool
+    return None
+
+
+def list_type_of(item_type):
+    arrow_type, convert_item = item_type
+    return pyarrow.list_(arrow_type), lambda value: [
+        None if item is None else convert_item(item)
+        for item in value
+    ]
+
+
+def decimal_type_for(field):
+    """
+    Map a decimal field to an Arrow type and a value converter.
+
+    Decimals are only of a known scale if the field quantizes them (using `places`).
+
+    """
+    if field.places is None:
+        return pyarrow.string(), str
+    scale = -field.places.as_tuple().exponent
+    return pyarrow.decimal128(DECIMAL_PRECISION, scale), Decimal
+
+
+def arrow_type_for_field(field, parameters):
+    """
+    Map a schema field to an Arrow type and a value converter.
+
+    :returns: a tuple of Arrow type and converter or `None` for JSON values
+
+    """
+    if isinstance(field, fields.Decimal):
+        return decimal_type_for(field)
+    if isinstance(field, List) and isinstance(field.inner, fields.Decimal):
+        return list_type_of(decimal_type_for(field.inner))
+    try:
+        return arrow_type_for(parameters.build(field))
+    except KeyError:
+        # no mapped swagger type
+        return None
+
+
+def build_columns(schema):
+    """
+    Build (and cache) the columns for the dumped items of a schema.
+
+    :returns: a list of tuples of column name, Arrow type, and value converter
+
+    """
+    columns = getattr(schema, ARROW_COLUMNS, None)
+    if columns is not None:
+        return columns
+
+    parameters = Parameters()
+    columns = []
+    for name, field in schema.dump_fields.items():
+        arrow_type = arrow_type_for_field(field, parameters)
+        if arrow_type is None:
+            arrow_type = (pyarrow.string(), encode_json)
+        columns.append((field.data_key or name, *arrow_type))
+
+    setattr(schema, ARROW_COLUMNS, columns)
+    return columns
+
+
+def encode_json(value):
+    return current_app.json.dumps(value, separators=(",", ":"))
+
+
+class ChunkSink(RawIOBase):
+    """
+    A write-only file that buffers output until it is drained.
+
+    Unlike a (truncated) `BytesIO`, its position counts all bytes written, which writers
+    may use to record offsets (e.g. Parquet row groups).
+
+    """
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def item_schema_for(response_schema):
+    items_field = response_schema.fields.get("items")
+    if isinstance(items_field, List) and isinstance(items_field.inner, Nested):
+        return items_field.inner.schema
+    return response_schema
+
+
+class ArrowFormatter(BaseFormatter):
+    """
+    Stream rows in the Arrow IPC streaming format.
+
+    """
+    CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+    streaming = True
+    chunk_size = 1000
+
+    @property
+    def content_type(self):
+        return ArrowFormatter.CONTENT_TYPE
+
+    def build_response(self, response_data):
+        if pyarrow is None:
+            raise ImportError("Columnar formatting requires `pyarrow` to be installed")
+        if self.response_schema is None:
+            # fail before the response (and its status) is sent
+            raise ValueError("Columnar formatting requires a response schema")
+
+        content = self.format(response_data)
+        if has_request_context():
+            # keep the request context available while items (and their links) are dumped
+            content = stream_with_context(content)
+
+        return Response(content, content_type=self.content_type)
+
+    def build_headers(self, headers, **kwargs):
+        headers["Content-Disposition"] = f"attachment; filename=\"{self.filename}\""
+        return headers
+
+    @property
+    def filename(self):
+        return "response.arrow"
+
+    def make_writer(self, sink, arrow_schema):
+        return pyarrow.ipc.new_stream(sink, arrow_schema)
+
+    def iter_batches(self, response_data):
+        """
+        Generate record batches from JSON-like data.
+
+        """
+        columns = build_columns(item_schema_for(self.response_schema))
+        arrow_schema = pyarrow.schema([(name, arrow_type) for name, arrow_type, _ in columns])
+
+        if isinstance(response_data, dict) and "items" in response_data:
+            items = response_data["items"]
+        else:
+            items = [response_data]
+
+        yield arrow_schema
+
+        rows = []
+        for item in items:
+            rows.append(item)
+            if len(rows) == self.chunk_size:
+                yield self.make_batch(arrow_schema, columns, rows)
+                rows = []
+
+        if rows:
+            yield self.make_batch(arrow_schema, columns, rows)
+
+    def make_batch(self, arrow_schema, columns, rows):
+        return pyarrow.RecordBatch.from_arrays(
+            [
+                pyarrow.array(
+                    [
+                        None if row.get(name) is None else convert(row[name])
+                        for row in rows
+                    ],
+                    type=arrow_type,
+                )
+                for name, arrow_type, convert in columns
+            ],
+            schema=arrow_schema,
+        )
+
+    def format(self, response_data):
+        batches = self.iter_batches(response_data)
+        sink = ChunkSink()
+
+        with self.make_writer(sink, next(batches)) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                yield sink.drain()
+
+        yield sink.drain()
+
+
+class ParquetFormatter(ArrowFormatter):
+    """
+    Stream rows as a Parquet file, with one row group per record batch.
+
+    """
+    CONTENT_TYPE = "application/vnd.apache.parquet"
+
+    @property
+    def content_type(self):
+        return ParquetFormatter.CONTENT_TYPE
+
+    @property
+    def filename(self):
+        return "response.parquet"
+
+    def make_writer(self, sink, arrow_schema):
+        return pyarrow.parquet.ParquetWriter(sink, arrow_schema)
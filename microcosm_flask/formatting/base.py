@@ -10,6 +10,7 @@ from werkzeug.http import quote_etag
 from werkzeug.utils import get_content_type
 
 from microcosm_flask.formatting.encoding import UTF_8
+from microcosm_flask.timing import ETAG, FORMAT, phase
 
 
 try:
@@ -19,16 +20,21 @@ except ImportError:
 
 
 class BaseFormatter(metaclass=ABCMeta):
+    # streaming formatters accept lazily dumped `items` (see `dump_response_data`)
+    streaming = False
+
     def __init__(self, response_schema=None):
         # Formatting could need the response schema
         # e.g. to specify column ordering in CSV response
         self.response_schema = response_schema
 
     def __call__(self, response_data, headers=None, **kwargs):
-        response = self.build_response(response_data)
-        headers = self.build_headers(headers=headers or {}, **kwargs)
-        response.headers.extend(headers)
-        self.build_etag(response, **kwargs)
+        with phase(FORMAT):
+            response = self.build_response(response_data)
+            headers = self.build_headers(headers=headers or {}, **kwargs)
+            response.headers.extend(headers)
+        with phase(ETAG):
+            self.build_etag(response, **kwargs)
         return response
 
     @property
@@ -48,7 +54,7 @@ class BaseFormatter(metaclass=ABCMeta):
     def build_headers(self, headers, **kwargs):
         return headers
 
-    def build_etag(self, response, include_etag=True, **kwargs):
+    def build_etag(self, response, include_etag=True, etag=None, **kwargs):
         """
         Add an etag to the response body.
 
@@ -56,10 +62,21 @@ class BaseFormatter(metaclass=ABCMeta):
 
         See: http://blog.reverberate.org/2012/01/state-of-hash-functions-2012.html
 
+        :param etag: a precomputed etag (e.g. from the version of the response), which
+                     avoids hashing the response body
+
         """
         if not include_etag:
             return
 
+        if etag is not None:
+            response.set_etag(etag)
+            return
+
+        if response.is_streamed:
+            # the body is not known until after the headers are sent
+            return
+
         if not spooky:
             # use built-in SHA-1
             response.add_etag()
@@ -4,7 +4,9 @@ CSV response formatting.
 """
 from csv import QUOTE_MINIMAL, writer
 from io import StringIO
+from itertools import chain
 
+from flask import has_request_context, stream_with_context
 from werkzeug import Response
 from werkzeug.utils import get_content_type
 
@@ -53,31 +55,77 @@ class CSVFormatter(BaseFormatter):
 
         return column_names
 
-    def format(self, response_data):
+    def iter_rows(self, response_data):
         """
-        Make Flask `Response` object, with data returned as a generator for the CSV content
-        The CSV is built from JSON-like object (Python `dict` or list of `dicts`)
+        Generate CSV rows (including a header row, if any) from JSON-like data.
+
+        Items are consumed one at a time, so `items` may be any iterable.
 
         """
         if "items" in response_data:
-            list_response_data = response_data["items"]
+            items = iter(response_data["items"])
         else:
-            list_response_data = [response_data]
+            items = iter([response_data])
 
-        write_column_names = type(list_response_data[0]) not in (tuple, list)
+        first_item = next(items, None)
+        if first_item is None:
+            return
 
+        write_column_names = type(first_item) not in (tuple, list)
+
+        if write_column_names:
+            column_names = self.get_column_names([first_item])
+            yield column_names
+
+        for item in chain([first_item], items):
+            yield [item[column] for column in column_names] if write_column_names else list(item)
+
+    def format(self, response_data):
+        """
+        Build the CSV content from a JSON-like object (Python `dict` or list of `dicts`)
+
+        """
         output = StringIO()
         csv_writer = writer(output, quoting=QUOTE_MINIMAL)
+        csv_writer.writerows(self.iter_rows(response_data))
+        return [output.getvalue()]
 
-        if write_column_names:
-            column_names = self.get_column_names(list_response_data)
-            csv_writer.writerow(column_names)
 
-        for item in list_response_data:
-            csv_writer.writerow(
-                [item[column] for column in column_names] if write_column_names else list(item)
-            )
+class StreamingCSVFormatter(CSVFormatter):
+    """
+    CSV formatting that writes rows as the response is sent.
+
+    Rows are encoded in chunks of `chunk_size` as `items` are consumed, so neither the items
+    nor the CSV content need to be held in memory at once. Streamed responses have no ETag.
+
+    """
+    streaming = True
+    chunk_size = 500
+
+    def build_response(self, response_data):
+        content = self.format(response_data)
+        if has_request_context():
+            # keep the request context available while rows (and their links) are dumped
+            content = stream_with_context(content)
+
+        response = Response(
+            content,
+            content_type=get_content_type(self.content_type, UTF_8)
+        )
+        response.charset = UTF_8_SIG
+        return response
+
+    def format(self, response_data):
+        output = StringIO()
+        csv_writer = writer(output, quoting=QUOTE_MINIMAL)
+
+        for index, row in enumerate(self.iter_rows(response_data), 1):
+            csv_writer.writerow(row)
+            if index % self.chunk_size == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
 
-        # Ideally we'd want to `yield` each line to stream the content
-        # But something downstream seems to break streaming
-        yield output.getvalue()
+        remaining = output.getvalue()
+        if remaining:
+            yield remaining
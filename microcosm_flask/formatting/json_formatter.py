@@ -1,6 +1,14 @@
-from flask import jsonify
+from flask import (
+    Response,
+    current_app,
+    has_request_context,
+    jsonify,
+    stream_with_context,
+)
+from werkzeug.utils import get_content_type
 
 from microcosm_flask.formatting.base import BaseFormatter
+from microcosm_flask.formatting.encoding import UTF_8
 
 
 class JSONFormatter(BaseFormatter):
@@ -13,3 +21,57 @@ class JSONFormatter(BaseFormatter):
 
     def build_response(self, response_data):
         return jsonify(response_data)
+
+
+class StreamingJSONFormatter(JSONFormatter):
+    """
+    JSON formatting that writes list items as the response is sent.
+
+    List responses (e.g. paginated lists) are written as a JSON object whose `items` array
+    is encoded in chunks of `chunk_size` as items are consumed; other responses are written
+    as a single document. Streamed responses have no ETag.
+
+    """
+    streaming = True
+    chunk_size = 500
+
+    def build_response(self, response_data):
+        content = self.format(response_data)
+        if has_request_context():
+            # keep the request context available while items (and their links) are dumped
+            content = stream_with_context(content)
+
+        return Response(
+            content,
+            content_type=get_content_type(self.content_type, UTF_8)
+        )
+
+    def format(self, response_data):
+        dumps = current_app.json.dumps
+
+        if not isinstance(response_data, dict) or "items" not in response_data:
+            yield dumps(response_data)
+            return
+
+        envelope = {
+            key: value
+            for key, value in response_data.items()
+            if key != "items"
+        }
+        # open the items array within the envelope object
+        yield "{}{}\"items\":[".format(
+            dumps(envelope).rstrip()[:-1],
+            "," if envelope else "",
+        )
+
+        chunk = []
+        separator = ""
+        for item in response_data["items"]:
+            chunk.append(dumps(item))
+            if len(chunk) == self.chunk_size:
+                yield separator + ",".join(chunk)
+                chunk, separator = [], ","
+
+        if chunk:
+            yield separator + ",".join(chunk)
+        yield "]}"
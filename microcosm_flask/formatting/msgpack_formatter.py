@@ -0,0 +1,84 @@
+"""
+MessagePack request and response formatting.
+
+Values are encoded using the same conventions as the Flask JSON provider
+(see `microcosm_flask.factories.FlaskV1JSONProvider`):
+
+ -  `UUID` values are encoded as strings
+ -  `date` and `datetime` values are encoded as HTTP dates
+ -  `Enum` values are encoded using their (`str` or `int`) value
+ -  named tuples are encoded as maps
+
+`Decimal` values are encoded exactly (as the JSON provider writes exact numbers): as integers if
+integral and otherwise as an extension type (`DECIMAL_EXT_TYPE`) holding the decimal's string
+representation (e.g. `b"1.10"`), which `loads` decodes as a `Decimal`.
+
+"""
+from decimal import Decimal
+
+from microcosm_flask.factories import FlaskV1JSONProvider
+from microcosm_flask.formatting.base import BaseFormatter
+
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# exact types are required (see `encode_default`)
+NATIVE_TYPES = (bool, int, float, str, bytes, dict, list)
+
+DECIMAL_EXT_TYPE = 1
+
+
+def encode_default(obj):
+    """
+    Encode types that are not natively supported.
+
+    Subclasses of native types (e.g. `str` and `int` enums) are passed here as well,
+    so that they are encoded consistently with JSON.
+
+    """
+    if isinstance(obj, Decimal):
+        if obj.is_finite() and obj == obj.to_integral_value():
+            return int(obj)
+        return msgpack.ExtType(DECIMAL_EXT_TYPE, str(obj).encode("ascii"))
+    if isinstance(obj, tuple):
+        if hasattr(obj, "_asdict"):
+            return obj._asdict()
+        return list(obj)
+    for native_type in NATIVE_TYPES:
+        if isinstance(obj, native_type):
+            return native_type(obj) if native_type is not str else str.__str__(obj)
+    return FlaskV1JSONProvider.default(obj)
+
+
+def dumps(obj):
+    if msgpack is None:
+        raise ImportError("MessagePack formatting requires `msgpack` to be installed")
+    return msgpack.packb(obj, default=encode_default, strict_types=True)
+
+
+def loads(data):
+    if msgpack is None:
+        raise ImportError("MessagePack formatting requires `msgpack` to be installed")
+    return msgpack.unpackb(data, raw=False, ext_hook=decode_ext)
+
+
+def decode_ext(code, data):
+    if code == DECIMAL_EXT_TYPE:
+        return Decimal(data.decode("ascii"))
+    return msgpack.ExtType(code, data)
+
+
+class MsgPackFormatter(BaseFormatter):
+
+    CONTENT_TYPE = "application/msgpack"
+
+    @property
+    def content_type(self):
+        return MsgPackFormatter.CONTENT_TYPE
+
+    def format(self, response_data):
+        return dumps(response_data)
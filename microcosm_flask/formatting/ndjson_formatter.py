@@ -0,0 +1,88 @@
+"""
+Newline-delimited JSON response formatting.
+
+"""
+from functools import partial
+
+from flask import (
+    Response,
+    current_app,
+    has_request_context,
+    stream_with_context,
+)
+from werkzeug.utils import get_content_type
+
+from microcosm_flask.formatting.base import BaseFormatter
+from microcosm_flask.formatting.encoding import UTF_8
+
+
+class NDJSONFormatter(BaseFormatter):
+    """
+    Stream one JSON document per line.
+
+    List responses (e.g. paginated lists) start with an envelope line containing everything
+    except the `items` (such as paging metadata and `_links`), followed by one line per item.
+    Items are encoded in chunks of `chunk_size` as they are consumed. Other responses are
+    written as a single line.
+
+    """
+    CONTENT_TYPE = "application/x-ndjson"
+
+    streaming = True
+    chunk_size = 500
+
+    @property
+    def content_type(self):
+        return NDJSONFormatter.CONTENT_TYPE
+
+    def build_response(self, response_data):
+        content = self.format(response_data)
+        if has_request_context():
+            # keep the request context available while items (and their links) are dumped
+            content = stream_with_context(content)
+
+        return Response(
+            content,
+            content_type=get_content_type(self.content_type, UTF_8)
+        )
+
+    def make_dumps(self):
+        """
+        Encode one line using the application's JSON provider.
+
+        """
+        provider = current_app.json
+        backend = getattr(provider, "backend", None)
+        if backend is None:
+            return lambda obj: provider.dumps(obj, separators=(",", ":")).encode(UTF_8)
+
+        return partial(
+            backend.dumps,
+            sort_keys=provider.sort_keys,
+            ensure_ascii=provider.ensure_ascii,
+        )
+
+    def iter_lines(self, response_data):
+        if not isinstance(response_data, dict) or "items" not in response_data:
+            yield response_data
+            return
+
+        yield {
+            key: value
+            for key, value in response_data.items()
+            if key != "items"
+        }
+        yield from response_data["items"]
+
+    def format(self, response_data):
+        dumps = self.make_dumps()
+        lines = []
+
+        for line in self.iter_lines(response_data):
+            lines.append(dumps(line))
+            if len(lines) == self.chunk_size:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+
+        if lines:
+            yield b"\n".join(lines) + b"\n"
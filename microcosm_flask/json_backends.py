@@ -0,0 +1,190 @@
+"""
+Pluggable JSON encoding backends.
+
+Backends encode to and decode from UTF-8 bytes, using the same conventions as the
+Flask JSON provider (see `microcosm_flask.factories.FlaskV1JSONProvider`):
+
+ -  `Decimal` values are encoded as exact JSON numbers
+ -  `UUID` values are encoded as strings
+ -  `date` and `datetime` values are encoded as HTTP dates
+ -  `Enum` values are encoded using their (`str` or `int`) value
+
+`simplejson` is the reference implementation. Faster backends delegate to it for any
+document they cannot encode or decode identically (e.g. `Decimal` values without
+`orjson.Fragment`, non-ASCII text when `ensure_ascii` is set, floats written with an
+exponent, or integers beyond 64 bits).
+
+Known differences from `simplejson`:
+
+ -  `stdlib` encodes named tuples as arrays (rather than objects)
+
+"""
+import json
+from abc import ABCMeta, abstractmethod
+from decimal import Decimal
+from re import compile
+
+import simplejson
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+UTF_8 = "utf-8"
+
+# orjson writes exponents without padding or `+` (e.g. `1e20` rather than `1e+20`)
+EXPONENT = compile(rb"\d[eE][-+]?\d")
+# orjson decodes integers beyond 64 bits as floats; integers have at most 19 digits within 64 bits
+LONG_NUMBER = compile(rb"\d{19}")
+
+
+class JSONBackend(metaclass=ABCMeta):
+    """
+    Encode and decode JSON as bytes.
+
+    """
+    name = None
+
+    def __init__(self, default):
+        """
+        :param default: a function to encode types that are not natively supported
+
+        """
+        self.default = default
+
+    @abstractmethod
+    def dumps(self, obj, sort_keys=True, ensure_ascii=True, indent=None):
+        pass
+
+    @abstractmethod
+    def loads(self, data):
+        pass
+
+
+class SimpleJSONBackend(JSONBackend):
+    name = "simplejson"
+
+    def dumps(self, obj, sort_keys=True, ensure_ascii=True, indent=None):
+        return simplejson.dumps(
+            obj,
+            default=self.default,
+            ensure_ascii=ensure_ascii,
+            sort_keys=sort_keys,
+            indent=indent,
+            separators=None if indent else (",", ":"),
+        ).encode(UTF_8)
+
+    def loads(self, data):
+        return simplejson.loads(data)
+
+
+class StdlibJSONBackend(SimpleJSONBackend):
+    name = "stdlib"
+
+    def encode_default(self, obj):
+        if isinstance(obj, Decimal):
+            # the standard library cannot encode an exact number
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        return self.default(obj)
+
+    def dumps(self, obj, sort_keys=True, ensure_ascii=True, indent=None):
+        try:
+            return json.dumps(
+                obj,
+                default=self.encode_default,
+                ensure_ascii=ensure_ascii,
+                sort_keys=sort_keys,
+                indent=indent,
+                separators=None if indent else (",", ":"),
+            ).encode(UTF_8)
+        except TypeError:
+            return super().dumps(obj, sort_keys=sort_keys, ensure_ascii=ensure_ascii, indent=indent)
+
+    def loads(self, data):
+        return json.loads(data, parse_constant=self.decode_constant)
+
+    def decode_constant(self, constant):
+        # match simplejson, which rejects `NaN` and `Infinity`
+        raise ValueError(f"Out of range float values are not JSON compliant: {constant}")
+
+
+class OrJSONBackend(SimpleJSONBackend):
+    name = "orjson"
+
+    def __init__(self, default):
+        if orjson is None:
+            raise ImportError("The orjson JSON backend requires `orjson` to be installed")
+        super().__init__(default)
+
+    def encode_default(self, obj):
+        if isinstance(obj, Decimal):
+            if not hasattr(orjson, "Fragment"):
+                # orjson < 3.9 cannot encode an exact number
+                raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+            return orjson.Fragment(str(obj))
+        if isinstance(obj, tuple) and hasattr(obj, "_asdict"):
+            # match simplejson's encoding of named tuples
+            return obj._asdict()
+        return self.default(obj)
+
+    def dumps(self, obj, sort_keys=True, ensure_ascii=True, indent=None):
+        if indent not in (None, 2):
+            return super().dumps(obj, sort_keys=sort_keys, ensure_ascii=ensure_ascii, indent=indent)
+
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+
+        try:
+            data = orjson.dumps(obj, default=self.encode_default, option=option)
+        except TypeError:
+            return super().dumps(obj, sort_keys=sort_keys, ensure_ascii=ensure_ascii, indent=indent)
+
+        if (ensure_ascii and not data.isascii()) or EXPONENT.search(data):
+            # orjson cannot escape non-ASCII text or write exponents as simplejson does
+            return super().dumps(obj, sort_keys=sort_keys, ensure_ascii=ensure_ascii, indent=indent)
+
+        return data
+
+    def loads(self, data):
+        if isinstance(data, str):
+            data = data.encode(UTF_8)
+        if LONG_NUMBER.search(data):
+            # orjson would lose the precision of integers beyond 64 bits
+            return super().loads(data)
+
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # orjson is stricter than simplejson (e.g. for out of range floats); let simplejson decide
+            return super().loads(data)
+
+
+JSON_BACKENDS = {
+    backend_type.name: backend_type
+    for backend_type in (
+        OrJSONBackend,
+        SimpleJSONBackend,
+        StdlibJSONBackend,
+    )
+}
+
+
+def make_json_backend(name, default):
+    """
+    Create a JSON backend by name.
+
+    :param name: one of `orjson`, `simplejson`, or `stdlib`
+    :param default: a function to encode types that are not natively supported
+
+    """
+    try:
+        backend_type = JSON_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unsupported JSON backend: {name}")
+    return backend_type(default=default)
@@ -2,10 +2,14 @@
 Metrics extensions for routes.
 
 """
+from functools import wraps
+
 from microcosm.api import defaults, typed
 from microcosm.config.types import boolean
 from microcosm.errors import NotBoundError
 
+from microcosm_flask.timing import get_phase_timings
+
 
 @defaults(
     enabled=typed(boolean, default_value=True),
@@ -51,6 +55,28 @@ class RouteMetrics:
                 key,
                 tags=tags,
             )
+            if self.graph.phase_timing.enabled:
+                func = self.phase_timing(key, tags)(func)
             return timing(counting(func))
 
         return decorator
+
+    def phase_timing(self, key, tags):
+        """
+        Send the phase timings of a route (see `microcosm_flask.timing`), tagged by phase.
+
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    for name, elapsed_ms in (get_phase_timings() or {}).items():
+                        self.metrics.histogram(
+                            f"{key}.phase",
+                            elapsed_ms,
+                            tags=tags + [f"phase:{name}"],
+                        )
+            return wrapper
+        return decorator
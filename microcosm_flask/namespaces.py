@@ -14,12 +14,14 @@ from werkzeug.exceptions import InternalServerError
 from microcosm_flask.naming import (
     alias_path_for,
     collection_path_for,
+    export_path_for,
     instance_path_for,
     name_for,
     relation_path_for,
     singleton_path_for,
 )
 from microcosm_flask.operations import Operation
+from microcosm_flask.url_templates import build_external_url
 
 
 class Namespace:
@@ -103,6 +105,10 @@ class Namespace:
     def collection_path(self):
         return self.path + collection_path_for(self.subject)
 
+    @property
+    def export_path(self):
+        return self.path + export_path_for(self.subject)
+
     @property
     def instance_path(self):
         return self.path + instance_path_for(self.subject, self.identifier_type, self.identifier_key)
@@ -165,7 +171,12 @@ class Namespace:
             In particular, _external=True produces absolute url.
 
         """
-        return url_for(self.endpoint_for(operation), _external=_external, **kwargs)
+        endpoint = self.endpoint_for(operation)
+        if _external:
+            url = build_external_url(endpoint, kwargs)
+            if url is not None:
+                return url
+        return url_for(endpoint, _external=_external, **kwargs)
 
     def href_for(self, operation, qs=None, **kwargs):
         """
@@ -175,7 +186,9 @@ class Namespace:
         :param kwargs: additional arguments for path expansion
 
         """
-        url = urljoin(request.url_root, self.url_for(operation, **kwargs))
+        url = build_external_url(self.endpoint_for(operation), kwargs)
+        if url is None:
+            url = urljoin(request.url_root, self.url_for(operation, **kwargs))
         qs_character = "?" if url.find("?") == -1 else "&"
 
         return "{}{}".format(
@@ -35,6 +35,16 @@ def collection_path_for(name):
     )
 
 
+def export_path_for(name):
+    """
+    Get a path for exporting a collection of things.
+
+    """
+    return "/{}/export".format(
+        name_for(name),
+    )
+
+
 def singleton_path_for(name):
     """
     Get a path for a singleton thing.
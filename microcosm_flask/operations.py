@@ -36,6 +36,7 @@ class Operation(Enum):
     UpdateBatch = OperationInfo("update_batch", "PATCH", NODE_PATTERN, 200)
     CreateCollection = OperationInfo("create_collection", "POST", NODE_PATTERN, 200)
     SavedSearch = OperationInfo("saved_search", "POST", NODE_PATTERN, 200)
+    Export = OperationInfo("export", "GET", NODE_PATTERN, 200)
 
     # instance operations
     Retrieve = OperationInfo("retrieve", "GET", NODE_PATTERN, 200)
@@ -11,6 +11,14 @@ scroll settings. This module encapsulates paging into a set of extensible, inter
     links to other pages.
  -  A `PaginatedListSchema` defines a (marshmallow) schema for encoding a paginated list (e.g. in a response)
 
+Two schemes are provided:
+
+ -  `OffsetLimitPage` pages by offset and limit and reports the total count
+ -  `CursorPage` pages by the sort key(s) of the last seen item (a.k.a. keyset pagination); deep pages
+    are as cheap as the first and no total count is needed
+
+Conventions select a scheme using their `page_cls` property.
+
 
 Typical Usage:
 
@@ -37,10 +45,15 @@ Typical Usage:
     return dump_response_Data(paginated_list_schema, paginated_list, headers=headers)
 
 """
+from collections.abc import Iterable
+
 from flask import request
 from marshmallow import Schema, fields
 
+from microcosm_flask.compiling import CompiledSchema, is_compiled
 from microcosm_flask.conventions.encoding import encode_count_header, load_query_string_data
+from microcosm_flask.fields import Cursor, CursorField
+from microcosm_flask.fields.cursor_field import signing_key
 from microcosm_flask.linking import Link, Links
 
 
@@ -52,8 +65,42 @@ def identity(x):
     return x
 
 
+class EstimatedCount(int):
+    """
+    An estimate of the total count of items.
+
+    Search functions may return an estimate (or `None`) instead of an exact count; links to the next
+    page then rely on the search returning one item beyond the limit if there is a next page.
+
+    """
+    pass
+
+
+def is_exact_count(count):
+    return count is not None and not isinstance(count, EstimatedCount)
+
+
+def default_limit():
+    """
+    Default the page limit using the `X-Request-Limit` header.
+
+    """
+    try:
+        return int(request.headers["X-Request-Limit"])
+    except Exception:
+        return 20
+
+
 # NB: lots of code currently uses `PageSchema` to refer to `OffsetLimitPageSchema`
 # keeping this (mis)naming for backwards compatibility
+def is_items(value):
+    """
+    Could a value be (an iterable of) items, rather than a single item?
+
+    """
+    return isinstance(value, Iterable) and not isinstance(value, (dict, str, bytes))
+
+
 class PageSchema(Schema):
     offset = fields.Integer(
         load_default=None, metadata={"description": "The pagination starting offset."}
@@ -67,6 +114,16 @@ class OffsetLimitPageSchema(PageSchema):
     pass
 
 
+class CursorPageSchema(Schema):
+    cursor = CursorField(
+        load_default=None,
+        metadata={"description": "The pagination cursor (from the link to the next page)."},
+    )
+    limit = fields.Integer(
+        load_default=None, metadata={"description": "The pagination limit."}
+    )
+
+
 class PaginatedList:
     """
     A list of items with knowledge of a page.
@@ -105,7 +162,7 @@ class OffsetLimitPaginatedList(PaginatedList):
 
     """
 
-    def __init__(self, items, count, _page, _ns, _operation, _context):
+    def __init__(self, items, count, _page, _ns, _operation, _context, _has_next=None):
         super().__init__(
             items=items,
             _page=_page,
@@ -114,6 +171,7 @@ class OffsetLimitPaginatedList(PaginatedList):
             _context=_context,
         )
         self.count = count
+        self._has_next = _has_next
 
     @property
     def offset(self):
@@ -123,6 +181,12 @@ class OffsetLimitPaginatedList(PaginatedList):
     def limit(self):
         return self._page.limit
 
+    @property
+    def has_next(self):
+        if self._has_next is None:
+            return self._page.offset + self._page.limit < self.count
+        return self._has_next
+
     @property
     def links(self):
         """
@@ -130,7 +194,7 @@ class OffsetLimitPaginatedList(PaginatedList):
 
         """
         links = super().links
-        if self._page.offset + self._page.limit < self.count:
+        if self.has_next:
             links["next"] = Link.for_(
                 self._operation,
                 self._ns,
@@ -147,6 +211,35 @@ class OffsetLimitPaginatedList(PaginatedList):
         return links
 
 
+class CursorPaginatedList(PaginatedList):
+    """
+    A paginated list using cursor (keyset) style paging.
+
+    """
+
+    @property
+    def limit(self):
+        return self._page.limit
+
+    @property
+    def links(self):
+        """
+        Include a next link if the page is full.
+
+        Without a count, the last page may be empty.
+
+        """
+        links = super().links
+        if self.items and len(self.items) >= self._page.limit:
+            links["next"] = Link.for_(
+                self._operation,
+                self._ns,
+                qs=self._page.next_page(self.items[-1]).to_items(),
+                **self._context
+            )
+        return links
+
+
 class Page:
     """
     Encapsulates pagination information.
@@ -177,6 +270,15 @@ class Page:
     def to_dict(self, func=str):
         return dict(self.to_items(func=func))
 
+    def next_page_for(self, items):
+        """
+        Get the page following a page of items (e.g. when iterating over all pages).
+
+        :returns: the next page or `None` if there are no more items
+
+        """
+        return None
+
     def to_paginated_list(self, result, _ns, _operation, **kwargs):
         """
         Convert a controller result to a paginated list.
@@ -226,6 +328,22 @@ class Page:
     def from_dict(cls, dct):
         return cls(**dct)
 
+    @classmethod
+    def check_configuration(cls, graph):
+        """
+        Check that the graph is configured for this scheme (when conventions use it).
+
+        """
+        pass
+
+    @classmethod
+    def paginated_list_schema_base_class(cls, item_schema):
+        """
+        Paginated lists of compiled item schemas are compiled as well.
+
+        """
+        return CompiledSchema if is_compiled(item_schema) else Schema
+
     @classmethod
     def make_paginated_list_schema_class(cls, ns, item_schema):
         """
@@ -233,7 +351,7 @@ class Page:
 
         """
 
-        class PaginatedListSchema(Schema):
+        class PaginatedListSchema(cls.paginated_list_schema_base_class(item_schema)):
             __alias__ = f"{ns.subject_name}_list"
             items = fields.List(fields.Nested(item_schema), required=True)
             _links = fields.Raw()
@@ -264,23 +382,34 @@ class OffsetLimitPage(Page):
             offset=self.offset - self.limit, limit=self.limit, **self.kwargs
         )
 
+    def next_page_for(self, items):
+        if len(items) < self.limit:
+            return None
+        return self.next_page
+
     @property
     def default_offset(self):
         return 0
 
     @property
     def default_limit(self):
-        try:
-            return int(request.headers["X-Request-Limit"])
-        except Exception:
-            return 20
+        return default_limit()
 
     def to_items(self, func=str):
         return [("offset", self.offset), ("limit", self.limit)] + super().to_items(func=func)
 
     def to_paginated_list(self, result, _ns, _operation, **kwargs):
         items, count, context = self.parse_result(result)
-        headers = encode_count_header(count)
+        if is_exact_count(count):
+            headers = encode_count_header(count)
+            has_next = None
+        else:
+            # without an exact count, an extra item (if any) signals a next page
+            items = list(items)
+            headers = dict()
+            has_next = len(items) > self.limit
+            items = items[:self.limit]
+
         paginated_list = OffsetLimitPaginatedList(
             items=items,
             count=count,
@@ -288,6 +417,7 @@ class OffsetLimitPage(Page):
             _ns=_ns,
             _operation=_operation,
             _context=context,
+            _has_next=has_next,
         )
         return paginated_list, headers
 
@@ -299,6 +429,8 @@ class OffsetLimitPage(Page):
         May either be three item tuple containing items, count, and a context dictionary (see: relation convention)
         or a two item tuple containing only items and count.
 
+        The count may be an `EstimatedCount` or `None` (see `CountPolicy`).
+
         """
         if len(result) == 3:
             items, count, context = result
@@ -309,7 +441,7 @@ class OffsetLimitPage(Page):
 
     @classmethod
     def make_paginated_list_schema_class(cls, ns, item_schema):
-        class PaginatedListSchema(Schema):
+        class PaginatedListSchema(cls.paginated_list_schema_base_class(item_schema)):
             __alias__ = f"{ns.subject_name}_list"
 
             offset = fields.Integer(
@@ -322,7 +454,8 @@ class OffsetLimitPage(Page):
             )
             count = fields.Integer(
                 required=True,
-                metadata={"description": "The number of items in the page."},
+                allow_none=True,
+                metadata={"description": "The number of items in the page (if counted)."},
             )
             items = fields.List(
                 fields.Nested(item_schema),
@@ -338,3 +471,112 @@ class OffsetLimitPage(Page):
                 return getattr(item_schema, "csv_column_order", None)
 
         return PaginatedListSchema
+
+
+class CursorPage(Page):
+    """
+    Cursor (keyset) based paging.
+
+    The cursor holds the sort key value(s) of the last item of the previous page; controllers
+    receive it as a `cursor` tuple (or `None` for the first page) and should return the first
+    `limit` items after it, in sort key order.
+
+    Subclasses define the `sort_keys` (item attributes or keys) that controllers sort by.
+
+    """
+    sort_keys = ("id",)
+
+    def __init__(self, cursor=None, limit=None, **kwargs):
+        super().__init__(**kwargs)
+        self.cursor = Cursor.decode(cursor) if isinstance(cursor, str) else cursor
+        self.limit = self.default_limit if limit is None else limit
+
+    def next_page(self, last_item):
+        return self.__class__(
+            cursor=self.cursor_for(last_item),
+            limit=self.limit,
+            **self.kwargs
+        )
+
+    def next_page_for(self, items):
+        if not items or len(items) < self.limit:
+            return None
+        return self.next_page(items[-1])
+
+    @property
+    def default_limit(self):
+        return default_limit()
+
+    @classmethod
+    def check_configuration(cls, graph):
+        # fail at startup rather than when the first cursor is signed
+        signing_key(graph.flask)
+
+    @classmethod
+    def cursor_for(cls, item):
+        """
+        Construct the cursor that follows an item.
+
+        """
+        if isinstance(item, dict):
+            return Cursor(item[key] for key in cls.sort_keys)
+        return Cursor(getattr(item, key) for key in cls.sort_keys)
+
+    def to_items(self, func=str):
+        items = [("limit", self.limit)]
+        if self.cursor is not None:
+            items.insert(0, ("cursor", func(self.cursor)))
+        return items + super().to_items(func=func)
+
+    def to_paginated_list(self, result, _ns, _operation, **kwargs):
+        items, context = self.parse_result(result)
+        paginated_list = CursorPaginatedList(
+            # the page is bounded by its limit; the last item determines the next cursor
+            items=list(items),
+            _page=self,
+            _ns=_ns,
+            _operation=_operation,
+            _context=context,
+        )
+        return paginated_list, dict()
+
+    @classmethod
+    def parse_result(cls, result):
+        """
+        Parse an items result.
+
+        May either be two item tuple containing items and a context dictionary (see: relation convention),
+        a two item tuple containing items and a count (which is ignored; e.g. from a CRUD search), or only items.
+
+        """
+        if isinstance(result, tuple) and len(result) == 2 and is_items(result[0]):
+            items, other = result
+            if isinstance(other, dict):
+                return items, other
+            if other is None or type(other) in (int, EstimatedCount):
+                return items, {}
+        return result, {}
+
+    @classmethod
+    def make_paginated_list_schema_class(cls, ns, item_schema):
+        class PaginatedListSchema(cls.paginated_list_schema_base_class(item_schema)):
+            __alias__ = f"{ns.subject_name}_list"
+
+            limit = fields.Integer(
+                required=True,
+                metadata={"description": "The pagination limit."},
+            )
+            items = fields.List(
+                fields.Nested(item_schema),
+                required=True,
+                metadata={"description": "The page of items."},
+            )
+            _links = fields.Raw(
+                metadata={"description": "Links to the available operations (including the next page)."}
+            )
+
+            @property
+            def csv_column_order(self):
+                return getattr(item_schema, "csv_column_order", None)
+
+        return PaginatedListSchema
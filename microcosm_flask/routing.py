@@ -79,6 +79,10 @@ def configure_route_decorator(graph):
             if enable_audit:
                 func = graph.audit(func)
 
+            # phase timing encloses audit (and metrics), which report the timings
+            if graph.phase_timing.enabled:
+                func = graph.phase_timing(func)
+
             graph.app.route(
                 endpoint_path,
                 endpoint=endpoint,
@@ -0,0 +1,146 @@
+"""
+Build swagger definitions offline (e.g. when building an image).
+
+Usage:
+
+    microcosm-flask-swagger myservice.app:create_app --output-dir build/swagger
+
+Loads the object graph returned by the factory and writes the definition of every swagger
+namespace to a file named after its route (e.g. `build/swagger/api/v1/swagger.json`), along
+with precompressed copies (`.gz` and, if available, `.br` and `.zst`), so that definitions
+can be served statically.
+
+"""
+import sys
+from argparse import ArgumentParser
+from importlib import import_module
+from os import getcwd, makedirs
+from os.path import dirname, join
+
+from microcosm.config.types import comma_separated_list
+
+from microcosm_flask.compressing import ENCODERS, is_available
+from microcosm_flask.conventions.swagger import iter_swagger_namespaces
+from microcosm_flask.swagger.definitions import build_swagger
+
+
+# definitions are compressed once; use the highest levels
+LEVELS = dict(
+    br=11,
+    gzip=9,
+    zstd=19,
+)
+
+SUFFIXES = dict(
+    br=".br",
+    gzip=".gz",
+    zstd=".zst",
+)
+
+
+def load_graph(factory):
+    """
+    Load an object graph from a factory (e.g. `myservice.app:create_app`).
+
+    """
+    module_name, _, func_name = factory.partition(":")
+    # support factories relative to the working directory (as with `python -m`)
+    if getcwd() not in sys.path:
+        sys.path.insert(0, getcwd())
+
+    create_graph = getattr(import_module(module_name), func_name or "create_app")
+    return create_graph()
+
+
+def iter_swagger_definitions(graph, validate_schema=False):
+    """
+    Build and encode the definition of every swagger namespace.
+
+    Definitions are encoded exactly as the swagger endpoint would encode them.
+
+    :returns: a generator over (route path, encoded definition) tuples
+
+    """
+    with graph.flask.app_context():
+        for convention, ns in iter_swagger_namespaces(graph):
+            swagger = build_swagger(
+                graph,
+                ns,
+                convention.find_matching_endpoints(ns),
+                validate_schema=validate_schema,
+            )
+            path = graph.build_route_path(ns.singleton_path, ns.prefix)
+            yield path, graph.flask.json.response(swagger).get_data()
+
+
+def write_swagger_definitions(graph, output_dir, encodings=(), validate_schema=False):
+    """
+    Write the definition of every swagger namespace (and its compressed copies).
+
+    :returns: the list of written files
+
+    """
+    encoders = [
+        ENCODERS[encoding](level=LEVELS[encoding])
+        for encoding in encodings
+    ]
+
+    filenames = []
+    for path, data in iter_swagger_definitions(graph, validate_schema=validate_schema):
+        filename = join(output_dir, f"{path.strip('/')}.json")
+        makedirs(dirname(filename), exist_ok=True)
+
+        for suffix, content in [
+            ("", data),
+            *[(SUFFIXES[encoder.name], encoder.compress(data)) for encoder in encoders],
+        ]:
+            with open(f"{filename}{suffix}", "wb") as file_:
+                file_.write(content)
+            filenames.append(f"{filename}{suffix}")
+
+    return filenames
+
+
+def parse_args(args=None):
+    available_encodings = ",".join(
+        name
+        for name, encoder_type in sorted(ENCODERS.items())
+        if is_available(encoder_type)
+    )
+
+    parser = ArgumentParser(description="Build swagger definitions offline")
+    parser.add_argument("factory", help="an object graph factory, e.g. myservice.app:create_app")
+    parser.add_argument("--output-dir", default="swagger")
+    parser.add_argument(
+        "--encodings",
+        type=comma_separated_list,
+        default=available_encodings,
+        help="content encodings of precompressed copies (empty for none)",
+    )
+    parser.add_argument("--validate-schema", action="store_true", default=False)
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+
+    unavailable = [
+        encoding
+        for encoding in args.encodings
+        if encoding not in ENCODERS or not is_available(ENCODERS[encoding])
+    ]
+    if unavailable:
+        sys.exit(f"Unavailable encodings: {', '.join(unavailable)}")
+
+    graph = load_graph(args.factory)
+    filenames = write_swagger_definitions(
+        graph,
+        args.output_dir,
+        encodings=args.encodings,
+        validate_schema=args.validate_schema,
+    )
+    if not filenames:
+        sys.exit("No swagger namespaces are registered")
+
+    for filename in filenames:
+        print(filename)  # noqa: T201
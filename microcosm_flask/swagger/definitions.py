@@ -21,7 +21,6 @@ from inspect import getdoc
 from logging import getLogger
 from urllib.parse import unquote
 
-from flask.globals import request_ctx
 from openapi import model as swagger
 from werkzeug.routing import BuildError, Rule
 
@@ -29,6 +28,7 @@ from microcosm_flask.conventions.registry import (
     get_qs_schema,
     get_request_schema,
     get_response_schema,
+    parse_rule,
 )
 from microcosm_flask.errors import ErrorContextSchema, ErrorSchema, SubErrorSchema
 from microcosm_flask.namespaces import Namespace
@@ -93,31 +93,16 @@ def build_swagger(graph, ns, operations, validate_schema=False):
     return schema
 
 
-def _construct_schema_request_arguments():
-    """
-    Create a mapping between a given endpoint/method and its possible arguments.
-    Used in aid of generating paths during swagger generation
-
-    """
-    url_adapter = request_ctx.url_adapter
-    rules: list[Rule] = url_adapter.map._rules
-
-    return {
-        (rule.endpoint, method): rule.arguments
-        for rule in rules
-        for method in rule.methods
-    }
-
-
 def add_paths(paths, base_path, operations):
     """
     Add paths to swagger.
 
-    """
-    schema_request_arguments = _construct_schema_request_arguments()
+    Paths are built from the url rules (rather than with `url_for`) so that swagger
+    can be built without a request context.
 
+    """
     for operation, ns, rule, func in operations:
-        path = build_path(operation, ns, schema_request_arguments)
+        path = build_rule_path(rule)
         if not path.startswith(base_path):
             continue
         method = operation.value.method.lower()
@@ -233,6 +218,19 @@ def build_path(
             return unquote(ns.url_for(operation, _external=False, **uri_templates))
 
 
+def build_rule_path(rule: Rule) -> str:
+    """
+    Build an endpoint path from a url rule, substituting parameter names for path parameters.
+
+    For example, '/api/v1/person/<uuid:person_id>' => '/api/v1/person/{person_id}'
+
+    """
+    return "".join(
+        data if converter is None else f"{{{data}}}"
+        for converter, _, data in parse_rule(rule.rule)
+    )
+
+
 def body_param(schema):
     return swagger.BodyParameter(
         **{
@@ -359,7 +357,7 @@ def add_responses(swagger_operation, operation, ns, func):
     # default error
     swagger_operation.responses["default"] = build_response(
         description="An error occurred",
-        resource=type_name(name_for(ErrorSchema())),
+        resource=type_name(name_for(ErrorSchema)),
     )
 
     if getattr(func, "__doc__", None):
@@ -2,6 +2,7 @@ from collections.abc import Mapping
 from functools import lru_cache
 from pkg_resources import iter_entry_points
 from typing import Any
+from weakref import WeakKeyDictionary
 
 from marshmallow.fields import Field
 
@@ -12,6 +13,89 @@ from microcosm_flask.swagger.parameters.default import DefaultParameterBuilder
 ENTRY_POINT = "microcosm_flask.swagger.parameters"
 
 
+class ParameterBuilderChain:
+    """
+    An ordered chain of parameter builders.
+
+    Builders are instantiated once. The builders that might support a field are resolved
+    once per field type (builders that dispatch by type are probed only for the first field
+    of each type) and built parameters are memoized per field instance.
+
+    """
+
+    def __init__(
+        self,
+        builder_types: list[type[ParameterBuilder]],
+        default_builder_type: type[ParameterBuilder],
+        strict_enums: bool,
+    ):
+        self.builders: list[ParameterBuilder] = [
+            builder_type(
+                build_parameter=self.build,  # type: ignore
+                strict_enums=strict_enums,
+            )
+            for builder_type in builder_types
+        ]
+        self.default_builder = default_builder_type(
+            build_parameter=self.build,  # type: ignore
+            strict_enums=strict_enums,
+        )
+        self.dispatch: dict[type[Field], list[tuple[ParameterBuilder, bool]]] = {}
+        self.parameters: WeakKeyDictionary[Field, Mapping[str, Any]] = WeakKeyDictionary()
+
+    def build(self, field: Field) -> Mapping[str, Any]:
+        """
+        Build a swagger parameter from a marshmallow field.
+
+        Returns a (shallow) copy of the memoized parameter; callers may add keys.
+
+        """
+        try:
+            parameter = self.parameters[field]
+        except KeyError:
+            parameter = self.parameters[field] = self.builder_for(field).build(field)
+
+        return dict(parameter)
+
+    def builder_for(self, field: Field) -> ParameterBuilder:
+        """
+        Find the first builder that supports a field.
+
+        """
+        return next(
+            builder
+            for builder, supported in self.candidates_for(type(field), field)
+            if supported or builder.supports_field(field)
+        )
+
+    def candidates_for(self, field_type: type[Field], field: Field) -> list[tuple[ParameterBuilder, bool]]:
+        """
+        Resolve the candidate builders for a field type.
+
+        Returns builder, supported pairs where `supported` is True if the builder is known
+        to support every field of this type; other builders must be asked per field.
+
+        """
+        try:
+            return self.dispatch[field_type]
+        except KeyError:
+            pass
+
+        candidates: list[tuple[ParameterBuilder, bool]] = []
+        for builder in self.builders:
+            if not builder.dispatch_by_type:
+                candidates.append((builder, False))
+            elif builder.supports_field(field):
+                candidates.append((builder, True))
+                break
+        else:
+            # the default builder raises for unmapped fields; only ask it when reached
+            candidates.append((self.default_builder, False))
+
+        self.dispatch[field_type] = candidates
+        return candidates
+
+
 class Parameters:
     """
     Plugin-aware swagger parameter builder.
@@ -29,22 +113,22 @@ class Parameters:
         Build a swagger parameter from a marshmallow field.
 
         """
-        builder_types = self.builder_types() + [
-            # put default last
-            self.default_builder_type()
-        ]
+        return self.builder_chain(self.strict_enums).build(field)
 
-        builders: list[ParameterBuilder] = [
-            builder_type(
-                build_parameter=self.build,  # type: ignore
-                strict_enums=self.strict_enums,
-            )
-            for builder_type in builder_types
-        ]
-
-        builder = next(builder for builder in builders if builder.supports_field(field))
+    @classmethod
+    # NB: builders (and their dispatch and parameter caches) are shared; memoize
+    @lru_cache
+    def builder_chain(cls, strict_enums: bool) -> ParameterBuilderChain:
+        """
+        Define the (shared) builder chain.
 
-        return builder.build(field)
+        """
+        return ParameterBuilderChain(
+            builder_types=cls.builder_types(),
+            # put default last
+            default_builder_type=cls.default_builder_type(),
+            strict_enums=strict_enums,
+        )
 
     @classmethod
     # NB: entry point lookups can be slow; memoize
@@ -23,6 +23,9 @@ class ParameterBuilder(ABC):
 
     """
 
+    # does `supports_field` depend only on the field's type?
+    dispatch_by_type = False
+
     def __init__(
         self, build_parameter: Callable[[Schema], Mapping[str, Any]], **kwargs
     ):
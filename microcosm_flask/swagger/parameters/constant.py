@@ -12,6 +12,8 @@ class ConstantParameterBuilder(ParameterBuilder):
 
     """
 
+    dispatch_by_type = True
+
     def supports_field(self, field: Field) -> bool:
         return isinstance(field, Constant)
 
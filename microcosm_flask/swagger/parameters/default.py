@@ -7,6 +7,7 @@ from microcosm_logging.decorators import logger
 
 from microcosm_flask.fields import (
     CleanedField,
+    CursorField,
     LanguageField,
     OrderByField,
     URIField,
@@ -21,6 +22,7 @@ FIELD_MAPPINGS = {
     LanguageField: FieldInfo("string", "language"),
     URIField: FieldInfo("string", "uri"),
     CleanedField: FieldInfo("string", "cleaned"),
+    CursorField: FieldInfo("string", "cursor"),
     OrderByField: FieldInfo("string", None),
     fields.Boolean: FieldInfo("boolean", None),
     fields.Date: FieldInfo("string", "date"),
@@ -11,6 +11,8 @@ class ListParameterBuilder(ParameterBuilder):
     Builder parameters for nested fields.
 
     """
+    dispatch_by_type = True
+
     def supports_field(self, field: Field) -> bool:
         return isinstance(field, List)
 
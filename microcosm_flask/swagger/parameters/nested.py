@@ -10,6 +10,8 @@ class NestedParameterBuilder(ParameterBuilder):
     Builder parameters for nested fields.
 
     """
+    dispatch_by_type = True
+
     def supports_field(self, field: Field) -> bool:
         return isinstance(field, Nested)
 
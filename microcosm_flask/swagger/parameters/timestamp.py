@@ -9,6 +9,8 @@ class TimestampParameterBuilder(ParameterBuilder):
     Build a timestamp parameter.
 
     """
+    dispatch_by_type = True
+
     def supports_field(self, field: Field) -> bool:
         return isinstance(field, TimestampField)
 
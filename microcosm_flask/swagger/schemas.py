@@ -1,10 +1,15 @@
 """
 Generate JSON Schema for Marshmallow schemas.
 
+Built JSON schemas are cached process-wide per schema class, so that swagger definitions
+for different namespaces (and versions) and repeated builds share work.
+
 """
 import re
 from collections.abc import Callable, Iterable, Mapping
+from threading import Lock
 from typing import Any
+from weakref import WeakKeyDictionary
 
 from marshmallow import Schema
 from marshmallow.fields import Field, List, Nested
@@ -14,10 +19,43 @@ from microcosm_flask.naming import name_for
 from microcosm_flask.swagger.naming import type_name
 
 
+# a definition name and JSON schema
+Definition = tuple[str, Mapping[str, Any]]
+
+
 def definition_name_for_schema(schema_cls):
     return type_name(name_for(schema_cls))
 
 
+class SchemaCache:
+    """
+    A thread-safe cache of (definition name, JSON schema) pairs.
+
+    Entries are held weakly per schema class and keyed by the options that affect the result:
+    the parameter builder, `strict_enums`, and the schema instance's field names (which vary
+    with `only` and `exclude`).
+
+    """
+    def __init__(self):
+        self.entries: WeakKeyDictionary[type[Schema], dict[tuple, Definition]] = WeakKeyDictionary()
+        self.lock = Lock()
+
+    def get(self, schema: Schema, key: tuple) -> Definition | None:
+        with self.lock:
+            return self.entries.get(type(schema), {}).get(key)
+
+    def set(self, schema: Schema, key: tuple, value: Definition) -> Definition:
+        with self.lock:
+            return self.entries.setdefault(type(schema), {}).setdefault(key, value)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+SCHEMA_CACHE = SchemaCache()
+
+
 class Schemas:
     """
     Swagger schema builder.
@@ -33,13 +71,23 @@ class Schemas:
         self.strict_enums = strict_enums
 
         # NB: This will break if this class is ever instantiated and then has
-        # `build` called more than once
+        # `iter_schemas` called more than once
         self.seen_schemas: set[type[Schema]] = set()
 
     def build(self, schema: Schema) -> Mapping[str, Any]:
         """
         Build JSON schema from a marshmallow schema.
 
+        Returns a (shallow) copy of the cached JSON schema.
+
+        """
+        _, result = self.to_tuple(schema)
+        return result
+
+    def build_uncached(self, schema: Schema) -> Mapping[str, Any]:
+        """
+        Build JSON schema from a marshmallow schema, bypassing the cache.
+
         """
         fields = list(self.iter_fields(schema))
 
@@ -107,5 +155,15 @@ class Schemas:
             if isinstance(field, List) and isinstance(field.inner, Nested):
                 yield from self.iter_schemas(field.inner.schema)
 
-    def to_tuple(self, schema: Schema) -> tuple[str, Any]:
-        return definition_name_for_schema(schema), self.build(schema)
+    def to_tuple(self, schema: Schema) -> Definition:
+        key = (self.build_parameter, self.strict_enums, tuple(schema.fields))
+        entry = SCHEMA_CACHE.get(schema, key)
+        if entry is None:
+            entry = SCHEMA_CACHE.set(
+                schema,
+                key,
+                (definition_name_for_schema(schema), self.build_uncached(schema)),
+            )
+
+        name, result = entry
+        return name, dict(result)
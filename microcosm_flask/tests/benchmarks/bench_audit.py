@@ -0,0 +1,46 @@
+"""
+Benchmark the overhead of auditing a request.
+
+Calls an audited route function (with path and query string arguments and an id response
+header, as for a create endpoint) within a request context and compares it to the bare function.
+Audit records are logged to a logger without handlers.
+
+Usage:
+
+    python -m microcosm_flask.tests.benchmarks.bench_audit
+
+"""
+from logging import getLogger
+from timeit import timeit
+from uuid import uuid4
+
+from microcosm.api import create_object_graph, load_from_dict
+
+
+REPEAT = 10000
+
+
+def main():
+    logger = getLogger("audit")
+    logger.propagate = False
+
+    loader = load_from_dict(audit=dict(include_path=True, include_query_string=True))
+    graph = create_object_graph(name="example", loader=loader)
+    graph.use("audit", "request_context")
+
+    def create_foo(foo_id):
+        return "", 201, {"X-Foo-Id": str(foo_id), "Content-Type": "application/json"}
+
+    audited = graph.audit(create_foo)
+    graph.flask.add_url_rule("/api/foo/<foo_id>", "foo.create.v1", audited, methods=["POST"])
+
+    url = f"/api/foo/{uuid4()}?parent_id={uuid4()}&name=name&offset=0&limit=20"
+    with graph.flask.test_request_context(url, method="POST", headers={"X-Request-Id": "request-id"}):
+        bare = timeit(lambda: create_foo("foo"), number=REPEAT) / REPEAT
+        elapsed = timeit(lambda: audited("foo"), number=REPEAT) / REPEAT
+
+    print(f"{(elapsed - bare) * 1e6:.2f}us audit overhead per request")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
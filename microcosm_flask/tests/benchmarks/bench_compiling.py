@@ -0,0 +1,79 @@
+"""
+Benchmark compiled serialization against marshmallow.
+
+Dumps a paginated list of 500 items, as for a search endpoint.
+
+Usage:
+
+    python -m microcosm_flask.tests.benchmarks.bench_compiling
+
+"""
+from timeit import timeit
+
+from marshmallow import Schema, fields
+from microcosm.api import create_object_graph
+
+from microcosm_flask.compiling import CompiledSchema
+from microcosm_flask.fields import EnumField, TimestampField
+from microcosm_flask.linking import Link, Links
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.paging import OffsetLimitPage
+from microcosm_flask.tests.test_compiling import ChildSchema, Color, make_parent
+
+
+ITEMS = 500
+REPEAT = 20
+
+
+class ItemFields:
+    id = fields.UUID()
+    name = fields.String(attribute="full_name")
+    nickname = fields.String(data_key="nickName")
+    age = fields.Integer()
+    active = fields.Boolean()
+    color = EnumField(Color)
+    created_at = TimestampField()
+    tags = fields.List(fields.String())
+    child = fields.Nested(ChildSchema)
+    _links = fields.Method("get_links")
+
+    def get_links(self, obj):
+        links = Links()
+        links["self"] = Link(href=f"http://localhost/api/parent/{obj.id}")
+        return links.to_dict()
+
+
+class MarshmallowItemSchema(ItemFields, Schema):
+    pass
+
+
+class CompiledItemSchema(ItemFields, CompiledSchema):
+    pass
+
+
+def main():
+    graph = create_object_graph(name="example", testing=True)
+    ns = Namespace(subject="parent")
+
+    @graph.route(ns.collection_path, Operation.Search, ns)
+    def search():
+        pass
+
+    items = [make_parent() for _ in range(ITEMS)]
+
+    with graph.app.test_request_context():
+        page = OffsetLimitPage(offset=0, limit=ITEMS)
+        paginated_list, _ = page.to_paginated_list((items, ITEMS), ns, Operation.Search)
+
+        for name, item_schema in [
+            ("marshmallow", MarshmallowItemSchema()),
+            ("compiled", CompiledItemSchema()),
+        ]:
+            schema = OffsetLimitPage.make_paginated_list_schema_class(ns, item_schema)()
+            elapsed = timeit(lambda: schema.dump(paginated_list), number=REPEAT) / REPEAT
+            print(f"{name}: {elapsed * 1000:.2f}ms per page of {ITEMS} items")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark building links using URL templates against `url_for`.
+
+Builds an item link for each of 500 items, as for a search endpoint.
+
+Usage:
+
+    python -m microcosm_flask.tests.benchmarks.bench_linking
+
+"""
+from contextlib import nullcontext
+from timeit import timeit
+from unittest.mock import patch
+from uuid import uuid4
+
+from microcosm.api import create_object_graph
+
+from microcosm_flask.linking import Link
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+
+
+ITEMS = 500
+REPEAT = 20
+
+
+def main():
+    graph = create_object_graph(name="example", testing=True)
+    ns = Namespace(subject="parent")
+
+    @graph.route(ns.instance_path, Operation.Retrieve, ns)
+    def retrieve(parent_id):
+        pass
+
+    identifiers = [uuid4() for _ in range(ITEMS)]
+
+    def build_links():
+        return [
+            Link.for_(Operation.Retrieve, ns, parent_id=identifier).to_dict()
+            for identifier in identifiers
+        ]
+
+    with graph.app.test_request_context():
+        for name, patched in [
+            ("url_for", patch("microcosm_flask.namespaces.build_external_url", return_value=None)),
+            ("url template", nullcontext()),
+        ]:
+            with patched:
+                elapsed = timeit(build_links, number=REPEAT) / REPEAT
+            print(f"{name}: {elapsed * 1000:.2f}ms per {ITEMS} links")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
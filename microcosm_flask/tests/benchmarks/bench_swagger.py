@@ -0,0 +1,100 @@
+"""
+Benchmark swagger generation for a synthetic service.
+
+Defines 200 resources (each with a schema of several field types and a nested schema) with
+create, retrieve, and search endpoints. Reports the first (cold) build and the average of
+subsequent builds.
+
+Usage:
+
+    python -m microcosm_flask.tests.benchmarks.bench_swagger
+
+"""
+from enum import Enum
+from time import perf_counter
+from timeit import timeit
+
+from marshmallow import Schema, fields
+from microcosm.api import create_object_graph
+
+from microcosm_flask.conventions.crud import configure_crud
+from microcosm_flask.conventions.registry import iter_endpoints
+from microcosm_flask.fields import EnumField, TimestampField
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.paging import OffsetLimitPageSchema
+from microcosm_flask.swagger.definitions import build_swagger
+from microcosm_flask.swagger.parameters import Parameters
+
+
+RESOURCES = 200
+REPEAT = 5
+
+
+class Color(Enum):
+    RED = "RED"
+    GREEN = "GREEN"
+
+
+class DetailSchema(Schema):
+    label = fields.String()
+    weight = fields.Decimal(as_string=True)
+    tags = fields.List(fields.String())
+
+
+def make_schemas(index):
+    subject = f"resource{index}"
+
+    new_schema_cls = type(f"NewResource{index}Schema", (Schema,), dict(
+        __alias__=f"new_{subject}",
+        name=fields.String(required=True),
+        count=fields.Integer(),
+        color=EnumField(Color),
+        detail=fields.Nested(DetailSchema),
+    ))
+    schema_cls = type(f"Resource{index}Schema", (new_schema_cls,), dict(
+        __alias__=subject,
+        id=fields.UUID(),
+        created_at=TimestampField(),
+        updated_at=fields.DateTime(),
+        active=fields.Boolean(),
+        ratio=fields.Float(),
+        _links=fields.Method("get_links"),
+        get_links=lambda self, obj: {},
+    ))
+    search_schema_cls = type(f"SearchResource{index}Schema", (OffsetLimitPageSchema,), dict(
+        name=fields.String(),
+        color=EnumField(Color),
+    ))
+    return subject, new_schema_cls(), schema_cls(), search_schema_cls()
+
+
+def main():
+    graph = create_object_graph(name="example", testing=True)
+
+    for index in range(RESOURCES):
+        subject, new_schema, schema, search_schema = make_schemas(index)
+        configure_crud(graph, Namespace(subject=subject, version="v1"), {
+            Operation.Create: (lambda **kwargs: None, new_schema, schema),
+            Operation.Retrieve: (lambda **kwargs: None, schema),
+            Operation.Search: (lambda **kwargs: None, search_schema, schema),
+        })
+
+    ns = Namespace(subject="swagger", version="v1")
+
+    with graph.flask.test_request_context():
+        operations = list(iter_endpoints(graph, lambda operation, ns, rule: True))
+        # exclude the (memoized) entry point lookup
+        Parameters.builder_types()
+        start = perf_counter()
+        build_swagger(graph, ns, operations)
+        first = perf_counter() - start
+        elapsed = timeit(lambda: build_swagger(graph, ns, operations), number=REPEAT) / REPEAT
+
+    print(f"{len(operations)} operations")  # noqa: T201
+    print(f"{first * 1000:.2f}ms for the first swagger definition")  # noqa: T201
+    print(f"{elapsed * 1000:.2f}ms per subsequent swagger definition")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Columnar (Arrow and Parquet) response tests.
+
+"""
+from decimal import Decimal
+from io import BytesIO
+from unittest import SkipTest
+from unittest.mock import patch
+from uuid import uuid4
+
+from hamcrest import (
+    assert_that,
+    calling,
+    equal_to,
+    is_,
+    raises,
+    starts_with,
+)
+from marshmallow import Schema, fields
+from microcosm.api import create_object_graph
+
+from microcosm_flask.conventions.base import EndpointDefinition
+from microcosm_flask.conventions.crud import configure_crud
+from microcosm_flask.enums import ResponseFormats
+from microcosm_flask.fields import EnumField
+from microcosm_flask.formatting import ArrowFormatter
+from microcosm_flask.formatting.arrow_formatter import pyarrow
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.paging import OffsetLimitPageSchema
+from microcosm_flask.tests.conventions.fixtures import EyeColor, Person
+
+
+class PersonRow:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+PEOPLE = [
+    PersonRow(
+        id=uuid4(),
+        first_name=f"First{index}",
+        last_name=None if index % 2 else f"Last{index}",
+        eye_color=EyeColor.PURPLE,
+        age=index,
+        height=Decimal("1.5") + index,
+        weight=Decimal("70.000000000000000000001") + index,
+        tags=["a", "b"],
+    )
+    for index in range(5)
+]
+
+
+class PersonRowSchema(Schema):
+    id = fields.UUID()
+    first_name = fields.String(data_key="firstName")
+    last_name = fields.String(data_key="lastName")
+    eye_color = EnumField(EyeColor, data_key="eyeColor")
+    age = fields.Integer()
+    height = fields.Decimal(places=2)
+    weight = fields.Decimal()
+    tags = fields.List(fields.String())
+    _links = fields.Method("get_links", dump_only=True)
+
+    def get_links(self, obj):
+        return dict(self=dict(href=f"http://localhost/api/person/{obj.id}"))
+
+
+def person_search(offset, limit):
+    return PEOPLE[offset:offset + limit], len(PEOPLE)
+
+
+class TestArrow:
+
+    def setup_method(self):
+        if pyarrow is None:
+            raise SkipTest
+
+        self.graph = create_object_graph(name="example", testing=True)
+        configure_crud(self.graph, Namespace(subject=Person), {
+            Operation.Search: EndpointDefinition(
+                func=person_search,
+                request_schema=OffsetLimitPageSchema(),
+                response_schema=PersonRowSchema(),
+                response_formats=[ResponseFormats.JSON, ResponseFormats.ARROW, ResponseFormats.PARQUET],
+            ),
+        })
+        self.client = self.graph.flask.test_client()
+
+    def assert_table(self, table):
+        assert_that(
+            table.column_names,
+            is_(equal_to(["id", "firstName", "lastName", "eyeColor", "age", "height", "weight", "tags", "_links"])),
+        )
+        assert_that(table.schema.field("age").type, is_(equal_to(pyarrow.int64())))
+        assert_that(table.schema.field("height").type, is_(equal_to(pyarrow.decimal128(38, 2))))
+        assert_that(table.schema.field("weight").type, is_(equal_to(pyarrow.string())))
+        assert_that(table.schema.field("tags").type, is_(equal_to(pyarrow.list_(pyarrow.string()))))
+
+        rows = table.to_pylist()
+        assert_that(len(rows), is_(equal_to(len(PEOPLE))))
+        assert_that(rows[1], is_(equal_to(dict(
+            id=str(PEOPLE[1].id),
+            firstName="First1",
+            lastName=None,
+            eyeColor="PURPLE",
+            age=1,
+            height=Decimal("2.50"),
+            weight="71.000000000000000000001",
+            tags=["a", "b"],
+            _links=f'{{"self":{{"href":"http://localhost/api/person/{PEOPLE[1].id}"}}}}',
+        ))))
+
+    def test_search_arrow(self):
+        with patch.object(ArrowFormatter, "chunk_size", 2):
+            response = self.client.get(
+                "/api/person",
+                headers={"Accept": "application/vnd.apache.arrow.stream"},
+            )
+            # rows are written as the response is consumed
+            batches = list(pyarrow.ipc.open_stream(response.data))
+
+        assert_that(response.status_code, is_(equal_to(200)))
+        assert_that(response.headers["Content-Type"], starts_with("application/vnd.apache.arrow.stream"))
+        assert_that(len(batches), is_(equal_to(3)))
+        self.assert_table(pyarrow.Table.from_batches(batches))
+
+    def test_search_parquet(self):
+        response = self.client.get(
+            "/api/person",
+            headers={"Accept": "application/vnd.apache.parquet"},
+        )
+
+        assert_that(response.status_code, is_(equal_to(200)))
+        assert_that(response.headers["Content-Disposition"], is_(equal_to('attachment; filename="response.parquet"')))
+
+        self.assert_table(pyarrow.parquet.read_table(BytesIO(response.data)))
+
+    def test_search_without_response_schema(self):
+        formatter = ArrowFormatter()
+
+        with self.graph.flask.test_request_context():
+            assert_that(
+                calling(formatter).with_args(dict(items=[])),
+                raises(ValueError),
+            )
@@ -0,0 +1,131 @@
+"""
+Conditional request tests.
+
+"""
+from unittest.mock import Mock
+
+from hamcrest import (
+    assert_that,
+    equal_to,
+    is_,
+    not_none,
+)
+from microcosm.api import create_object_graph
+
+from microcosm_flask.conventions.base import EndpointDefinition
+from microcosm_flask.conventions.crud import configure_crud
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.paging import OffsetLimitPageSchema
+from microcosm_flask.tests.conventions.fixtures import (
+    ADDRESS_1,
+    ADDRESS_ID_1,
+    PERSON_ID_1,
+    Address,
+    AddressSchema,
+    Person,
+    PersonSchema,
+    person_retrieve,
+    person_search,
+)
+
+
+def address_retrieve(address_id):
+    return ADDRESS_1
+
+
+def person_version(person_id, **kwargs):
+    return "v1" if person_id == PERSON_ID_1 else None
+
+
+def person_search_version(offset, limit):
+    return f"v1-{offset}-{limit}"
+
+
+class TestConditional:
+
+    def setup_method(self):
+        self.graph = create_object_graph(name="example", testing=True)
+        self.person_retrieve = Mock(side_effect=person_retrieve)
+        self.person_search = Mock(side_effect=person_search)
+
+        configure_crud(self.graph, Namespace(subject=Person), {
+            Operation.Retrieve: EndpointDefinition(
+                func=self.person_retrieve,
+                response_schema=PersonSchema(),
+                etag_func=person_version,
+            ),
+            Operation.Search: EndpointDefinition(
+                func=self.person_search,
+                request_schema=OffsetLimitPageSchema(),
+                response_schema=PersonSchema(),
+                etag_func=person_search_version,
+            ),
+        })
+        configure_crud(self.graph, Namespace(subject=Address), {
+            Operation.Retrieve: (address_retrieve, AddressSchema()),
+        })
+
+        self.client = self.graph.flask.test_client()
+
+    def test_retrieve_uses_etag_func(self):
+        uri = f"/api/person/{PERSON_ID_1}"
+        response = self.client.get(uri)
+
+        assert_that(response.status_code, is_(equal_to(200)))
+        assert_that(response.headers["ETag"], is_(equal_to('"v1-json"')))
+
+        response = self.client.get(uri, headers={"If-None-Match": '"v1-json"'})
+
+        assert_that(response.status_code, is_(equal_to(304)))
+        assert_that(response.data, is_(equal_to(b"")))
+        assert_that(response.headers["ETag"], is_(equal_to('"v1-json"')))
+        assert_that(self.person_retrieve.call_count, is_(equal_to(1)))
+
+    def test_retrieve_etag_mismatch(self):
+        uri = f"/api/person/{PERSON_ID_1}"
+        response = self.client.get(uri, headers={"If-None-Match": '"v0-json"'})
+
+        assert_that(response.status_code, is_(equal_to(200)))
+        assert_that(response.json["firstName"], is_(equal_to("Alice")))
+        assert_that(self.person_retrieve.call_count, is_(equal_to(1)))
+
+    def test_retrieve_etag_varies_by_skip_null(self):
+        uri = f"/api/person/{PERSON_ID_1}"
+        response = self.client.get(
+            uri,
+            headers={"If-None-Match": '"v1-json"', "X-Response-Skip-Null": "true"},
+        )
+
+        assert_that(response.status_code, is_(equal_to(200)))
+        assert_that(response.headers["ETag"], is_(equal_to('"v1-json-skip-null"')))
+
+    def test_search_uses_etag_func(self):
+        response = self.client.get(
+            "/api/person?offset=0&limit=10",
+            headers={"If-None-Match": '"v1-0-10-json"'},
+        )
+
+        assert_that(response.status_code, is_(equal_to(304)))
+        assert_that(self.person_search.call_count, is_(equal_to(0)))
+
+        response = self.client.get(
+            "/api/person?offset=10&limit=10",
+            headers={"If-None-Match": '"v1-0-10-json"'},
+        )
+
+        assert_that(response.status_code, is_(equal_to(200)))
+        assert_that(response.headers["ETag"], is_(equal_to('"v1-10-10-json"')))
+
+    def test_retrieve_uses_response_etag(self):
+        uri = f"/api/address/{ADDRESS_ID_1}"
+        response = self.client.get(uri)
+
+        assert_that(response.status_code, is_(equal_to(200)))
+        etag = response.headers.get("ETag")
+        assert_that(etag, is_(not_none()))
+
+        response = self.client.get(uri, headers={"If-None-Match": etag})
+
+        assert_that(response.status_code, is_(equal_to(304)))
+        assert_that(response.data, is_(equal_to(b"")))
@@ -0,0 +1,186 @@
+"""
+CRUD store adapter tests.
+
+"""
+from threading import get_ident
+from uuid import uuid4
+
+from hamcrest import (
+    assert_that,
+    calling,
+    equal_to,
+    is_,
+    none,
+    not_,
+    raises,
+)
+from microcosm.api import create_object_graph
+
+from microcosm_flask.conventions.base import EndpointDefinition
+from microcosm_flask.conventions.crud import configure_crud
+from microcosm_flask.conventions.crud_adapter import CRUDStoreAdapter
+from microcosm_flask.enums import CountPolicy
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.paging import OffsetLimitPageSchema
+from microcosm_flask.tests.conventions.fixtures import Person, PersonSchema
+
+
+class PersonStore:
+    model_class = Person
+
+    def __init__(self, count=25):
+        self.people = [
+            Person(uuid4(), f"First{index}", f"Last{index}")
+            for index in range(count)
+        ]
+        self.calls = []
+
+    def search(self, offset, limit):
+        self.calls.append(("search", limit, get_ident()))
+        return self.people[offset:offset + limit]
+
+    def count(self):
+        self.calls.append(("count", None, get_ident()))
+        return len(self.people)
+
+    def create(self, person):
+        self.people.append(person)
+        return person
+
+
+class EstimatingPersonStore(PersonStore):
+
+    def estimate_count(self):
+        return 30
+
+
+def create_client(store, count_policy):
+    graph = create_object_graph(name="example", testing=True)
+    adapter = CRUDStoreAdapter(graph, store, count_policy=count_policy)
+    configure_crud(graph, Namespace(subject=Person), {
+        Operation.Retrieve: EndpointDefinition(
+            func=adapter.retrieve,
+            response_schema=PersonSchema(),
+        ),
+        Operation.Search: EndpointDefinition(
+            func=adapter.search,
+            request_schema=OffsetLimitPageSchema(),
+            response_schema=PersonSchema(),
+        ),
+    })
+    return graph.flask.test_client()
+
+
+def test_search_exact():
+    store = PersonStore()
+    response = create_client(store, CountPolicy.EXACT).get("/api/person?limit=10")
+
+    assert_that(response.status_code, is_(equal_to(200)))
+    assert_that(response.headers["X-Total-Count"], is_(equal_to("25")))
+    assert_that(response.json["count"], is_(equal_to(25)))
+    assert_that(response.json["_links"]["next"]["href"], is_(equal_to(
+        "http://localhost/api/person?offset=10&limit=10",
+    )))
+
+
+def test_search_exact_concurrent():
+    store = PersonStore()
+    response = create_client(store, CountPolicy.EXACT_CONCURRENT).get("/api/person?limit=10")
+
+    assert_that(response.headers["X-Total-Count"], is_(equal_to("25")))
+    assert_that(len(response.json["items"]), is_(equal_to(10)))
+
+    (_, _, search_thread), (_, _, count_thread) = sorted(store.calls)
+    assert_that(search_thread, is_(not_(equal_to(count_thread))))
+
+
+def test_search_skip():
+    store = PersonStore()
+    client = create_client(store, CountPolicy.SKIP)
+
+    response = client.get("/api/person?offset=10&limit=10")
+
+    assert_that(response.headers.get("X-Total-Count"), is_(none()))
+    assert_that(response.json["count"], is_(none()))
+    assert_that(len(response.json["items"]), is_(equal_to(10)))
+    assert_that(response.json["_links"]["next"]["href"], is_(equal_to(
+        "http://localhost/api/person?offset=20&limit=10",
+    )))
+    # probes one item beyond the limit and never counts
+    assert_that([call[:2] for call in store.calls], is_(equal_to([("search", 11)])))
+
+    response = client.get("/api/person?offset=20&limit=10")
+
+    assert_that(len(response.json["items"]), is_(equal_to(5)))
+    assert_that(set(response.json["_links"]), is_(equal_to({"self", "prev"})))
+
+
+def test_search_estimate():
+    store = EstimatingPersonStore()
+    response = create_client(store, CountPolicy.ESTIMATE).get("/api/person?offset=20&limit=10")
+
+    assert_that(response.headers.get("X-Total-Count"), is_(none()))
+    assert_that(response.json["count"], is_(equal_to(30)))
+    # the estimate does not determine links
+    assert_that(set(response.json["_links"]), is_(equal_to({"self", "prev"})))
+
+
+def test_search_estimate_unsupported():
+    store = PersonStore()
+    response = create_client(store, CountPolicy.ESTIMATE).get("/api/person?limit=10")
+
+    assert_that(response.json["count"], is_(none()))
+    assert_that(set(response.json["_links"]), is_(equal_to({"self", "next"})))
+
+
+def test_search_count_policy_header():
+    store = PersonStore()
+    client = create_client(store, CountPolicy.EXACT)
+
+    response = client.get("/api/person?limit=10", headers={"X-Count-Policy": "skip"})
+    assert_that(response.json["count"], is_(none()))
+
+    response = client.get("/api/person?limit=10", headers={"X-Count-Policy": "unknown"})
+    assert_that(response.json["count"], is_(equal_to(25)))
+
+
+def test_search_count_policy_header_not_allowed():
+    store = PersonStore()
+    client = create_client(store, CountPolicy.SKIP)
+
+    # requests may not choose costlier or concurrent counts
+    for count_policy in ("exact", "exact-concurrent"):
+        response = client.get("/api/person?limit=10", headers={"X-Count-Policy": count_policy})
+        assert_that(response.json["count"], is_(none()))
+
+    assert_that([call[0] for call in store.calls], is_(equal_to(["search", "search"])))
+
+
+def test_request_count_policies_exclude_concurrent():
+    graph = create_object_graph(name="example", testing=True)
+    assert_that(
+        calling(CRUDStoreAdapter).with_args(
+            graph,
+            PersonStore(),
+            request_count_policies=[CountPolicy.EXACT_CONCURRENT],
+        ),
+        raises(ValueError),
+    )
+
+
+def test_search_count_cache():
+    store = PersonStore()
+    graph = create_object_graph(name="example", testing=True)
+    adapter = CRUDStoreAdapter(graph, store, count_cache=graph.count_cache)
+
+    assert_that(adapter.search(offset=0, limit=10)[1], is_(equal_to(25)))
+    assert_that(adapter.search(offset=10, limit=10)[1], is_(equal_to(25)))
+    assert_that(adapter.count(), is_(equal_to(25)))
+    assert_that([call[0] for call in store.calls], is_(equal_to(["search", "count", "search"])))
+
+    adapter.create(id=uuid4(), first_name="First", last_name="Last")
+
+    assert_that(adapter.count(), is_(equal_to(26)))
+    assert_that(graph.count_cache.hits, is_(equal_to(2)))
+    assert_that(graph.count_cache.misses, is_(equal_to(2)))
@@ -26,12 +26,17 @@ from microcosm_flask.namespaces import Namespace
 from microcosm_flask.operations import Operation
 from microcosm_flask.paging import OffsetLimitPageSchema
 from microcosm_flask.tests.conventions.fixtures import (
+    PERSON_1,
+    PERSON_2,
     PERSON_ID_1,
+    PERSON_ID_2,
     Address,
     AddressCSVSchema,
     Person,
     PersonCSVSchema,
+    PersonSchema,
     address_search,
+    person_retrieve,
     person_search,
 )
 
@@ -60,6 +65,10 @@ PERSON_MAPPINGS = {
         response_schema=PersonCSVSchema(),
         response_formats=[ResponseFormats.JSON, ResponseFormats.CSV],
     ),
+    Operation.Retrieve: EndpointDefinition(
+        func=person_retrieve,
+        response_schema=PersonSchema(),
+    ),
 }
 
 
@@ -73,13 +82,29 @@ ADDRESS_MAPPINGS = {
 }
 
 
+def person_search_iter(offset, limit):
+    return iter([PERSON_1, PERSON_2]), 2
+
+
+STREAMING_PERSON_MAPPINGS = {
+    Operation.Search: EndpointDefinition(
+        func=person_search_iter,
+        request_schema=OffsetLimitPageSchema(),
+        response_schema=PersonSchema(),
+        response_formats=[ResponseFormats.JSON, ResponseFormats.CSV_STREAMING],
+    ),
+}
+
+
 class TestCSV:
     def setup_method(self):
         self.graph = create_object_graph(name="example", testing=True)
         person_ns = Namespace(subject=Person)
         address_ns = Namespace(subject=Address)
+        streaming_person_ns = Namespace(subject=Person, version="v2")
         configure_crud(self.graph, person_ns, PERSON_MAPPINGS)
         configure_crud(self.graph, address_ns, ADDRESS_MAPPINGS)
+        configure_crud(self.graph, streaming_person_ns, STREAMING_PERSON_MAPPINGS)
         self.client = self.graph.flask.test_client()
 
     def assert_csv_response(self, response, status_code, expected_lines=None):
@@ -121,3 +146,31 @@ class TestCSV:
                 [str(PERSON_ID_1), "Alice", "Smith"],
             ],
         )
+
+    def test_search_streaming(self):
+        uri = "/api/v2/person"
+        response = self.client.get(
+            uri,
+            headers={"Accept": "text/csv"},
+        )
+        assert_that(response.is_streamed, is_(equal_to(True)))
+        assert_that(response.headers.get("ETag"), is_(equal_to(None)))
+        self.assert_csv_response(
+            response,
+            200,
+            expected_lines=[
+                ["id", "firstName", "lastName", "_links"],
+                [
+                    str(PERSON_ID_1),
+                    "Alice",
+                    "Smith",
+                    f"{{'self': {{'href': 'http://localhost/api/person/{PERSON_ID_1}'}}}}",
+                ],
+                [
+                    str(PERSON_ID_2),
+                    "Bob",
+                    "Jones",
+                    f"{{'self': {{'href': 'http://localhost/api/person/{PERSON_ID_2}'}}}}",
+                ],
+            ],
+        )
@@ -0,0 +1,230 @@
+"""
+Cursor paging tests for the conventions.
+
+"""
+from uuid import UUID
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    equal_to,
+    has_entries,
+    has_key,
+    is_,
+    is_not,
+    raises,
+)
+from microcosm.api import create_object_graph, load_from_dict
+
+from microcosm_flask.conventions.base import EndpointDefinition
+from microcosm_flask.conventions.crud import CRUDConvention
+from microcosm_flask.conventions.relation import RelationConvention
+from microcosm_flask.conventions.saved_search import SavedSearchConvention
+from microcosm_flask.fields import MissingCursorSigningKeyException
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.paging import CursorPage, CursorPageSchema
+from microcosm_flask.tests.conventions.fixtures import (
+    ADDRESS_1,
+    Address,
+    AddressSchema,
+    Person,
+    PersonSchema,
+    address_retrieve,
+)
+
+
+PEOPLE = [
+    Person(UUID(int=index), f"First{index}", f"Last{index}")
+    for index in range(5)
+]
+
+
+class PersonSearch:
+    pass
+
+
+class CursorCRUDConvention(CRUDConvention):
+
+    @property
+    def page_cls(self):
+        return CursorPage
+
+
+class CursorRelationConvention(RelationConvention):
+
+    @property
+    def page_cls(self):
+        return CursorPage
+
+
+class CursorSavedSearchConvention(SavedSearchConvention):
+
+    @property
+    def page_cls(self):
+        return CursorPage
+
+
+def people_after(limit, cursor=None):
+    return [
+        person
+        for person in PEOPLE
+        if cursor is None or str(person.id) > cursor[0]
+    ][:limit]
+
+
+def search_addresses_for_person(person_id, limit, cursor=None):
+    return [ADDRESS_1], dict(person_id=person_id)
+
+
+def create_graph(cursor_signing_key="secret"):
+    loader = load_from_dict(flask=dict(cursor_signing_key=cursor_signing_key))
+    return create_object_graph(name="example", testing=True, loader=loader)
+
+
+def configure_people(graph):
+    CursorCRUDConvention(graph).configure(Namespace(subject=Person), {
+        Operation.Retrieve: EndpointDefinition(
+            func=lambda person_id: None,
+            response_schema=PersonSchema(),
+        ),
+        Operation.Search: EndpointDefinition(
+            func=people_after,
+            request_schema=CursorPageSchema(),
+            response_schema=PersonSchema(),
+        ),
+    })
+
+
+def test_search():
+    graph = create_graph()
+    configure_people(graph)
+    client = graph.flask.test_client()
+
+    response = client.get("/api/person?limit=2")
+    assert_that(response.status_code, is_(equal_to(200)))
+    assert_that(response.json, has_entries(limit=2))
+    assert_that([item["id"] for item in response.json["items"]], contains_exactly(
+        str(PEOPLE[0].id),
+        str(PEOPLE[1].id),
+    ))
+
+    response = client.get(response.json["_links"]["next"]["href"])
+    assert_that(response.status_code, is_(equal_to(200)))
+    assert_that([item["id"] for item in response.json["items"]], contains_exactly(
+        str(PEOPLE[2].id),
+        str(PEOPLE[3].id),
+    ))
+
+
+def test_search_with_count():
+    graph = create_graph()
+    CursorCRUDConvention(graph).configure(Namespace(subject=Person), {
+        Operation.Retrieve: EndpointDefinition(
+            func=lambda person_id: None,
+            response_schema=PersonSchema(),
+        ),
+        Operation.Search: EndpointDefinition(
+            # e.g. a `CRUDStoreAdapter` search
+            func=lambda limit, cursor=None: (people_after(limit, cursor), len(PEOPLE)),
+            request_schema=CursorPageSchema(),
+            response_schema=PersonSchema(),
+        ),
+    })
+
+    response = graph.flask.test_client().get("/api/person?limit=2")
+
+    assert_that(response.status_code, is_(equal_to(200)))
+    assert_that([item["id"] for item in response.json["items"]], contains_exactly(
+        str(PEOPLE[0].id),
+        str(PEOPLE[1].id),
+    ))
+
+
+def test_search_with_cursor_from_another_process():
+    graph = create_graph()
+    configure_people(graph)
+    next_href = graph.flask.test_client().get("/api/person?limit=2").json["_links"]["next"]["href"]
+
+    # e.g. another worker (or the same service after a restart)
+    other_graph = create_graph()
+    configure_people(other_graph)
+    response = other_graph.flask.test_client().get(next_href)
+
+    assert_that(response.status_code, is_(equal_to(200)))
+    assert_that(response.json["items"][0]["id"], is_(equal_to(str(PEOPLE[2].id))))
+
+
+def test_search_with_invalid_cursor():
+    graph = create_graph()
+    configure_people(graph)
+    next_href = graph.flask.test_client().get("/api/person?limit=2").json["_links"]["next"]["href"]
+
+    other_graph = create_graph(cursor_signing_key="other")
+    configure_people(other_graph)
+    response = other_graph.flask.test_client().get(next_href)
+
+    assert_that(response.status_code, is_(equal_to(422)))
+
+
+def test_search_requires_signing_key():
+    graph = create_object_graph(name="example", testing=True)
+
+    assert_that(
+        calling(configure_people).with_args(graph),
+        raises(MissingCursorSigningKeyException),
+    )
+
+
+def test_search_for():
+    graph = create_graph()
+    CursorCRUDConvention(graph).configure(Namespace(subject=Address), {
+        Operation.Retrieve: EndpointDefinition(
+            func=address_retrieve,
+            response_schema=AddressSchema(),
+        ),
+    })
+    CursorRelationConvention(graph).configure(Namespace(subject=Person, object_=Address), {
+        Operation.SearchFor: EndpointDefinition(
+            func=search_addresses_for_person,
+            request_schema=CursorPageSchema(),
+            response_schema=AddressSchema(),
+        ),
+    })
+
+    response = graph.flask.test_client().get(f"/api/person/{PEOPLE[0].id}/address?limit=1")
+    with graph.flask.test_request_context():
+        cursor = str(CursorPage.cursor_for(ADDRESS_1))
+
+    assert_that(response.status_code, is_(equal_to(200)))
+    assert_that(response.json["items"], contains_exactly(has_entries(id=str(ADDRESS_1.id))))
+    assert_that(response.json["_links"]["next"]["href"], is_(equal_to(
+        f"http://localhost/api/person/{PEOPLE[0].id}/address"
+        f"?cursor={cursor}&limit=1",
+    )))
+
+
+def test_saved_search():
+    graph = create_graph()
+    configure_people(graph)
+    CursorSavedSearchConvention(graph).configure(Namespace(subject=PersonSearch), {
+        Operation.SavedSearch: EndpointDefinition(
+            func=people_after,
+            request_schema=CursorPageSchema(),
+            response_schema=PersonSchema(),
+        ),
+    })
+    client = graph.flask.test_client()
+
+    response = client.post("/api/person_search", json=dict(limit=4))
+    assert_that(response.status_code, is_(equal_to(200)))
+    assert_that(response.json, is_not(has_key("count")))
+    assert_that(len(response.json["items"]), is_(equal_to(4)))
+
+    with graph.flask.test_request_context():
+        cursor = str(CursorPage.cursor_for(PEOPLE[3]))
+
+    response = client.post("/api/person_search", json=dict(limit=4, cursor=cursor))
+    assert_that(response.status_code, is_(equal_to(200)))
+    assert_that([item["id"] for item in response.json["items"]], contains_exactly(str(PEOPLE[4].id)))
@@ -1,10 +1,28 @@
+from json import loads
+
 from hamcrest import assert_that, equal_to, is_
+from marshmallow import Schema, fields
 from microcosm.api import create_object_graph
 
-from microcosm_flask.conventions.encoding import find_response_format
+from microcosm_flask.conventions.encoding import (
+    dump_response_data,
+    find_response_format,
+    make_response,
+    negotiate_response_format,
+)
 from microcosm_flask.enums import ResponseFormats
 
 
+class ItemSchema(Schema):
+    name = fields.String()
+    value = fields.Raw()
+
+
+class ItemListSchema(Schema):
+    items = fields.List(fields.Nested(ItemSchema))
+    next = fields.String()
+
+
 class TestEncoding:
     def setup_method(self):
         self.graph = create_object_graph(name="example", testing=True)
@@ -37,3 +55,69 @@ class TestEncoding:
                 find_response_format([ResponseFormats.CSV, ResponseFormats.JSON]),
                 equal_to(ResponseFormats.CSV),
             )
+
+    def test_find_response_format_quality(self):
+        allowed = [ResponseFormats.CSV, ResponseFormats.JSON]
+        cases = [
+            # client preference wins over format priority
+            ("text/csv, application/json;q=0.5", ResponseFormats.CSV),
+            ("text/csv;q=0.5, application/json", ResponseFormats.JSON),
+            # the most specific media range determines the quality
+            ("text/*;q=0.1, text/csv, application/json;q=0.5", ResponseFormats.CSV),
+            ("application/json;q=0, */*", ResponseFormats.CSV),
+            # ties are broken by priority
+            ("*/*", ResponseFormats.JSON),
+            ("text/csv;q=0.8, application/json;q=0.8", ResponseFormats.JSON),
+            # nothing acceptable
+            ("text/csv;q=0, application/json;q=0", ResponseFormats.JSON),
+        ]
+
+        for accept, expected in cases:
+            with self.graph.app.test_request_context(headers=dict(Accept=accept)):
+                assert_that(find_response_format(allowed), is_(equal_to(expected)), accept)
+
+    def test_find_response_format_cached(self):
+        negotiate_response_format.cache_clear()
+
+        for _ in range(3):
+            with self.graph.app.test_request_context(headers=dict(Accept="text/csv")):
+                find_response_format((ResponseFormats.CSV, ResponseFormats.JSON))
+
+        assert_that(negotiate_response_format.cache_info().hits, is_(equal_to(2)))
+
+    def test_dump_response_data_skip_null(self):
+        item_list = dict(
+            items=[
+                dict(name="first", value=dict(foo=None, bar=1)),
+                dict(name=None, value=None),
+            ],
+            next=None,
+        )
+
+        with self.graph.app.test_request_context(headers={"X-Response-Skip-Null": "true"}):
+            response = dump_response_data(ItemListSchema(), item_list)
+            assert_that(response.json, is_(equal_to(dict(
+                items=[
+                    dict(name="first", value=dict(bar=1)),
+                    dict(),
+                ],
+            ))))
+
+            response = dump_response_data(ItemListSchema(), item_list, response_format=ResponseFormats.NDJSON)
+            assert_that(
+                [loads(line) for line in response.get_data().splitlines()],
+                is_(equal_to([
+                    dict(),
+                    dict(name="first", value=dict(bar=1)),
+                    dict(),
+                ])),
+            )
+
+        with self.graph.app.test_request_context():
+            response = dump_response_data(ItemListSchema(), item_list)
+            assert_that(response.json["next"], is_(equal_to(None)))
+
+    def test_make_response_skip_null(self):
+        with self.graph.app.test_request_context(headers={"X-Response-Skip-Null": "true"}):
+            response = make_response(dict(foo=None, bar=[dict(baz=None)]))
+            assert_that(response.json, is_(equal_to(dict(bar=[dict()]))))
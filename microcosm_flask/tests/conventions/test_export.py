@@ -0,0 +1,264 @@
+"""
+Export convention tests.
+
+"""
+from json import loads
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_string,
+    equal_to,
+    has_key,
+    is_,
+    raises,
+)
+from microcosm.api import create_object_graph, load_from_dict
+
+from microcosm_flask.conventions.base import EndpointDefinition
+from microcosm_flask.conventions.crud import (
+    CRUDConvention,
+    ExportLimitExceededException,
+    configure_crud,
+)
+from microcosm_flask.conventions.crud_adapter import CRUDStoreAdapter
+from microcosm_flask.conventions.registry import iter_endpoints
+from microcosm_flask.enums import CountPolicy, ResponseFormats
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.paging import CursorPage, CursorPageSchema, OffsetLimitPageSchema
+from microcosm_flask.swagger.definitions import build_swagger
+from microcosm_flask.tests.conventions.fixtures import Person, PersonSchema
+
+
+PEOPLE = sorted(
+    [
+        Person(uuid4(), f"First{index}", f"Last{index}")
+        for index in range(25)
+    ],
+    key=lambda person: str(person.id),
+)
+
+
+class PersonStore:
+    model_class = Person
+
+    def __init__(self):
+        self.people = PEOPLE
+        self.searches = []
+
+    def search(self, offset, limit):
+        self.searches.append((offset, limit))
+        return self.people[offset:offset + limit]
+
+    def count(self):
+        raise AssertionError("Exports should not count")
+
+
+class SmallPageCRUDConvention(CRUDConvention):
+
+    @property
+    def export_page_size(self):
+        return 10
+
+    @property
+    def export_max_rows(self):
+        return 20
+
+
+class TestExport:
+
+    def setup_method(self):
+        self.graph = create_object_graph(name="example", testing=True)
+        self.ns = Namespace(subject=Person, version="v1")
+        self.store = PersonStore()
+        self.adapter = CRUDStoreAdapter(self.graph, self.store)
+
+        SmallPageCRUDConvention(self.graph).configure(self.ns, {
+            Operation.Export: EndpointDefinition(
+                func=self.adapter.export,
+                request_schema=OffsetLimitPageSchema(),
+                response_schema=PersonSchema(),
+            ),
+            Operation.Retrieve: EndpointDefinition(
+                func=self.adapter.retrieve,
+                response_schema=PersonSchema(),
+            ),
+        })
+        self.client = self.graph.flask.test_client()
+
+    def test_export_json(self):
+        with patch.object(SmallPageCRUDConvention, "export_max_rows", 100):
+            response = self.client.get("/api/v1/person/export?offset=5&limit=1")
+            assert_that(response.is_streamed, is_(equal_to(True)))
+            data = loads(response.get_data())
+
+        assert_that(response.status_code, is_(equal_to(200)))
+        assert_that(response.headers["Content-Type"], is_(equal_to("application/json")))
+        assert_that(
+            [item["id"] for item in data["items"]],
+            is_(equal_to([str(person.id) for person in PEOPLE])),
+        )
+        assert_that(data["items"][0], has_key("_links"))
+        # paging arguments are ignored; pages are fetched until one is not full
+        assert_that(self.store.searches, is_(equal_to([(0, 10), (10, 10), (20, 10)])))
+
+    def test_export_ndjson(self):
+        with patch.object(SmallPageCRUDConvention, "export_max_rows", 100):
+            response = self.client.get("/api/v1/person/export", headers={"Accept": "application/x-ndjson"})
+            lines = response.get_data().splitlines()
+
+        assert_that(loads(lines[0]), is_(equal_to(dict())))
+        assert_that(len(lines), is_(equal_to(len(PEOPLE) + 1)))
+
+    def test_export_csv(self):
+        with patch.object(SmallPageCRUDConvention, "export_max_rows", 100):
+            response = self.client.get("/api/v1/person/export", headers={"Accept": "text/csv"})
+            lines = response.get_data(as_text=True).splitlines()
+
+        assert_that(lines[0], contains_string("firstName"))
+        assert_that(len(lines), is_(equal_to(len(PEOPLE) + 1)))
+
+    def test_export_unacceptable(self):
+        with patch.object(SmallPageCRUDConvention, "export_max_rows", 100):
+            response = self.client.get("/api/v1/person/export", headers={"Accept": "text/html"})
+            data = loads(response.get_data())
+
+        assert_that(response.headers["Content-Type"], is_(equal_to("application/json")))
+        assert_that(len(data["items"]), is_(equal_to(len(PEOPLE))))
+
+    def test_export_max_rows(self):
+        response = self.client.get("/api/v1/person/export")
+
+        assert_that(
+            calling(response.get_data),
+            raises(ExportLimitExceededException),
+        )
+
+    def test_export_max_rows_not_exceeded(self):
+        self.store.people = PEOPLE[:20]
+
+        response = self.client.get("/api/v1/person/export")
+        data = loads(response.get_data())
+
+        assert_that(len(data["items"]), is_(equal_to(20)))
+
+    def test_swagger(self):
+        with self.graph.app.test_request_context():
+            operations = list(iter_endpoints(self.graph, lambda operation, ns, rule: True))
+            swagger = build_swagger(self.graph, self.ns, operations)
+
+        assert_that(swagger["paths"], has_key("/person/export"))
+        assert_that(swagger["definitions"], has_key("PersonExport"))
+
+
+def test_export_search_with_extra_item():
+    graph = create_object_graph(name="example", testing=True)
+    store = PersonStore()
+    store.people = PEOPLE[:15]
+    # without exact counts, searches fetch one item beyond the limit
+    adapter = CRUDStoreAdapter(graph, store, count_policy=CountPolicy.SKIP)
+    SmallPageCRUDConvention(graph).configure(Namespace(subject=Person, version="v1"), {
+        Operation.Export: EndpointDefinition(
+            func=adapter.search,
+            request_schema=OffsetLimitPageSchema(),
+            response_schema=PersonSchema(),
+        ),
+        Operation.Retrieve: EndpointDefinition(
+            func=adapter.retrieve,
+            response_schema=PersonSchema(),
+        ),
+    })
+
+    response = graph.flask.test_client().get("/api/v1/person/export")
+    data = loads(response.get_data())
+
+    assert_that(
+        [item["id"] for item in data["items"]],
+        is_(equal_to([str(person.id) for person in PEOPLE[:15]])),
+    )
+    assert_that(store.searches, is_(equal_to([(0, 11), (10, 11)])))
+
+
+def test_export_cursor_pages():
+    loader = load_from_dict(flask=dict(cursor_signing_key="secret"))
+    graph = create_object_graph(name="example", testing=True, loader=loader)
+    cursors = []
+
+    def person_export(limit, cursor=None):
+        cursors.append(cursor)
+        after = [person for person in PEOPLE if cursor is None or str(person.id) > str(cursor[0])]
+        return after[:limit]
+
+    class CursorCRUDConvention(CRUDConvention):
+
+        @property
+        def page_cls(self):
+            return CursorPage
+
+        @property
+        def export_page_size(self):
+            return 10
+
+    CursorCRUDConvention(graph).configure(Namespace(subject=Person), {
+        Operation.Export: EndpointDefinition(
+            func=person_export,
+            request_schema=CursorPageSchema(),
+            response_schema=PersonSchema(),
+            response_formats=[ResponseFormats.NDJSON],
+        ),
+        Operation.Retrieve: EndpointDefinition(
+            func=lambda person_id: None,
+            response_schema=PersonSchema(),
+        ),
+    })
+
+    response = graph.flask.test_client().get("/api/person/export")
+
+    lines = response.get_data().splitlines()[1:]
+    assert_that(
+        [loads(line)["id"] for line in lines],
+        is_(equal_to([str(person.id) for person in PEOPLE])),
+    )
+    assert_that(cursors[1:], is_(equal_to([(PEOPLE[9].id,), (PEOPLE[19].id,)])))
+
+
+def test_export_requires_streaming_formats():
+    graph = create_object_graph(name="example", testing=True)
+
+    with pytest.raises(ValueError):
+        configure_crud(graph, Namespace(subject=Person), {
+            Operation.Export: EndpointDefinition(
+                func=lambda offset, limit: ([], None),
+                request_schema=OffsetLimitPageSchema(),
+                response_schema=PersonSchema(),
+                response_formats=[ResponseFormats.JSON],
+            ),
+        })
+
+
+def test_search_json_streaming():
+    graph = create_object_graph(name="example", testing=True)
+
+    configure_crud(graph, Namespace(subject=Person), {
+        Operation.Search: EndpointDefinition(
+            func=lambda offset, limit: (PEOPLE[offset:offset + limit], len(PEOPLE)),
+            request_schema=OffsetLimitPageSchema(),
+            response_schema=PersonSchema(),
+            response_formats=[ResponseFormats.JSON_STREAMING],
+        ),
+        Operation.Retrieve: EndpointDefinition(
+            func=lambda person_id: None,
+            response_schema=PersonSchema(),
+        ),
+    })
+
+    response = graph.flask.test_client().get("/api/person?limit=5")
+
+    data = loads(response.get_data())
+    assert_that(data["count"], is_(equal_to(len(PEOPLE))))
+    assert_that(data["_links"], has_key("next"))
+    assert_that(len(data["items"]), is_(equal_to(5)))
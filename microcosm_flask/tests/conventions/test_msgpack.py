@@ -0,0 +1,114 @@
+"""
+MessagePack request and response tests.
+
+"""
+from unittest import SkipTest
+from unittest.mock import patch
+
+from hamcrest import (
+    assert_that,
+    equal_to,
+    is_,
+    starts_with,
+)
+from microcosm.api import create_object_graph
+
+from microcosm_flask.conventions.base import EndpointDefinition
+from microcosm_flask.conventions.crud import configure_crud
+from microcosm_flask.enums import ResponseFormats
+from microcosm_flask.formatting.msgpack_formatter import dumps, loads, msgpack
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.tests.conventions.fixtures import (
+    PERSON_ID_1,
+    PERSON_ID_2,
+    NewPersonSchema,
+    Person,
+    PersonSchema,
+    person_create,
+    person_retrieve,
+)
+
+
+PERSON_MAPPINGS = {
+    Operation.Create: EndpointDefinition(
+        func=person_create,
+        request_schema=NewPersonSchema(),
+        response_schema=PersonSchema(),
+        response_formats=[ResponseFormats.JSON, ResponseFormats.MSGPACK],
+    ),
+    Operation.Retrieve: EndpointDefinition(
+        func=person_retrieve,
+        response_schema=PersonSchema(),
+        response_formats=[ResponseFormats.JSON, ResponseFormats.MSGPACK],
+    ),
+}
+
+
+class TestMsgPack:
+
+    def setup_method(self):
+        if msgpack is None:
+            raise SkipTest
+
+        self.graph = create_object_graph(name="example", testing=True)
+        configure_crud(self.graph, Namespace(subject=Person), PERSON_MAPPINGS)
+        self.client = self.graph.flask.test_client()
+
+    def test_create(self):
+        response = self.client.post(
+            "/api/person",
+            data=dumps(dict(firstName="Bob", lastName="Jones")),
+            content_type="application/msgpack",
+            headers={"Accept": "application/msgpack"},
+        )
+
+        assert_that(response.status_code, is_(equal_to(201)))
+        assert_that(response.headers["Content-Type"], starts_with("application/msgpack"))
+        assert_that(loads(response.data), is_(equal_to({
+            "id": str(PERSON_ID_2),
+            "firstName": "Bob",
+            "lastName": "Jones",
+            "_links": {
+                "self": {
+                    "href": f"http://localhost/api/person/{PERSON_ID_2}",
+                },
+            },
+        })))
+
+    def test_create_malformed(self):
+        response = self.client.post(
+            "/api/person",
+            data=b"\xc1",
+            content_type="application/msgpack",
+        )
+
+        assert_that(response.status_code, is_(equal_to(422)))
+
+    def test_create_without_msgpack(self):
+        data = dumps(dict(firstName="Bob", lastName="Jones"))
+        with patch("microcosm_flask.formatting.msgpack_formatter.msgpack", None):
+            response = self.client.post(
+                "/api/person",
+                data=data,
+                content_type="application/msgpack",
+            )
+
+        assert_that(response.status_code, is_(equal_to(415)))
+
+    def test_retrieve(self):
+        response = self.client.get(
+            f"/api/person/{PERSON_ID_1}",
+            headers={"Accept": "application/msgpack"},
+        )
+
+        assert_that(response.status_code, is_(equal_to(200)))
+        assert_that(loads(response.data)["firstName"], is_(equal_to("Alice")))
+
+    def test_retrieve_json(self):
+        response = self.client.get(
+            f"/api/person/{PERSON_ID_1}",
+            headers={"Accept": "*/*"},
+        )
+
+        assert_that(response.headers["Content-Type"], starts_with("application/json"))
@@ -0,0 +1,180 @@
+"""
+NDJSON response tests.
+
+"""
+from json import loads
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    equal_to,
+    is_,
+    starts_with,
+)
+from microcosm.api import create_object_graph
+
+from microcosm_flask.conventions.base import EndpointDefinition
+from microcosm_flask.conventions.crud import configure_crud
+from microcosm_flask.conventions.relation import configure_relation
+from microcosm_flask.enums import ResponseFormats
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.paging import OffsetLimitPageSchema
+from microcosm_flask.tests.conventions.fixtures import (
+    ADDRESS_1,
+    ADDRESS_ID_1,
+    PERSON_1,
+    PERSON_2,
+    PERSON_ID_1,
+    PERSON_ID_2,
+    Address,
+    AddressSchema,
+    Person,
+    PersonSchema,
+    address_retrieve,
+    person_retrieve,
+)
+
+
+def person_search(offset, limit):
+    return iter([PERSON_1, PERSON_2]), 2
+
+
+def person_search_for_address(person_id, offset, limit):
+    return iter([ADDRESS_1]), 1, dict(person_id=person_id)
+
+
+PERSON_MAPPINGS = {
+    Operation.Retrieve: EndpointDefinition(
+        func=person_retrieve,
+        response_schema=PersonSchema(),
+    ),
+    Operation.Search: EndpointDefinition(
+        func=person_search,
+        request_schema=OffsetLimitPageSchema(),
+        response_schema=PersonSchema(),
+        response_formats=[ResponseFormats.JSON, ResponseFormats.NDJSON],
+    ),
+}
+
+
+ADDRESS_MAPPINGS = {
+    Operation.Retrieve: EndpointDefinition(
+        func=address_retrieve,
+        response_schema=AddressSchema(),
+    ),
+}
+
+
+PERSON_ADDRESS_MAPPINGS = {
+    Operation.SearchFor: EndpointDefinition(
+        func=person_search_for_address,
+        request_schema=OffsetLimitPageSchema(),
+        response_schema=AddressSchema(),
+        response_formats=[ResponseFormats.JSON, ResponseFormats.NDJSON],
+    ),
+}
+
+
+class TestNDJSON:
+    def setup_method(self):
+        self.graph = create_object_graph(name="example", testing=True)
+        configure_crud(self.graph, Namespace(subject=Person), PERSON_MAPPINGS)
+        configure_crud(self.graph, Namespace(subject=Address), ADDRESS_MAPPINGS)
+        configure_relation(
+            self.graph,
+            Namespace(subject=Person, object_=Address),
+            PERSON_ADDRESS_MAPPINGS,
+        )
+        self.client = self.graph.flask.test_client()
+
+    def assert_ndjson_response(self, response, expected_lines):
+        assert_that(response.status_code, is_(equal_to(200)))
+        assert_that(response.headers["Content-Type"], starts_with("application/x-ndjson"))
+        assert_that(
+            [loads(line) for line in response.data.splitlines()],
+            contains_exactly(*expected_lines),
+        )
+
+    def test_search(self):
+        response = self.client.get(
+            "/api/person",
+            headers={"Accept": "application/x-ndjson"},
+        )
+        self.assert_ndjson_response(
+            response,
+            [
+                {
+                    "count": 2,
+                    "offset": 0,
+                    "limit": 20,
+                    "_links": {
+                        "self": {
+                            "href": "http://localhost/api/person?offset=0&limit=20",
+                        },
+                    },
+                },
+                {
+                    "id": str(PERSON_ID_1),
+                    "firstName": "Alice",
+                    "lastName": "Smith",
+                    "_links": {
+                        "self": {
+                            "href": f"http://localhost/api/person/{PERSON_ID_1}",
+                        },
+                    },
+                },
+                {
+                    "id": str(PERSON_ID_2),
+                    "firstName": "Bob",
+                    "lastName": "Jones",
+                    "_links": {
+                        "self": {
+                            "href": f"http://localhost/api/person/{PERSON_ID_2}",
+                        },
+                    },
+                },
+            ],
+        )
+
+    def test_search_json(self):
+        response = self.client.get("/api/person")
+        assert_that(response.status_code, is_(equal_to(200)))
+        assert_that(response.json["count"], is_(equal_to(2)))
+        assert_that(response.json["items"], is_(equal_to([
+            dict(item, _links=dict(self=dict(href=f"http://localhost/api/person/{item['id']}")))
+            for item in [
+                dict(id=str(PERSON_ID_1), firstName="Alice", lastName="Smith"),
+                dict(id=str(PERSON_ID_2), firstName="Bob", lastName="Jones"),
+            ]
+        ])))
+
+    def test_search_for(self):
+        response = self.client.get(
+            f"/api/person/{PERSON_ID_1}/address",
+            headers={"Accept": "application/x-ndjson"},
+        )
+        self.assert_ndjson_response(
+            response,
+            [
+                {
+                    "count": 1,
+                    "offset": 0,
+                    "limit": 20,
+                    "_links": {
+                        "self": {
+                            "href": f"http://localhost/api/person/{PERSON_ID_1}/address?offset=0&limit=20",
+                        },
+                    },
+                },
+                {
+                    "id": str(ADDRESS_ID_1),
+                    "addressLine": "21 Acme St., San Francisco CA 94110",
+                    "_links": {
+                        "self": {
+                            "href": f"http://localhost/api/address/{ADDRESS_ID_1}",
+                        },
+                    },
+                },
+            ],
+        )
@@ -0,0 +1,88 @@
+"""
+Swagger convention tests.
+
+"""
+from unittest.mock import patch
+
+from hamcrest import (
+    assert_that,
+    equal_to,
+    has_key,
+    is_,
+    is_not,
+)
+from microcosm.api import create_object_graph
+
+from microcosm_flask.conventions.crud import configure_crud
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.swagger.definitions import build_swagger
+from microcosm_flask.tests.conventions.fixtures import (
+    Person,
+    PersonSchema,
+    person_delete,
+    person_retrieve,
+)
+
+
+class TestSwagger:
+
+    def setup_method(self):
+        self.graph = create_object_graph(name="example", testing=True)
+        self.ns = Namespace(subject=Person)
+        configure_crud(self.graph, self.ns, {
+            Operation.Retrieve: (person_retrieve, PersonSchema()),
+        })
+        self.graph.use("swagger_convention")
+        self.client = self.graph.flask.test_client()
+
+    def test_swagger_is_cached(self):
+        with patch(
+            "microcosm_flask.conventions.swagger.build_swagger",
+            side_effect=build_swagger,
+        ) as mocked_build_swagger:
+            first = self.client.get("/api/swagger")
+            second = self.client.get("/api/swagger")
+
+        assert_that(mocked_build_swagger.call_count, is_(equal_to(1)))
+        assert_that(first.status_code, is_(equal_to(200)))
+        assert_that(second.get_data(), is_(equal_to(first.get_data())))
+        assert_that(second.headers["ETag"], is_(equal_to(first.headers["ETag"])))
+        assert_that(second.json["paths"], has_key("/person/{person_id}"))
+
+    def test_swagger_not_modified(self):
+        etag = self.client.get("/api/swagger").headers["ETag"]
+
+        response = self.client.get("/api/swagger", headers={"If-None-Match": etag})
+
+        assert_that(response.status_code, is_(equal_to(304)))
+        assert_that(response.headers["ETag"], is_(equal_to(etag)))
+        assert_that(response.get_data(), is_(equal_to(b"")))
+
+    def test_swagger_varies_by_validation(self):
+        with patch(
+            "microcosm_flask.conventions.swagger.build_swagger",
+            side_effect=build_swagger,
+        ) as mocked_build_swagger:
+            self.client.get("/api/swagger")
+            self.client.get("/api/swagger?validate_schema=true")
+            self.client.get("/api/swagger?validate_schema=true")
+
+        assert_that(mocked_build_swagger.call_count, is_(equal_to(2)))
+
+    def test_swagger_is_rebuilt_for_new_routes(self):
+        app = self.graph.flask
+
+        # dispatch without handling a (first) request, which would prevent adding routes
+        with app.test_request_context("/api/swagger"):
+            first = app.dispatch_request()
+
+        configure_crud(self.graph, self.ns, {
+            Operation.Delete: (person_delete,),
+        })
+
+        with app.test_request_context("/api/swagger"):
+            second = app.dispatch_request()
+
+        assert_that(second.get_etag(), is_not(equal_to(first.get_etag())))
+        assert_that(second.json["paths"]["/person/{person_id}"], has_key("delete"))
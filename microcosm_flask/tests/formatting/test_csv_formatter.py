@@ -4,12 +4,13 @@ Test CSV formatting.
 """
 from hamcrest import (
     assert_that,
+    contains_exactly,
     contains_inanyorder,
     equal_to,
     is_,
 )
 
-from microcosm_flask.formatting import CSVFormatter
+from microcosm_flask.formatting import CSVFormatter, StreamingCSVFormatter
 from microcosm_flask.tests.conventions.fixtures import PersonCSVSchema
 from microcosm_flask.tests.formatting.base import etag_for
 
@@ -135,3 +136,61 @@ def test_make_response_ordered():
             ),
         ),
     )
+
+
+def test_make_response_empty():
+    formatter = CSVFormatter()
+
+    response = formatter(dict(items=[]))
+
+    assert_that(response.data, is_(equal_to(b"")))
+
+
+def test_make_streaming_response():
+    formatter = StreamingCSVFormatter(PersonCSVSchema())
+
+    response = formatter(
+        dict(
+            items=(
+                dict(
+                    firstName="First",
+                    lastName=f"Last{index}",
+                    id=f"me{index}",
+                )
+                for index in range(2)
+            )
+        )
+    )
+
+    assert_that(response.is_streamed, is_(equal_to(True)))
+    assert_that(response.data, is_(equal_to(b"id,firstName,lastName\r\nme0,First,Last0\r\nme1,First,Last1\r\n")))
+    assert_that(
+        response.headers,
+        contains_inanyorder(
+            ("Content-Disposition", 'attachment; filename="response.csv"'),
+            ("Content-Type", "text/csv; charset=utf-8"),
+        ),
+    )
+
+
+def test_make_streaming_response_chunks():
+    formatter = StreamingCSVFormatter()
+    formatter.chunk_size = 2
+
+    response = formatter(
+        dict(
+            items=iter([
+                ("a", "b", "c"),
+                ("d", "e", "f"),
+                ("g", "h", "i"),
+            ])
+        )
+    )
+
+    assert_that(
+        list(response.iter_encoded()),
+        contains_exactly(
+            b"a,b,c\r\nd,e,f\r\n",
+            b"g,h,i\r\n",
+        ),
+    )
@@ -0,0 +1,86 @@
+"""
+Test MessagePack formatting.
+
+"""
+from collections import namedtuple
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum, IntEnum
+from unittest import SkipTest
+from uuid import UUID
+
+from hamcrest import (
+    assert_that,
+    equal_to,
+    is_,
+    starts_with,
+)
+from microcosm.api import create_object_graph
+
+from microcosm_flask.formatting import MsgPackFormatter
+from microcosm_flask.formatting.msgpack_formatter import loads, msgpack
+
+
+class Color(str, Enum):
+    RED = "RED"
+
+
+class Size(IntEnum):
+    LARGE = 3
+
+
+Point = namedtuple("Point", ["x", "y"])
+
+
+def setup_module():
+    if msgpack is None:
+        raise SkipTest
+
+
+def test_make_response():
+    graph = create_object_graph(name="example", testing=True)
+    formatter = MsgPackFormatter()
+
+    with graph.app.test_request_context():
+        response = formatter(dict(foo="bar"))
+
+    assert_that(response.data, is_(equal_to(b"\x81\xa3foo\xa3bar")))
+    assert_that(response.content_type, is_(equal_to("application/msgpack")))
+    assert_that(response.headers["ETag"], starts_with('"'))
+
+
+def test_encode_like_json():
+    graph = create_object_graph(name="example", testing=True)
+    formatter = MsgPackFormatter()
+    value = dict(
+        id=UUID("f5bd9d0a-4e0b-4d5b-9a4a-5f1b2c3d4e5f"),
+        count=Decimal("2"),
+        created=datetime(2017, 1, 2, 3, 4, 5),
+        color=Color.RED,
+        size=Size.LARGE,
+        point=Point(1, 2),
+        pair=(1, "a"),
+    )
+
+    with graph.app.test_request_context():
+        response = formatter(value)
+        expected = graph.app.json.loads(graph.app.json.dumps(value))
+
+    assert_that(loads(response.data), is_(equal_to(expected)))
+
+
+def test_encode_decimal():
+    formatter = MsgPackFormatter()
+    graph = create_object_graph(name="example", testing=True)
+    value = dict(
+        price=Decimal("1.10"),
+        balance=Decimal("12345678901234567890.123456789"),
+        rate=Decimal("-1E-30"),
+    )
+
+    with graph.app.test_request_context():
+        response = formatter(value)
+
+    decoded = loads(response.data)
+    assert_that(decoded, is_(equal_to(value)))
+    assert_that(str(decoded["price"]), is_(equal_to("1.10")))
@@ -0,0 +1,64 @@
+"""
+Test NDJSON formatting.
+
+"""
+from decimal import Decimal
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    equal_to,
+    is_,
+)
+from microcosm.api import create_object_graph
+
+from microcosm_flask.formatting import NDJSONFormatter
+
+
+def test_make_response():
+    graph = create_object_graph(name="example", testing=True)
+    formatter = NDJSONFormatter()
+
+    with graph.app.test_request_context():
+        response = formatter(
+            dict(
+                count=2,
+                items=iter([
+                    dict(foo="bar", price=Decimal("1.10")),
+                    dict(foo="baz"),
+                ]),
+            ),
+        )
+        assert_that(response.is_streamed, is_(equal_to(True)))
+        assert_that(
+            response.data,
+            is_(equal_to(b'{"count":2}\n{"foo":"bar","price":1.10}\n{"foo":"baz"}\n')),
+        )
+
+    assert_that(response.content_type, is_(equal_to("application/x-ndjson")))
+    assert_that(response.headers.get("ETag"), is_(equal_to(None)))
+
+
+def test_make_response_single():
+    graph = create_object_graph(name="example", testing=True)
+    formatter = NDJSONFormatter()
+
+    with graph.app.test_request_context():
+        response = formatter(dict(foo="bar"))
+        assert_that(response.data, is_(equal_to(b'{"foo":"bar"}\n')))
+
+
+def test_make_response_chunks():
+    graph = create_object_graph(name="example", testing=True)
+    formatter = NDJSONFormatter()
+    formatter.chunk_size = 2
+
+    with graph.app.test_request_context():
+        response = formatter(dict(items=[1, 2, 3]))
+        assert_that(
+            list(response.iter_encoded()),
+            contains_exactly(
+                b"{}\n1\n",
+                b"2\n3\n",
+            ),
+        )
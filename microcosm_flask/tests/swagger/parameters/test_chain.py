@@ -0,0 +1,70 @@
+from hamcrest import (
+    assert_that,
+    calling,
+    equal_to,
+    is_,
+    is_not,
+    raises,
+    same_instance,
+)
+from marshmallow import Schema, fields
+
+from microcosm_flask.swagger.api import build_parameter
+from microcosm_flask.swagger.decorators import swagger_field
+from microcosm_flask.swagger.parameters import Parameters
+
+
+class UnmappedField(fields.Field):
+    pass
+
+
+class FooSchema(Schema):
+    plain = fields.String()
+    decorated = swagger_field(swagger_format="uuid")(
+        fields.String(),
+    )
+    decorated_unmapped = swagger_field(swagger_type="string")(
+        UnmappedField(),
+    )
+    unmapped = UnmappedField()
+
+
+def test_builder_chain_is_shared():
+    assert_that(
+        Parameters(strict_enums=True).builder_chain(True),
+        is_(same_instance(Parameters().builder_chain(True))),
+    )
+    assert_that(
+        Parameters().builder_chain(False),
+        is_not(same_instance(Parameters().builder_chain(True))),
+    )
+
+
+def test_dispatch_checks_fields_of_the_same_type():
+    schema = FooSchema()
+
+    assert_that(build_parameter(schema.fields["plain"]), is_(equal_to({"type": "string"})))
+    assert_that(
+        build_parameter(schema.fields["decorated"]),
+        is_(equal_to({"type": "string", "format": "uuid"})),
+    )
+    assert_that(
+        build_parameter(schema.fields["decorated_unmapped"]),
+        is_(equal_to({"type": "string"})),
+    )
+
+
+def test_parameters_are_memoized():
+    field = FooSchema().fields["decorated"]
+
+    parameter = build_parameter(field)
+    parameter["name"] = "decorated"
+
+    assert_that(build_parameter(field), is_(equal_to({"type": "string", "format": "uuid"})))
+
+
+def test_unmapped_field():
+    field = FooSchema().fields["unmapped"]
+
+    for _ in range(2):
+        assert_that(calling(build_parameter).with_args(field), raises(KeyError))
@@ -2,15 +2,24 @@
 Test JSON Schema generation.
 
 """
+from unittest.mock import patch
+
 from hamcrest import (
     assert_that,
     equal_to,
+    has_key,
     has_length,
     is_,
+    is_not,
 )
 
 from microcosm_flask.swagger.api import build_schema, iter_schemas
-from microcosm_flask.tests.conventions.fixtures import NewPersonSchema, RecursiveSchema
+from microcosm_flask.swagger.schemas import SCHEMA_CACHE, Schemas
+from microcosm_flask.tests.conventions.fixtures import (
+    NewPersonSchema,
+    PersonSchema,
+    RecursiveSchema,
+)
 
 
 def test_schema_generation():
@@ -87,3 +96,29 @@ def test_schema_iteration_recursive():
             "items": {"$ref": "#/definitions/Recursive"},
         }},
     })))
+
+
+def test_schema_generation_is_cached():
+    SCHEMA_CACHE.clear()
+
+    with patch.object(Schemas, "build_uncached", autospec=True, side_effect=Schemas.build_uncached) as mocked:
+        first = build_schema(NewPersonSchema())
+        first["description"] = "changed"
+        second = build_schema(NewPersonSchema())
+        build_schema(NewPersonSchema(), strict_enums=False)
+        build_schema(NewPersonSchema(exclude=["email"]))
+
+    assert_that(second, is_not(has_key("description")))
+    assert_that(mocked.call_count, is_(equal_to(3)))
+
+
+def test_schema_iteration_is_cached():
+    SCHEMA_CACHE.clear()
+
+    with patch.object(Schemas, "build_uncached", autospec=True, side_effect=Schemas.build_uncached) as mocked:
+        first = list(iter_schemas(PersonSchema()))
+        second = list(iter_schemas(PersonSchema()))
+
+    assert_that(second, is_(equal_to(first)))
+    # person, its associated schemas, and its nested schemas are built once
+    assert_that(mocked.call_count, is_(equal_to(len(first))))
@@ -0,0 +1,70 @@
+"""
+Offline swagger generation tests.
+
+"""
+import gzip
+from json import loads
+
+import pytest
+from hamcrest import (
+    assert_that,
+    contains_inanyorder,
+    equal_to,
+    has_key,
+    is_,
+)
+from microcosm.api import create_object_graph
+
+from microcosm_flask.conventions.crud import configure_crud
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.swagger.cli import main
+from microcosm_flask.tests.conventions.fixtures import (
+    Person,
+    PersonSchema,
+    person_delete,
+    person_retrieve,
+)
+
+
+def create_app():
+    graph = create_object_graph(name="example", testing=True)
+    ns = Namespace(subject=Person, version="v1")
+    configure_crud(graph, ns, {
+        Operation.Delete: (person_delete,),
+        Operation.Retrieve: (person_retrieve, PersonSchema()),
+    })
+    graph.use("swagger_convention")
+    return graph
+
+
+def create_app_without_swagger():
+    return create_object_graph(name="example", testing=True)
+
+
+def test_main(tmp_path):
+    main([f"{__name__}:create_app", "--output-dir", str(tmp_path), "--encodings", "gzip"])
+
+    filename = tmp_path / "api" / "swagger.json"
+    assert_that(
+        [str(path.relative_to(tmp_path)) for path in tmp_path.rglob("*.*")],
+        contains_inanyorder("api/swagger.json", "api/swagger.json.gz"),
+    )
+
+    data = filename.read_bytes()
+    assert_that(gzip.decompress((tmp_path / "api" / "swagger.json.gz").read_bytes()), is_(equal_to(data)))
+    assert_that(loads(data)["paths"], has_key("/v1/person/{person_id}"))
+
+    # definitions match the swagger endpoint
+    response = create_app().flask.test_client().get("/api/swagger")
+    assert_that(data, is_(equal_to(response.get_data())))
+
+
+def test_main_without_swagger(tmp_path):
+    with pytest.raises(SystemExit):
+        main([f"{__name__}:create_app_without_swagger", "--output-dir", str(tmp_path)])
+
+
+def test_main_unavailable_encoding(tmp_path):
+    with pytest.raises(SystemExit):
+        main([f"{__name__}:create_app", "--output-dir", str(tmp_path), "--encodings", "deflate"])
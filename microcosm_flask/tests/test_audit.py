@@ -2,28 +2,51 @@
 Audit structure tests.
 
 """
-from logging import DEBUG, NOTSET, getLogger
-from unittest.mock import MagicMock
+from contextvars import Context
+from decimal import Decimal
+from logging import (
+    DEBUG,
+    INFO,
+    NOTSET,
+    Handler,
+    getLogger,
+)
+from unittest.mock import MagicMock, patch
 from uuid import uuid4
 
-from flask import g
+from flask import Request, g
 from hamcrest import (
     assert_that,
     equal_to,
     greater_than,
+    has_entries,
     is_,
     is_not,
     none,
 )
+from marshmallow import Schema, fields
 from microcosm.api import create_object_graph
 from werkzeug.exceptions import NotFound
 
 from microcosm_flask.audit import (
     AuditOptions,
     RequestInfo,
+    id_header_key,
+    is_uuid,
     logging_levels,
     should_skip_logging,
 )
+from microcosm_flask.conventions.encoding import (
+    CAPTURE_RESPONSE_DATA,
+    RESPONSE_DATA,
+    load_request_data,
+    make_response,
+)
+from microcosm_flask.formatting.msgpack_formatter import dumps as msgpack_dumps
+
+
+class FooSchema(Schema):
+    foo = fields.String()
 
 
 def test_func(*args, **kwargs):
@@ -271,6 +294,68 @@ class TestRequestInfo:
                 ),
             )
 
+    def test_loaded_request_body(self):
+        """
+        Reuses request data loaded while processing the request.
+
+        """
+        with self.graph.flask.test_request_context("/", data='{"foo": "bar"}'):
+            load_request_data(FooSchema())
+            with patch.object(Request, "get_json") as mocked_get_json:
+                request_info = RequestInfo(self.options, test_func, None)
+                request_info.capture_request()
+
+            mocked_get_json.assert_not_called()
+            assert_that(request_info.to_dict(), has_entries(request_body=dict(foo="bar")))
+
+    def test_loaded_msgpack_request_body(self):
+        """
+        Reuses MessagePack request data loaded while processing the request.
+
+        """
+        data = msgpack_dumps(dict(foo="bar"))
+        with self.graph.flask.test_request_context("/", data=data, content_type="application/msgpack"):
+            load_request_data(FooSchema())
+            request_info = RequestInfo(self.options, test_func, None)
+            request_info.capture_request()
+
+            assert_that(request_info.to_dict(), has_entries(request_body=dict(foo="bar")))
+
+    def test_dumped_response_body(self):
+        """
+        Reuses response data dumped while processing the request (with values as they are encoded).
+
+        """
+        with self.graph.flask.test_request_context("/"):
+            setattr(g, CAPTURE_RESPONSE_DATA, True)
+            g.hide_response_fields = ["bar"]
+            id = uuid4()
+            response_data = dict(foo="foo", bar="bar", id=id, price=Decimal("1.10"), tags=("a", "b"))
+            response = make_response(response_data)
+            with patch("microcosm_flask.audit.loads") as mocked_loads:
+                request_info = RequestInfo(self.options, test_func, None)
+                request_info.capture_response(response)
+
+            mocked_loads.assert_not_called()
+
+            assert_that(request_info.to_dict(), has_entries(response_body=dict(
+                foo="foo",
+                id=str(id),
+                price="1.10",
+                tags=["a", "b"],
+            )))
+            assert_that(response_data, has_entries(bar="bar", id=id))
+
+    def test_dumped_response_body_not_captured(self):
+        """
+        Does not keep dumped response data unless the response body is captured.
+
+        """
+        with self.graph.flask.test_request_context("/"):
+            make_response(dict(foo="foo"))
+
+            assert_that(g.get(RESPONSE_DATA), is_(none()))
+
     def test_response_body_with_field_renaming(self):
         """
         Can capture the response body with field renaming
@@ -439,6 +524,59 @@ class TestRequestInfo:
                 assert_that(getLogger().getEffectiveLevel(), is_(equal_to(DEBUG)))
         assert_that(getLogger().getEffectiveLevel(), is_not(equal_to(DEBUG)))
 
+    def test_request_debug_logging(self):
+        """
+        Emit DEBUG logs only from the request that enabled them.
+
+        """
+        messages = []
+        handler = Handler()
+        handler.emit = lambda record: messages.append(record.getMessage())
+        root = getLogger()
+        level = root.level
+        root.addHandler(handler)
+        root.setLevel(INFO)
+        logger = getLogger("test_request_debug_logging")
+
+        # a logger with its own handler that does not propagate (and inherits the root level)
+        own_messages = []
+        own_handler = Handler()
+        own_handler.emit = lambda record: own_messages.append(record.getMessage())
+        own_logger = getLogger("test_request_debug_logging_own")
+        own_logger.addHandler(own_handler)
+        own_logger.propagate = False
+
+        # a logger with an explicit level
+        quiet_logger = getLogger("test_request_debug_logging.quiet")
+        quiet_logger.setLevel(INFO)
+
+        try:
+            with self.graph.flask.test_request_context(
+                "/", headers={"X-Request-Debug": "true"}
+            ):
+                with logging_levels():
+                    logger.debug("inside")
+                    own_logger.debug("own inside")
+                    quiet_logger.debug("quiet")
+                    # e.g. a concurrent request
+                    Context().run(logger.debug, "outside")
+                    Context().run(own_logger.debug, "own outside")
+                    Context().run(logger.info, "info")
+            logger.debug("after")
+            own_logger.debug("own after")
+        finally:
+            root.removeHandler(handler)
+            root.setLevel(level)
+            own_logger.removeHandler(own_handler)
+            own_logger.propagate = True
+            quiet_logger.setLevel(NOTSET)
+
+        assert_that(messages, is_(equal_to(["inside", "info"])))
+        assert_that(own_messages, is_(equal_to(["own inside"])))
+        assert_that(root.level, is_(equal_to(INFO)))
+        assert_that(handler.filters, is_(equal_to([])))
+        assert_that(own_handler.filters, is_(equal_to([])))
+
     def test_disable_logging(self):
         """
         Disable logging per request.
@@ -453,3 +591,23 @@ class TestRequestInfo:
                 pass
 
             assert_that(should_skip_logging(func), is_(equal_to(True)))
+
+        with self.graph.flask.test_request_context(
+            "/", headers={"X-Request-NoLog": "maybe"}
+        ):
+            assert_that(should_skip_logging(func), is_(equal_to(False)))
+
+
+def test_is_uuid():
+    value = uuid4()
+    for form in (str(value), value.hex, value.hex.upper(), f"{{{value}}}", value.urn):
+        assert_that(is_uuid(form), is_(equal_to(True)), form)
+    for form in ("", "foo", str(value)[:-1], f"{{{value}", value.hex[:12] + "-" + value.hex[12:], None):
+        assert_that(is_uuid(form), is_(equal_to(False)), form)
+
+
+def test_id_header_key():
+    assert_that(id_header_key("X-FooBar-Id"), is_(equal_to("foo_bar_id")))
+    assert_that(id_header_key("X-Request-Id"), is_(equal_to("request_id")))
+    assert_that(id_header_key("X-Total-Count"), is_(none()))
+    assert_that(id_header_key("Content-Type"), is_(none()))
@@ -0,0 +1,169 @@
+"""
+Asynchronous audit logging tests.
+
+"""
+from logging import (
+    INFO,
+    WARNING,
+    Handler,
+    getLogger,
+)
+from threading import Event, Thread, current_thread
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    equal_to,
+    has_entries,
+    has_properties,
+    is_,
+)
+from microcosm.api import create_object_graph, load_from_dict
+from werkzeug.exceptions import NotFound
+
+from microcosm_flask.audit_queue import AuditLogQueue
+from microcosm_flask.enums import OverflowPolicy
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+
+
+class RecordingHandler(Handler):
+
+    def __init__(self, gate=None):
+        super().__init__()
+        self.gate = gate
+        self.records = []
+
+    def emit(self, record):
+        if self.gate is not None:
+            self.gate.wait()
+        self.records.append(record)
+
+
+def create_logger(monkeypatch, name, handler):
+    logger = getLogger(name)
+    monkeypatch.setattr(logger, "handlers", [handler])
+    monkeypatch.setattr(logger, "propagate", False)
+    monkeypatch.setattr(logger, "level", logger.level)
+    logger.setLevel(INFO)
+    return logger
+
+
+def test_queue_emits_on_worker(monkeypatch):
+    handler = RecordingHandler()
+    queue = AuditLogQueue(create_logger(monkeypatch, "test_queue_emits_on_worker", handler))
+
+    queue.info(dict(foo="bar"))
+    queue.debug(dict(foo="baz"))
+    assert_that(queue.flush(timeout=5.0), is_(equal_to(True)))
+    queue.close()
+
+    assert_that(handler.records, contains_exactly(
+        has_properties(msg=dict(foo="bar"), funcName="test_queue_emits_on_worker", threadName=current_thread().name),
+    ))
+
+
+def test_queue_captures_exceptions(monkeypatch):
+    handler = RecordingHandler()
+    queue = AuditLogQueue(create_logger(monkeypatch, "test_queue_captures_exceptions", handler))
+
+    try:
+        raise NotFound()
+    except NotFound:
+        queue.warning("error", exc_info=True)
+
+    queue.flush(timeout=5.0)
+    queue.close()
+
+    assert_that(handler.records[0].exc_info[0], is_(equal_to(NotFound)))
+
+
+def test_queue_drops_oldest(monkeypatch):
+    gate = Event()
+    handler = RecordingHandler(gate)
+    queue = AuditLogQueue(create_logger(monkeypatch, "test_queue_drops_oldest", handler), max_size=2)
+
+    queue.info("first")
+    # wait for the worker to take the first record
+    while queue.records:
+        pass
+    for message in ("second", "third", "fourth"):
+        queue.info(message)
+
+    gate.set()
+    queue.flush(timeout=5.0)
+    queue.close()
+
+    assert_that(
+        [(record.levelno, record.getMessage()) for record in handler.records],
+        contains_exactly(
+            (INFO, "first"),
+            (WARNING, "Dropped 1 audit log records"),
+            (INFO, "third"),
+            (INFO, "fourth"),
+        ),
+    )
+
+
+def test_queue_blocks(monkeypatch):
+    gate = Event()
+    handler = RecordingHandler(gate)
+    queue = AuditLogQueue(
+        create_logger(monkeypatch, "test_queue_blocks", handler),
+        max_size=1,
+        overflow=OverflowPolicy.BLOCK,
+    )
+
+    queue.info("first")
+    while queue.records:
+        pass
+    queue.info("second")
+
+    producer = Thread(target=queue.info, args=("third",))
+    producer.start()
+    producer.join(0.1)
+    assert_that(producer.is_alive(), is_(equal_to(True)))
+
+    gate.set()
+    producer.join(5.0)
+    queue.flush(timeout=5.0)
+    queue.close()
+
+    assert_that(
+        [record.getMessage() for record in handler.records],
+        contains_exactly("first", "second", "third"),
+    )
+
+
+def test_asynchronous_audit(monkeypatch):
+    handler = RecordingHandler()
+    create_logger(monkeypatch, "audit", handler)
+
+    loader = load_from_dict(audit=dict(asynchronous=True))
+    graph = create_object_graph(name="example", testing=True, loader=loader)
+    graph.use("audit")
+    ns = Namespace(subject="foo")
+    error_ns = Namespace(subject="bar")
+
+    @graph.route(ns.collection_path, Operation.Search, ns)
+    def search_foo():
+        return "", 200
+
+    @graph.route(error_ns.collection_path, Operation.Search, error_ns)
+    def search_bar():
+        raise Exception("unexpected")
+
+    client = graph.flask.test_client()
+    client.get("/api/foo")
+    client.get("/api/bar")
+
+    graph.audit_log_queue.flush(timeout=5.0)
+    graph.audit_log_queue.close()
+
+    search, error = handler.records
+    assert_that(search.msg, has_entries(operation="foo.search.v1", status_code=200))
+    assert_that(search.levelno, is_(equal_to(INFO)))
+    # testing: the message is logged with its context and the error
+    assert_that(error.levelno, is_(equal_to(WARNING)))
+    assert_that(error.msg, is_(equal_to("unexpected")))
+    assert_that(error.exc_info[0], is_(equal_to(Exception)))
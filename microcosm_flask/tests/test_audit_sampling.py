@@ -0,0 +1,86 @@
+"""
+Audit sampling tests.
+
+"""
+from unittest.mock import patch
+
+import pytest
+from hamcrest import (
+    assert_that,
+    equal_to,
+    has_entries,
+    is_,
+    none,
+)
+from microcosm.api import create_object_graph, load_from_dict
+
+from microcosm_flask.audit_sampling import AuditSampler, SamplingRule
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+
+
+RULES = [
+    dict(status="5xx", rate=1.0),
+    dict(min_elapsed_ms="1000", rate=1.0),
+    dict(endpoint="foo.search.v1", status="2xx", rate="0.01"),
+    SamplingRule(endpoint="foo.search.v1", status=404, rate=0.5),
+]
+
+
+@pytest.mark.parametrize("endpoint, status_code, elapsed_ms, rate", [
+    ("foo.search.v1", 200, 10.0, 0.01),
+    ("foo.search.v1", 204, 10.0, 0.01),
+    ("foo.search.v1", 200, 1000.0, 1.0),
+    ("foo.search.v1", 503, 10.0, 1.0),
+    ("foo.search.v1", 404, 10.0, 0.5),
+    ("foo.search.v1", 400, 10.0, 0.1),
+    ("foo.retrieve.v1", 200, 10.0, 0.1),
+])
+def test_rate_for(endpoint, status_code, elapsed_ms, rate):
+    sampler = AuditSampler(RULES, default_rate=0.1)
+
+    assert_that(sampler.rate_for(endpoint, status_code, elapsed_ms), is_(equal_to(rate)))
+
+
+def test_sample():
+    sampler = AuditSampler(RULES)
+
+    with patch("microcosm_flask.audit_sampling.random", return_value=0.005):
+        assert_that(sampler.sample("foo.search.v1", 200, 10.0), is_(equal_to(0.01)))
+    with patch("microcosm_flask.audit_sampling.random", return_value=0.02):
+        assert_that(sampler.sample("foo.search.v1", 200, 10.0), is_(none()))
+        assert_that(sampler.sample("foo.search.v1", 500, 10.0), is_(equal_to(1.0)))
+
+
+class TestSampledAudit:
+
+    def setup_method(self):
+        loader = load_from_dict(audit=dict(sampling_rules=RULES))
+        self.graph = create_object_graph(name="example", testing=True, loader=loader)
+        self.graph.use("audit")
+        ns = Namespace(subject="foo")
+
+        @self.graph.route(ns.collection_path, Operation.Search, ns)
+        def search_foo():
+            return "", 200
+
+        self.client = self.graph.flask.test_client()
+
+    def test_sampled_in(self):
+        with patch("microcosm_flask.audit.getLogger") as mocked_get_logger:
+            with patch("microcosm_flask.audit_sampling.random", return_value=0.005):
+                self.client.get("/api/foo")
+
+        logger = mocked_get_logger.return_value
+        logger.info.assert_called_once()
+        assert_that(logger.info.call_args[0][0], has_entries(status_code=200, sample_rate=0.01))
+
+    def test_sampled_out(self):
+        with patch("microcosm_flask.audit.getLogger") as mocked_get_logger:
+            with patch("microcosm_flask.audit.RequestInfo.to_dict") as mocked_to_dict:
+                with patch("microcosm_flask.audit_sampling.random", return_value=0.02):
+                    response = self.client.get("/api/foo")
+
+        assert_that(response.status_code, is_(equal_to(200)))
+        assert_that(mocked_get_logger.return_value.info.called, is_(equal_to(False)))
+        assert_that(mocked_to_dict.called, is_(equal_to(False)))
@@ -0,0 +1,282 @@
+"""
+Compiled serialization tests.
+
+"""
+from datetime import datetime
+from enum import Enum
+from unittest.mock import patch
+from uuid import uuid4
+
+from hamcrest import (
+    assert_that,
+    equal_to,
+    is_,
+    none,
+    not_none,
+)
+from marshmallow import Schema, fields, post_dump
+from microcosm.api import create_object_graph
+
+from microcosm_flask.compiling import (
+    COMPILED_DUMP,
+    CompiledSchema,
+    compile_schema,
+    dump,
+    is_compiled,
+    remove_null_values,
+)
+from microcosm_flask.fields import (
+    EnumField,
+    LanguageField,
+    TimestampField,
+    URIField,
+)
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.paging import OffsetLimitPage
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Child:
+    def __init__(self, name, children=()):
+        self.name = name
+        self.children = list(children)
+
+
+class Parent:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class ChildSchema(CompiledSchema):
+    name = fields.String()
+    children = fields.List(fields.Nested(lambda: ChildSchema()))
+
+
+class ParentFields:
+    id = fields.UUID()
+    name = fields.String(attribute="full_name")
+    nickname = fields.String(data_key="nickName")
+    age = fields.Integer()
+    height = fields.Float()
+    total = fields.Integer(as_string=True)
+    active = fields.Boolean()
+    color = EnumField(Color)
+    color_value = EnumField(Color, by_value=True, attribute="color", dump_only=True)
+    created_at = TimestampField()
+    updated_at = TimestampField(use_isoformat=True)
+    created = fields.DateTime()
+    uri = URIField()
+    language = LanguageField()
+    tags = fields.List(fields.String())
+    raw = fields.Raw()
+    child = fields.Nested(ChildSchema)
+    siblings = fields.Nested(ChildSchema, many=True)
+    child_name = fields.String(attribute="child.name")
+    missing_value = fields.String()
+    defaulted = fields.String(dump_default="default")
+    links = fields.Method("get_links", data_key="_links")
+    constant = fields.Constant("constant")
+
+    def get_links(self, obj):
+        return dict(self=dict(href=f"http://localhost/parent/{obj.id}"))
+
+
+class ParentSchema(ParentFields, CompiledSchema):
+    pass
+
+
+class PlainParentSchema(ParentFields, Schema):
+    pass
+
+
+class HookSchema(CompiledSchema):
+    name = fields.String()
+
+    @post_dump
+    def shout(self, data, **kwargs):
+        return dict(name=data["name"].upper())
+
+
+def make_parent(**kwargs):
+    return Parent(**dict(
+        dict(
+            id=uuid4(),
+            full_name="Alice",
+            nickname=None,
+            age=42,
+            height=1.5,
+            total=10,
+            active=True,
+            color=Color.RED,
+            created_at=1500000000.0,
+            updated_at=1500000000.0,
+            created=datetime(2017, 1, 1),
+            uri="HTTP://Example.com:80/path/",
+            language="en-US",
+            tags=["a", 1],
+            raw=dict(foo="bar"),
+            child=Child("Bob", [Child("Charlie")]),
+            siblings=[Child("Dave"), Child("Eve")],
+        ),
+        **kwargs
+    ))
+
+
+def test_dump_matches_marshmallow():
+    parent = make_parent()
+
+    assert_that(
+        ParentSchema().dump(parent),
+        is_(equal_to(Schema.dump(ParentSchema(), parent))),
+    )
+
+
+def test_dump_dict_matches_marshmallow():
+    parent = dict(vars(make_parent()), id=str(uuid4()), color="GREEN", age="7", active=1)
+
+    # Method fields use attribute access; skip them for dictionaries
+    schema = ParentSchema(exclude=["links"])
+    assert_that(
+        schema.dump(parent),
+        is_(equal_to(Schema.dump(ParentSchema(exclude=["links"]), parent))),
+    )
+
+
+def test_dump_many():
+    parents = [make_parent(), make_parent()]
+
+    assert_that(
+        ParentSchema(many=True).dump(parents),
+        is_(equal_to(Schema.dump(ParentSchema(many=True), parents))),
+    )
+    assert_that(
+        ParentSchema().dump(iter(parents), many=True),
+        is_(equal_to(Schema.dump(ParentSchema(), parents, many=True))),
+    )
+
+
+def test_dump_recursive():
+    child = Child("Alice", [Child("Bob", [Child("Charlie")])])
+
+    assert_that(
+        ChildSchema().dump(child),
+        is_(equal_to(dict(
+            name="Alice",
+            children=[
+                dict(
+                    name="Bob",
+                    children=[
+                        dict(name="Charlie", children=[]),
+                    ],
+                ),
+            ],
+        ))),
+    )
+
+
+def test_dump_skip_null():
+    parent = make_parent(
+        full_name=None,
+        raw=dict(foo=None, bar=[dict(baz=None)]),
+        child=Child(None, [Child("Charlie")]),
+    )
+
+    for schema in (ParentSchema(), PlainParentSchema()):
+        assert_that(
+            dump(schema, parent, skip_null=True),
+            is_(equal_to(remove_null_values(Schema.dump(schema, parent)))),
+        )
+
+    assert_that(
+        dump(HookSchema(), dict(name="alice"), skip_null=True),
+        is_(equal_to(dict(name="ALICE"))),
+    )
+
+
+def test_dump_skip_null_plain_schema_while_serializing():
+    class PlainChildSchema(Schema):
+        name = fields.String()
+        children = fields.List(fields.Nested(lambda: PlainChildSchema()))
+
+    class PlainSchema(Schema):
+        name = fields.String()
+        child = fields.Nested(PlainChildSchema)
+
+    parent = Parent(name=None, child=Child(None, [Child("Charlie"), Child(None)]))
+
+    with patch.object(Schema, "dump") as mocked_dump:
+        data = dump(PlainSchema(), parent, skip_null=True)
+
+    mocked_dump.assert_not_called()
+    assert_that(data, is_(equal_to(dict(child=dict(children=[dict(name="Charlie", children=[]), dict(children=[])])))))
+
+
+def test_dump_skip_null_plain_schema():
+    class CustomDumpSchema(Schema):
+        name = fields.String()
+        nickname = fields.String()
+
+        def dump(self, obj, *, many=None):
+            return dict(super().dump(obj, many=many), custom=True)
+
+    schema = CustomDumpSchema()
+
+    assert_that(
+        dump(schema, dict(name="alice", nickname=None), skip_null=True),
+        is_(equal_to(dict(name="alice", custom=True))),
+    )
+    assert_that(getattr(schema, COMPILED_DUMP, None), is_(none()))
+
+
+def test_hooks_fall_back_to_marshmallow():
+    schema = HookSchema()
+
+    assert_that(schema.dump(dict(name="alice")), is_(equal_to(dict(name="ALICE"))))
+    assert_that(compile_schema(schema), is_(none()))
+
+
+def test_compile_once():
+    schema = ParentSchema()
+
+    assert_that(compile_schema(schema), is_(not_none()))
+    assert_that(compile_schema(schema), is_(compile_schema(schema)))
+
+
+def test_paginated_list_schema():
+    ns = Namespace(subject="parent")
+
+    assert_that(
+        is_compiled(OffsetLimitPage.make_paginated_list_schema_class(ns, ParentSchema())),
+        is_(equal_to(True)),
+    )
+    assert_that(
+        is_compiled(OffsetLimitPage.make_paginated_list_schema_class(ns, PlainParentSchema())),
+        is_(equal_to(False)),
+    )
+
+
+def test_paginated_list_dump():
+    graph = create_object_graph(name="example", testing=True)
+    ns = Namespace(subject="parent")
+    parents = [make_parent(), make_parent()]
+
+    @graph.route(ns.collection_path, Operation.Search, ns)
+    def search():
+        pass
+
+    with graph.app.test_request_context():
+        page = OffsetLimitPage(offset=0, limit=2)
+        paginated_list, _ = page.to_paginated_list((parents, 2), ns, Operation.Search)
+
+        compiled_schema = OffsetLimitPage.make_paginated_list_schema_class(ns, ParentSchema())()
+        plain_schema = OffsetLimitPage.make_paginated_list_schema_class(ns, PlainParentSchema())()
+
+        assert_that(
+            compiled_schema.dump(paginated_list),
+            is_(equal_to(plain_schema.dump(paginated_list))),
+        )
@@ -0,0 +1,166 @@
+"""
+Response compression tests.
+
+"""
+import gzip
+from json import loads
+from unittest import SkipTest
+from uuid import uuid4
+
+import pytest
+from hamcrest import (
+    assert_that,
+    equal_to,
+    has_item,
+    is_,
+    none,
+    starts_with,
+)
+from microcosm.api import create_object_graph, load_from_dict
+
+from microcosm_flask.compressing import brotli, zstandard
+from microcosm_flask.conventions.base import EndpointDefinition
+from microcosm_flask.conventions.crud import configure_crud
+from microcosm_flask.enums import ResponseFormats
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.paging import OffsetLimitPageSchema
+from microcosm_flask.tests.conventions.fixtures import (
+    PERSON_ID_1,
+    Person,
+    PersonSchema,
+    person_retrieve,
+)
+
+
+PEOPLE = [
+    Person(uuid4(), f"First{index}", f"Last{index}")
+    for index in range(20)
+]
+
+
+def person_search(offset, limit):
+    return PEOPLE[offset:offset + limit], len(PEOPLE)
+
+
+def decompress(encoding, data):
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "br":
+        if brotli is None:
+            raise SkipTest
+        return brotli.decompress(data)
+    if zstandard is None:
+        raise SkipTest
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+def create_graph(**kwargs):
+    loader = load_from_dict(
+        response_compression=dict(
+            enabled=True,
+            min_size=512,
+            **kwargs
+        ),
+    )
+    graph = create_object_graph(name="example", testing=True, loader=loader)
+    configure_crud(graph, Namespace(subject=Person), {
+        Operation.Retrieve: EndpointDefinition(
+            func=person_retrieve,
+            response_schema=PersonSchema(),
+        ),
+        Operation.Search: EndpointDefinition(
+            func=person_search,
+            request_schema=OffsetLimitPageSchema(),
+            response_schema=PersonSchema(),
+            response_formats=[ResponseFormats.JSON, ResponseFormats.NDJSON],
+        ),
+    })
+    graph.use("app")
+    return graph
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_compress_response(encoding):
+    client = create_graph().flask.test_client()
+
+    uncompressed = client.get("/api/person")
+    response = client.get("/api/person", headers={"Accept-Encoding": encoding})
+
+    assert_that(response.status_code, is_(equal_to(200)))
+    assert_that(response.headers["Content-Encoding"], is_(equal_to(encoding)))
+    assert_that(response.headers["Vary"], is_(equal_to("Accept-Encoding")))
+    assert_that(
+        decompress(encoding, response.get_data()),
+        is_(equal_to(uncompressed.get_data())),
+    )
+    # the etag identifies the uncompressed representation
+    assert_that(
+        response.headers["ETag"],
+        is_(equal_to("W/" + uncompressed.headers["ETag"])),
+    )
+
+
+def test_compress_response_quality():
+    client = create_graph().flask.test_client()
+
+    response = client.get("/api/person", headers={"Accept-Encoding": "zstd;q=0, br;q=0.5, gzip"})
+
+    assert_that(response.headers["Content-Encoding"], is_(equal_to("gzip")))
+
+
+def test_compress_streaming_response():
+    client = create_graph().flask.test_client()
+
+    response = client.get(
+        "/api/person?limit=50",
+        headers={"Accept": "application/x-ndjson", "Accept-Encoding": "gzip"},
+    )
+
+    assert_that(response.headers["Content-Encoding"], is_(equal_to("gzip")))
+    assert_that(response.headers.get("Content-Length"), is_(none()))
+
+    lines = gzip.decompress(response.get_data()).splitlines()
+    assert_that(len(lines), is_(equal_to(len(PEOPLE) + 1)))
+    assert_that(loads(lines[1])["firstName"], is_(equal_to("First0")))
+
+
+def test_skip_small_response():
+    client = create_graph().flask.test_client()
+
+    response = client.get(f"/api/person/{PERSON_ID_1}", headers={"Accept-Encoding": "gzip"})
+
+    assert_that(response.headers.get("Content-Encoding"), is_(none()))
+    assert_that(response.json["firstName"], is_(equal_to("Alice")))
+
+
+def test_skip_content_type():
+    client = create_graph(content_types="text/csv").flask.test_client()
+
+    response = client.get("/api/person", headers={"Accept-Encoding": "gzip"})
+
+    assert_that(response.headers.get("Content-Encoding"), is_(none()))
+    assert_that(response.headers["ETag"], starts_with('"'))
+
+
+def test_no_accepted_encoding():
+    client = create_graph(encodings="gzip").flask.test_client()
+
+    response = client.get("/api/person", headers={"Accept-Encoding": "br"})
+
+    assert_that(response.headers.get("Content-Encoding"), is_(none()))
+    assert_that(response.headers.getlist("Vary"), has_item("Accept-Encoding"))
+
+
+def test_disabled():
+    graph = create_object_graph(name="example", testing=True)
+    configure_crud(graph, Namespace(subject=Person), {
+        Operation.Retrieve: (person_retrieve, PersonSchema()),
+        Operation.Search: (person_search, OffsetLimitPageSchema(), PersonSchema()),
+    })
+    graph.use("app")
+
+    response = graph.flask.test_client().get("/api/person", headers={"Accept-Encoding": "gzip"})
+
+    assert_that(response.headers.get("Content-Encoding"), is_(none()))
+    assert_that(response.json["count"], is_(equal_to(len(PEOPLE))))
@@ -0,0 +1,84 @@
+"""
+Count cache tests.
+
+"""
+from unittest.mock import patch
+
+from hamcrest import (
+    assert_that,
+    equal_to,
+    is_,
+    none,
+)
+from microcosm.api import create_object_graph, load_from_dict
+
+from microcosm_flask.counting import fingerprint
+from microcosm_flask.tests.conventions.fixtures import EyeColor
+
+
+def create_cache(**kwargs):
+    loader = load_from_dict(count_cache=kwargs)
+    return create_object_graph(name="example", testing=True, loader=loader).count_cache
+
+
+def test_fingerprint():
+    assert_that(
+        fingerprint([("offset", 0), ("limit", 20), ("name", "foo"), ("colors", [EyeColor.TEAL])]),
+        is_(equal_to((("colors", ("TEAL",)), ("name", "foo")))),
+    )
+    assert_that(
+        fingerprint(dict(name="foo", offset=20)),
+        is_(equal_to(fingerprint(dict(name="foo", limit=10)))),
+    )
+    assert_that(fingerprint(dict(value=bytearray(b"foo"))), is_(none()))
+
+
+def test_count_cache():
+    cache = create_cache()
+
+    assert_that(cache.get("person", dict(name="foo")), is_(none()))
+    cache.set("person", dict(name="foo"), 10)
+    assert_that(cache.get("person", dict(name="foo", offset=20)), is_(equal_to(10)))
+    assert_that(cache.get("person", dict(name="bar")), is_(none()))
+    assert_that(cache.get("address", dict(name="foo")), is_(none()))
+
+    assert_that(cache.hits, is_(equal_to(1)))
+    assert_that(cache.misses, is_(equal_to(3)))
+
+
+def test_count_cache_expires():
+    cache = create_cache(ttl=5)
+
+    with patch("microcosm_flask.counting.monotonic", return_value=100.0):
+        cache.set("person", {}, 10)
+    with patch("microcosm_flask.counting.monotonic", return_value=104.0):
+        assert_that(cache.get("person", {}), is_(equal_to(10)))
+    with patch("microcosm_flask.counting.monotonic", return_value=105.0):
+        assert_that(cache.get("person", {}), is_(none()))
+
+    assert_that(cache.entries, is_(equal_to({})))
+
+
+def test_count_cache_evicts():
+    cache = create_cache(max_entries=2)
+
+    cache.set("person", dict(name="foo"), 1)
+    cache.set("person", dict(name="bar"), 2)
+    # the least recently used entry is evicted
+    cache.get("person", dict(name="foo"))
+    cache.set("person", dict(name="baz"), 3)
+
+    assert_that(cache.get("person", dict(name="foo")), is_(equal_to(1)))
+    assert_that(cache.get("person", dict(name="bar")), is_(none()))
+    assert_that(cache.get("person", dict(name="baz")), is_(equal_to(3)))
+
+
+def test_count_cache_invalidate():
+    cache = create_cache()
+
+    cache.set("person", dict(name="foo"), 1)
+    cache.set("address", dict(name="foo"), 2)
+    cache.invalidate("person")
+
+    assert_that(cache.get("person", dict(name="foo")), is_(none()))
+    assert_that(cache.get("address", dict(name="foo")), is_(equal_to(2)))
@@ -20,3 +20,12 @@ def test_matches():
         ),
         is_(equal_to(True)),
     )
+
+
+def test_matches_uses_qualities():
+    assert_that(ResponseFormats.JSON.matches("*/*"), is_(equal_to(True)))
+    assert_that(ResponseFormats.JSON.matches("application/*;q=0.5"), is_(equal_to(True)))
+    assert_that(ResponseFormats.JSON.matches("text/html"), is_(equal_to(False)))
+    # more specific ranges take precedence
+    assert_that(ResponseFormats.JSON.matches("*/*,application/json;q=0"), is_(equal_to(False)))
+    assert_that(ResponseFormats.JSON.matches_content_type("application/json; charset=utf-8"), is_(equal_to(True)))
@@ -0,0 +1,147 @@
+"""
+JSON backend tests.
+
+"""
+from collections import namedtuple
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum, IntEnum
+from unittest import SkipTest
+from uuid import UUID
+
+import pytest
+from hamcrest import (
+    assert_that,
+    calling,
+    equal_to,
+    is_,
+    raises,
+)
+from microcosm.api import create_object_graph, load_from_dict
+
+from microcosm_flask.factories import FlaskV1JSONProvider
+from microcosm_flask.json_backends import JSON_BACKENDS, make_json_backend
+
+
+class Color(str, Enum):
+    RED = "RED"
+
+
+class Size(IntEnum):
+    LARGE = 3
+
+
+Point = namedtuple("Point", ["x", "y"])
+
+
+VALUES = [
+    None,
+    True,
+    42,
+    -1.5,
+    0.1,
+    "text",
+    "é",
+    dict(s="caf\u00e9 \u2603"),
+    1e20,
+    1e-7,
+    [1e16, 1.5e300],
+    Decimal("1.10"),
+    Decimal("12345678901234567890.123456789"),
+    UUID("f5bd9d0a-4e0b-4d5b-9a4a-5f1b2c3d4e5f"),
+    datetime(2017, 1, 2, 3, 4, 5),
+    date(2017, 1, 2),
+    Color.RED,
+    Size.LARGE,
+    2 ** 70,
+    [1, [], {}],
+    dict(b=Decimal("0.5"), a=dict(d=Color.RED, c=[UUID("f5bd9d0a-4e0b-4d5b-9a4a-5f1b2c3d4e5f")])),
+]
+
+
+def backend_for(name):
+    try:
+        return make_json_backend(name, default=FlaskV1JSONProvider.default)
+    except ImportError:
+        raise SkipTest
+
+
+@pytest.mark.parametrize("name", sorted(JSON_BACKENDS))
+@pytest.mark.parametrize("value", VALUES)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_dumps_matches_simplejson(name, value, indent):
+    backend = backend_for(name)
+    reference = backend_for("simplejson")
+
+    assert_that(
+        backend.dumps(value, indent=indent),
+        is_(equal_to(reference.dumps(value, indent=indent))),
+    )
+
+
+@pytest.mark.parametrize("name", sorted(JSON_BACKENDS))
+@pytest.mark.parametrize("data", [
+    b'{"a": [1, 2.5, "b", null, true]}',
+    b'{"a": 1e400}',
+    b'{"a": 123456789012345678901234567890}',
+    b'[-9223372036854775809, 18446744073709551616, 1e20]',
+    '{"s": "caf\u00e9"}'.encode("utf-8"),
+])
+def test_loads_matches_simplejson(name, data):
+    backend = backend_for(name)
+    reference = backend_for("simplejson")
+
+    assert_that(
+        repr(backend.loads(data)),
+        is_(equal_to(repr(reference.loads(data)))),
+    )
+
+
+def test_dumps_named_tuple():
+    assert_that(
+        backend_for("orjson").dumps(Point(1, 2)),
+        is_(equal_to(b'{"x":1,"y":2}')),
+    )
+
+
+@pytest.mark.parametrize("name", sorted(JSON_BACKENDS))
+def test_dumps_unsupported_type(name):
+    assert_that(
+        calling(backend_for(name).dumps).with_args(object()),
+        raises(TypeError),
+    )
+
+
+def test_unknown_backend():
+    assert_that(
+        calling(make_json_backend).with_args("unknown", default=FlaskV1JSONProvider.default),
+        raises(ValueError),
+    )
+
+
+@pytest.mark.parametrize("name", sorted(JSON_BACKENDS))
+def test_configure_json_backend(name):
+    backend_for(name)
+
+    loader = load_from_dict(
+        flask=dict(
+            json_backend=name,
+        ),
+    )
+    graph = create_object_graph(name="example", testing=True, loader=loader)
+    graph.use("app")
+
+    assert_that(graph.flask.json.backend.name, is_(equal_to(name)))
+
+    with graph.flask.test_request_context(data=b'{"value": 1.5}'):
+        response = graph.flask.json.response(dict(value=Decimal("1.50")))
+        assert_that(response.data, is_(equal_to(b'{"value":1.50}\n')))
+        assert_that(graph.flask.json.loads(b'{"value": 1.5}'), is_(equal_to(dict(value=1.5))))
+
+
+@pytest.mark.parametrize("name", sorted(JSON_BACKENDS))
+def test_loads_malformed(name):
+    assert_that(
+        calling(backend_for(name).loads).with_args(b'{"a": NaN}'),
+        raises(ValueError),
+    )
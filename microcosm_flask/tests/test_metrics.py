@@ -11,6 +11,7 @@ from werkzeug.exceptions import NotFound
 
 from microcosm_flask.namespaces import Namespace
 from microcosm_flask.operations import Operation
+from microcosm_flask.timing import CONTROLLER, phase
 
 
 class TestRouteMetrics:
@@ -130,3 +131,41 @@ class TestRouteMetrics:
                 "classifier:4xx",
             ],
         )
+
+    def test_phase_metrics(self):
+        """
+        Phase timings are sent as route metrics tagged by phase.
+
+        """
+        loader = load_from_dict(
+            metrics=dict(
+                host="statsd",
+            ),
+            phase_timing=dict(
+                enabled=True,
+            ),
+        )
+        graph = create_object_graph("example", testing=True, loader=loader)
+        graph.use(
+            "metrics",
+            "flask",
+            "route",
+        )
+
+        @graph.route(self.ns.collection_path, Operation.Search, self.ns)
+        def foo():
+            with phase(CONTROLLER):
+                return ""
+
+        response = graph.flask.test_client().get("api/v1/foo")
+        assert_that(response.status_code, is_(equal_to(200)))
+
+        graph.metrics.histogram.assert_any_call(
+            "route.phase",
+            ANY,
+            tags=[
+                "endpoint:foo.search.v1",
+                "backend_type:microcosm_flask",
+                "phase:controller",
+            ],
+        )
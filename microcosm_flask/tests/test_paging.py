@@ -11,12 +11,20 @@ from hamcrest import (
     raises,
 )
 from marshmallow import Schema
-from microcosm.api import create_object_graph
+from microcosm.api import create_object_graph, load_from_dict
 from werkzeug.exceptions import UnprocessableEntity
 
+from microcosm_flask.fields import Cursor, MissingCursorSigningKeyException
 from microcosm_flask.namespaces import Namespace
 from microcosm_flask.operations import Operation
-from microcosm_flask.paging import OffsetLimitPage, OffsetLimitPageSchema
+from microcosm_flask.paging import (
+    CursorPage,
+    CursorPageSchema,
+    EstimatedCount,
+    OffsetLimitPage,
+    OffsetLimitPageSchema,
+    identity,
+)
 
 
 def test_default_values_for_offset_limit_page():
@@ -95,3 +103,101 @@ def test_offset_limit_page_to_paginated_list():
                     ),
                 ),
             ))))
+
+
+def create_cursor_graph():
+    loader = load_from_dict(flask=dict(cursor_signing_key="secret"))
+    return create_object_graph(name="example", testing=True, loader=loader)
+
+
+def test_cursor_round_trip():
+    graph = create_cursor_graph()
+    with graph.flask.test_request_context():
+        token = str(Cursor(["2017-01-01T00:00:00", 42]))
+        assert_that(Cursor.decode(token), is_(equal_to(("2017-01-01T00:00:00", 42))))
+
+        payload, _, signature = token.partition(".")
+        assert_that(
+            calling(Cursor.decode).with_args(str(Cursor([43])).partition(".")[0] + "." + signature),
+            raises(ValueError),
+        )
+
+    # cursors are valid across processes that share the signing key
+    with create_cursor_graph().flask.test_request_context():
+        assert_that(Cursor.decode(token), is_(equal_to(("2017-01-01T00:00:00", 42))))
+
+
+def test_cursor_requires_signing_key():
+    graph = create_object_graph(name="example", testing=True)
+    with graph.flask.test_request_context():
+        assert_that(
+            calling(str).with_args(Cursor([42])),
+            raises(MissingCursorSigningKeyException),
+        )
+
+
+def test_cursor_page_from_query_string():
+    graph = create_cursor_graph()
+    with graph.flask.test_request_context():
+        token = str(Cursor([42]))
+
+    with graph.flask.test_request_context(query_string=dict(cursor=token, limit=5)):
+        page = CursorPage.from_query_string(CursorPageSchema())
+        assert_that(page.cursor, is_(equal_to((42,))))
+        assert_that(page.limit, is_(equal_to(5)))
+        assert_that(page.to_dict(func=identity), is_(equal_to(dict(cursor=(42,), limit=5))))
+
+
+def test_cursor_page_rejects_invalid_cursor():
+    graph = create_cursor_graph()
+    with graph.flask.test_request_context(query_string="cursor=invalid"):
+        assert_that(
+            calling(CursorPage.from_query_string).with_args(CursorPageSchema()),
+            raises(UnprocessableEntity),
+        )
+
+
+def test_cursor_page_to_paginated_list():
+    graph = create_cursor_graph()
+
+    ns = Namespace("foo")
+
+    @graph.flask.route("/", methods=["GET"], endpoint="foo.search.v1")
+    def search():
+        pass
+
+    with graph.flask.test_request_context():
+        page = CursorPage(limit=2, foo="bar")
+        result = [dict(id=1), dict(id=2)]
+        paginated_list, headers = page.to_paginated_list(result, _ns=ns, _operation=Operation.Search)
+
+        schema_cls = page.make_paginated_list_schema_class(ns, Schema())
+        data = schema_cls().dump(paginated_list)
+        assert_that(headers, is_(equal_to(dict())))
+        assert_that(
+            data,
+            is_(equal_to(dict(
+                limit=2,
+                items=[dict(), dict()],
+                _links=dict(
+                    self=dict(
+                        href="http://localhost/?limit=2&foo=bar",
+                    ),
+                    next=dict(
+                        href=f"http://localhost/?cursor={Cursor([2])}&limit=2&foo=bar",
+                    ),
+                ),
+            ))))
+
+
+def test_cursor_page_parse_result():
+    items = [dict(id=1), dict(id=2)]
+
+    assert_that(CursorPage.parse_result(items), is_(equal_to((items, {}))))
+    assert_that(CursorPage.parse_result((items, dict(foo="bar"))), is_(equal_to((items, dict(foo="bar")))))
+    # e.g. from a CRUD search (or `CRUDStoreAdapter.search`)
+    assert_that(CursorPage.parse_result((items, 2)), is_(equal_to((items, {}))))
+    assert_that(CursorPage.parse_result((items, EstimatedCount(2))), is_(equal_to((items, {}))))
+    assert_that(CursorPage.parse_result((items, None)), is_(equal_to((items, {}))))
+    # a tuple of items
+    assert_that(CursorPage.parse_result(tuple(items)), is_(equal_to((tuple(items), {}))))
@@ -0,0 +1,88 @@
+"""
+Phase timing tests.
+
+"""
+from unittest.mock import patch
+
+from hamcrest import (
+    assert_that,
+    contains_inanyorder,
+    equal_to,
+    has_entries,
+    has_entry,
+    has_key,
+    is_,
+    is_not,
+    none,
+)
+from microcosm.api import create_object_graph, load_from_dict
+
+from microcosm_flask.conventions.crud import configure_crud
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.tests.conventions.fixtures import (
+    NewPersonSchema,
+    Person,
+    PersonSchema,
+    person_create,
+    person_retrieve,
+)
+from microcosm_flask.timing import UNTIMED, get_phase_timings, phase
+
+
+def create_app(**phase_timing):
+    loader = load_from_dict(phase_timing=phase_timing)
+    graph = create_object_graph(name="example", testing=True, loader=loader)
+    ns = Namespace(subject=Person, version="v1")
+    configure_crud(graph, ns, {
+        Operation.Create: (person_create, NewPersonSchema(), PersonSchema()),
+        Operation.Retrieve: (person_retrieve, PersonSchema()),
+    })
+    return graph
+
+
+def create_person(graph):
+    with patch("microcosm_flask.audit.getLogger") as mocked_get_logger:
+        response = graph.flask.test_client().post(
+            "/api/v1/person",
+            json=dict(firstName="First", lastName="Last"),
+        )
+
+    assert_that(response.status_code, is_(equal_to(201)))
+    return response, mocked_get_logger.return_value.info.call_args[0][0]
+
+
+def test_phase_untimed():
+    assert_that(get_phase_timings(), is_(none()))
+    assert_that(phase("load"), is_(UNTIMED))
+
+
+def test_phase_timing():
+    graph = create_app(enabled=True, server_timing=True)
+
+    response, record = create_person(graph)
+
+    phases = ["load", "controller", "dump", "format", "etag"]
+    assert_that(
+        [metric.split(";")[0] for metric in response.headers["Server-Timing"].split(", ")],
+        contains_inanyorder(*phases),
+    )
+    assert_that(record, has_entry("phase_timing", has_entries({name: is_(float) for name in phases})))
+
+
+def test_phase_timing_without_server_timing():
+    graph = create_app(enabled=True)
+
+    response, record = create_person(graph)
+
+    assert_that(response.headers.get("Server-Timing"), is_(none()))
+    assert_that(record, has_entry("phase_timing", has_entries(controller=is_(float))))
+
+
+def test_phase_timing_disabled():
+    graph = create_app()
+
+    response, record = create_person(graph)
+
+    assert_that(response.headers.get("Server-Timing"), is_(none()))
+    assert_that(record, is_not(has_key("phase_timing")))
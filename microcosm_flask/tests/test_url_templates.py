@@ -0,0 +1,167 @@
+"""
+URL template tests.
+
+"""
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from flask import url_for
+from hamcrest import (
+    assert_that,
+    calling,
+    equal_to,
+    is_,
+    none,
+    not_none,
+    raises,
+)
+from microcosm.api import create_object_graph
+from werkzeug.routing import BaseConverter, BuildError, UUIDConverter
+
+from microcosm_flask.linking import Link
+from microcosm_flask.namespaces import Namespace
+from microcosm_flask.operations import Operation
+from microcosm_flask.url_templates import build_external_url, url_template_for
+
+
+class ReversedConverter(BaseConverter):
+
+    def to_url(self, value):
+        return str(value)[::-1]
+
+
+class TestUrlTemplates:
+
+    def setup_method(self):
+        self.graph = create_object_graph(name="example", testing=True)
+        self.app = self.graph.flask
+        self.app.url_map.converters["reversed"] = ReversedConverter
+
+        self.ns = Namespace(subject="foo")
+        self.graph.flask.add_url_rule("/api/foo", "foo.search.v1", lambda: None)
+        self.graph.flask.add_url_rule("/api/foo/<uuid:foo_id>", "foo.retrieve.v1", lambda: None)
+        self.graph.flask.add_url_rule("/api/bar/<int:bar_id>/<name>", "bar.retrieve.v1", lambda: None)
+        self.graph.flask.add_url_rule("/api/baz/<reversed:baz_id>", "baz.retrieve.v1", lambda: None)
+        # one rule per (supported) converter type
+        self.app.url_map.converters["werkzeug_uuid"] = UUIDConverter
+        self.graph.flask.add_url_rule("/api/any/<any(a, 'b c'):kind>", "any", lambda: None)
+        self.graph.flask.add_url_rule("/api/float/<float:value>", "float", lambda: None)
+        self.graph.flask.add_url_rule("/api/int/<int(signed=True):value>", "int", lambda: None)
+        self.graph.flask.add_url_rule("/api/path/<path:value>/end", "path", lambda: None)
+        self.graph.flask.add_url_rule("/api/string/<string(minlength=1):value>", "string", lambda: None)
+        self.graph.flask.add_url_rule("/api/uuid/<werkzeug_uuid:value>", "uuid", lambda: None)
+
+    @pytest.mark.parametrize("endpoint, values, environ", [
+        ("foo.search.v1", {}, {}),
+        ("foo.retrieve.v1", dict(foo_id=uuid4()), {}),
+        ("bar.retrieve.v1", dict(bar_id=42, name="a b/c?d#é"), {}),
+        ("bar.retrieve.v1", dict(bar_id=42, name="name"), dict(SCRIPT_NAME="/prefix")),
+        ("bar.retrieve.v1", dict(bar_id=42, name="name"), {"wsgi.url_scheme": "https"}),
+    ])
+    def test_build_matches_url_for(self, endpoint, values, environ):
+        with self.app.test_request_context(base_url="http://example.com:8080", environ_base=environ):
+            url = build_external_url(endpoint, values)
+            assert_that(url, is_(not_none()))
+            assert_that(url, is_(equal_to(url_for(endpoint, _external=True, **values))))
+
+    @pytest.mark.parametrize("endpoint, values", [
+        ("any", dict(kind="a")),
+        ("any", dict(kind="b c")),
+        ("float", dict(value=1.5)),
+        ("int", dict(value=-42)),
+        ("path", dict(value="a/b c/é")),
+        ("string", dict(value="a b/c?d#é%")),
+        ("uuid", dict(value=uuid4())),
+        ("foo.retrieve.v1", dict(foo_id=uuid4())),
+    ])
+    def test_converters_match_url_for(self, endpoint, values):
+        with self.app.test_request_context():
+            assert_that(url_template_for(self.app, endpoint), is_(not_none()))
+            assert_that(
+                build_external_url(endpoint, values),
+                is_(equal_to(url_for(endpoint, _external=True, **values))),
+            )
+
+    @pytest.mark.parametrize("obj, name", [
+        ("rule", "_trace"),
+        ("rule", "_converters"),
+        ("url_map", "_rules_by_endpoint"),
+    ])
+    def test_fallback_without_werkzeug_internals(self, obj, name):
+        rule = next(self.app.url_map.iter_rules("bar.retrieve.v1"))
+        target = rule if obj == "rule" else self.app.url_map
+
+        with self.app.test_request_context():
+            with patch.object(target, name, None):
+                assert_that(url_template_for(self.app, "bar.retrieve.v1"), is_(none()))
+                # (`url_for` is used instead)
+                assert_that(build_external_url("bar.retrieve.v1", dict(bar_id=42, name="name")), is_(none()))
+
+    @pytest.mark.parametrize("values", [
+        # missing arguments
+        dict(bar_id=42),
+        dict(bar_id=42, name=None),
+        # unknown arguments (become query string parameters)
+        dict(bar_id=42, name="name", other="value"),
+        dict(bar_id=42, _anchor="anchor"),
+    ])
+    def test_fallback_for_values(self, values):
+        with self.app.test_request_context():
+            assert_that(build_external_url("bar.retrieve.v1", values), is_(none()))
+
+    def test_fallback_for_converter(self):
+        with self.app.test_request_context():
+            assert_that(url_template_for(self.app, "baz.retrieve.v1"), is_(none()))
+            assert_that(
+                self.ns.url_for(Operation.Retrieve, foo_id="foo"),
+                is_(equal_to("http://localhost/api/foo/foo")),
+            )
+            assert_that(
+                Namespace(subject="baz").url_for(Operation.Retrieve, baz_id="abc"),
+                is_(equal_to("http://localhost/api/baz/cba")),
+            )
+
+    def test_fallback_for_url_defaults(self):
+        self.app.url_defaults(lambda endpoint, values: values.setdefault("name", "default"))
+
+        with self.app.test_request_context():
+            assert_that(build_external_url("bar.retrieve.v1", dict(bar_id=42, name="name")), is_(none()))
+            assert_that(
+                Namespace(subject="bar").href_for(Operation.Retrieve, bar_id=42),
+                is_(equal_to("http://localhost/api/bar/42/default")),
+            )
+
+    def test_fallback_without_request_context(self):
+        with self.app.app_context():
+            assert_that(build_external_url("foo.search.v1", {}), is_(none()))
+
+    def test_template_is_cached(self):
+        with self.app.test_request_context():
+            url_template = url_template_for(self.app, "foo.retrieve.v1")
+            assert_that(url_template_for(self.app, "foo.retrieve.v1"), is_(url_template))
+
+    def test_href_for(self):
+        foo_id = uuid4()
+
+        with self.app.test_request_context():
+            with patch("microcosm_flask.namespaces.url_for") as mocked_url_for:
+                assert_that(
+                    self.ns.href_for(Operation.Retrieve, foo_id=foo_id),
+                    is_(equal_to(f"http://localhost/api/foo/{foo_id}")),
+                )
+                assert_that(
+                    self.ns.href_for(Operation.Search, qs=[("offset", 0), ("limit", 20)]),
+                    is_(equal_to("http://localhost/api/foo?offset=0&limit=20")),
+                )
+                assert_that(mocked_url_for.called, is_(equal_to(False)))
+
+    def test_link_templates(self):
+        with self.app.test_request_context():
+            assert_that(
+                calling(Link.for_).with_args(Operation.Retrieve, self.ns),
+                raises(BuildError),
+            )
+            link = Link.for_(Operation.Retrieve, self.ns, allow_templates=True)
+            assert_that(link.href, is_(equal_to("http://localhost/api/foo/{foo_id}")))
+            assert_that(link.templated, is_(equal_to(True)))
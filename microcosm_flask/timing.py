@@ -0,0 +1,117 @@
+"""
+Per-phase request timing.
+
+Conventions time the phases of each request (e.g. loading request data, calling the controller,
+dumping and formatting the response, and evaluating etags). When enabled (`phase_timing.enabled`),
+phase timings (in milliseconds) are:
+
+ -  included in audit records (as `phase_timing`)
+ -  sent as a `Server-Timing` response header (if `phase_timing.server_timing` is enabled)
+ -  sent as route metrics (if route metrics are enabled), tagged by phase
+
+Phases that are not timed (because phase timing is disabled or outside of a route) cost a context
+variable lookup.
+
+"""
+from contextlib import nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from flask import make_response
+from microcosm.api import binding, defaults, typed
+from microcosm.config.types import boolean
+
+
+LOAD = "load"
+ETAG = "etag"
+CONTROLLER = "controller"
+DUMP = "dump"
+FORMAT = "format"
+
+
+PHASE_TIMINGS = ContextVar("microcosm_flask_phase_timings", default=None)
+UNTIMED = nullcontext()
+
+
+class PhaseTimer:
+    """
+    Add the elapsed time of a phase to the request's phase timings.
+
+    """
+    __slots__ = ("timings", "name", "start")
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed_ms = (perf_counter() - self.start) * 1000.0
+        self.timings[self.name] = self.timings.get(self.name, 0.0) + elapsed_ms
+
+
+def phase(name):
+    """
+    Time a phase of the current request (if phase timing is enabled).
+
+    Usage:
+
+        with phase(LOAD):
+            ...
+
+    """
+    timings = PHASE_TIMINGS.get()
+    if timings is None:
+        return UNTIMED
+    return PhaseTimer(timings, name)
+
+
+def get_phase_timings():
+    """
+    Get the phase timings of the current request (or `None` if they are not timed).
+
+    """
+    return PHASE_TIMINGS.get()
+
+
+def format_server_timing(timings):
+    return ", ".join(
+        f"{name};dur={elapsed_ms:.3f}"
+        for name, elapsed_ms in timings.items()
+    )
+
+
+@binding("phase_timing")
+@defaults(
+    enabled=typed(boolean, default_value=False),
+    server_timing=typed(boolean, default_value=False),
+)
+class PhaseTiming:
+    """
+    Time the phases of route functions.
+
+    """
+    def __init__(self, graph):
+        self.enabled = graph.config.phase_timing.enabled
+        self.server_timing = graph.config.phase_timing.server_timing
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            token = PHASE_TIMINGS.set(dict())
+            try:
+                response = func(*args, **kwargs)
+                timings = PHASE_TIMINGS.get()
+                if self.server_timing and timings:
+                    response = make_response(response)
+                    response.headers["Server-Timing"] = format_server_timing(timings)
+                return response
+            finally:
+                PHASE_TIMINGS.reset(token)
+
+        return wrapper
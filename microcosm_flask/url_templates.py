@@ -0,0 +1,187 @@
+"""
+Precompiled URL templates for building external URLs (e.g. for HAL links).
+
+Building a link with `flask.url_for` resolves the endpoint's rule (and url defaults) and
+builds the URL through werkzeug's `MapAdapter` on every call; paginated lists may build
+several links for each of hundreds of items.
+
+A URL template is compiled once per endpoint from the app's url map and formats URLs using
+plain string substitution. Rules whose structure or converters are not supported (and calls
+with values that `url_for` would treat specially) fall back to `url_for`.
+
+Templates are compiled from werkzeug's (private) rule and map internals; if these are not
+available (e.g. in a different werkzeug version), all URLs are built with `url_for`.
+
+"""
+from urllib.parse import quote
+
+from flask import current_app, has_request_context
+from flask.globals import request_ctx
+from flask_uuid import UUIDConverter as FlaskUUIDConverter
+from werkzeug.routing import (
+    AnyConverter,
+    FloatConverter,
+    IntegerConverter,
+    PathConverter,
+    UnicodeConverter,
+    UUIDConverter,
+)
+
+
+URL_TEMPLATES = "microcosm_flask.url_templates"
+
+# safe characters for static path segments (matches werkzeug)
+SAFE = "!$&'()*+,/:;=@"
+
+# converters whose `to_url` depends only on the value
+COMPILABLE_CONVERTERS = (
+    AnyConverter,
+    FlaskUUIDConverter,
+    FloatConverter,
+    IntegerConverter,
+    PathConverter,
+    UnicodeConverter,
+    UUIDConverter,
+)
+
+
+class UrlTemplate:
+    """
+    A compiled URL template for one rule.
+
+    """
+    def __init__(self, rule, domain_part, parts):
+        self.rule = rule
+        self.domain_part = domain_part
+        self.parts = parts
+        self.arguments = frozenset(name for name, _ in parts if name is not None)
+
+    def build(self, url_adapter, values):
+        """
+        Build an external URL.
+
+        :returns: the URL or `None` if the values require `url_for`
+
+        """
+        if len(values) != len(self.arguments):
+            return None
+
+        path = []
+        for name, part in self.parts:
+            if name is None:
+                path.append(part)
+                continue
+            value = values.get(name)
+            if value is None:
+                return None
+            path.append(part(value))
+
+        url_scheme = url_adapter.url_scheme
+        if url_scheme:
+            scheme = "https:" if url_scheme in ("https", "wss") else "http:"
+        else:
+            scheme = ""
+
+        host = url_adapter.get_host(self.domain_part)
+        return f"{scheme}//{host}{url_adapter.script_name[:-1]}/{''.join(path).lstrip('/')}"
+
+    @classmethod
+    def compile(cls, url_map, rule):
+        """
+        Compile a template for a rule.
+
+        :returns: the template or `None` if the rule is not supported
+
+        """
+        trace = getattr(rule, "_trace", None)
+        converters = getattr(rule, "_converters", None)
+        if (
+            not isinstance(trace, list)
+            or not isinstance(converters, dict)
+            or url_map.host_matching
+            or rule.websocket
+            or rule.defaults
+            or rule.redirect_to is not None
+            or (False, "|") not in trace
+        ):
+            return None
+
+        if not all(isinstance(op, tuple) and len(op) == 2 for op in trace):
+            return None
+
+        separator = trace.index((False, "|"))
+        domain_ops, path_ops = trace[:separator], trace[separator + 1:]
+        if any(is_dynamic for is_dynamic, _ in domain_ops):
+            return None
+
+        parts = []
+        for is_dynamic, data in path_ops:
+            if not is_dynamic:
+                parts.append((None, quote_static(data)))
+                continue
+            converter = converters.get(data)
+            if type(converter) not in COMPILABLE_CONVERTERS:
+                return None
+            parts.append((data, converter.to_url))
+
+        return cls(
+            rule=rule,
+            domain_part="".join(quote_static(data) for _, data in domain_ops),
+            parts=parts,
+        )
+
+
+def quote_static(data):
+    return quote(data, safe=SAFE)
+
+
+def url_template_for(app, endpoint):
+    """
+    Get the (cached) URL template for an endpoint.
+
+    Templates are recompiled if the endpoint's rules change.
+
+    :returns: the template or `None` if the endpoint does not have exactly one supported rule
+
+    """
+    rules_by_endpoint = getattr(app.url_map, "_rules_by_endpoint", None)
+    if not isinstance(rules_by_endpoint, dict):
+        return None
+
+    rules = rules_by_endpoint.get(endpoint)
+    if not rules or len(rules) != 1:
+        return None
+
+    templates = app.extensions.setdefault(URL_TEMPLATES, {})
+    template = templates.get(endpoint)
+    if template is not None and template[0] is rules[0]:
+        return template[1]
+
+    url_template = UrlTemplate.compile(app.url_map, rules[0])
+    templates[endpoint] = (rules[0], url_template)
+    return url_template
+
+
+def build_external_url(endpoint, values):
+    """
+    Build an external URL for an endpoint within the current request.
+
+    :returns: the URL or `None` if `url_for` must be used instead
+
+    """
+    if not has_request_context():
+        return None
+
+    app = current_app._get_current_object()
+    if any(app.url_default_functions.values()):
+        return None
+
+    url_template = url_template_for(app, endpoint)
+    if url_template is None:
+        return None
+
+    url_adapter = request_ctx.url_adapter
+    if url_adapter is None:
+        return None
+
+    return url_template.build(url_adapter, values)
@@ -38,10 +38,15 @@ setup(
         "marshmallow>=3.20.0",
     ],
     extras_require={
+        "arrow": "pyarrow>=10.0.0",
+        "brotli": "brotli>=1.0.0",
         "metrics": "microcosm-metrics>=3.0.0",
+        "msgpack": "msgpack>=1.0.0",
+        "orjson": "orjson>=3.6.0",
         "profiling": "pyinstrument>=3.0",
         "sentry": "sentry-sdk>=0.14.4",
         "spooky": "spooky>=2.0.0",
+        "zstd": "zstandard>=0.15.0",
         "test": [
             "sentry-sdk>=0.14.4",
             "PyHamcrest",
@@ -67,6 +72,9 @@ setup(
         ],
     },
     entry_points={
+        "console_scripts": [
+            "microcosm-flask-swagger = microcosm_flask.swagger.cli:main",
+        ],
         "microcosm_flask.swagger.parameters": [
             "constant = microcosm_flask.swagger.parameters.constant:ConstantParameterBuilder",
             "decorated = microcosm_flask.swagger.parameters.decorated:DecoratedParameterBuilder",
@@ -79,6 +87,7 @@ setup(
         "microcosm.factories": [
             "app = microcosm_flask.factories:configure_flask_app",
             "audit = microcosm_flask.audit:configure_audit_decorator",
+            "audit_log_queue = microcosm_flask.audit_queue:configure_audit_log_queue",
             "basic_auth = microcosm_flask.basic_auth:configure_basic_auth_decorator",
             "build_info_convention = microcosm_flask.conventions.build_info:configure_build_info",
             "build_route_path = microcosm_flask.paths:RoutePathBuilder",
@@ -87,10 +96,13 @@ setup(
             "flask = microcosm_flask.factories:configure_flask",
             "health_convention = microcosm_flask.conventions.health:configure_health",
             "config_convention = microcosm_flask.conventions.config:configure_config",
+            "count_cache = microcosm_flask.counting:CountCache",
             "landing_convention = microcosm_flask.conventions.landing:configure_landing",
             "logging_level_convention = microcosm_flask.conventions.logging_level:configure_logging_level",
+            "phase_timing = microcosm_flask.timing:PhaseTiming",
             "port_forwarding = microcosm_flask.forwarding:configure_port_forwarding",
             "request_context = microcosm_flask.context:configure_request_context",
+            "response_compression = microcosm_flask.compressing:ResponseCompression",
             "route = microcosm_flask.routing:configure_route_decorator",
             "route_metrics = microcosm_flask.metrics:RouteMetrics",
             "sentry_logging = microcosm_flask.sentry:configure_sentry",